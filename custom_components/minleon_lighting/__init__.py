@@ -4,16 +4,47 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .api import MinleonLightingApiClient
-from .const import DOMAIN, LOGGER
-
-PLATFORMS: list[Platform] = [Platform.LIGHT, Platform.NUMBER, Platform.SELECT]
+from .catalog import MinleonEffectCatalog
+from .discovery import MinleonHostResolver
+from .entity import forget_device_info
+from .heartbeat import MinleonHeartbeat
+from .const import (
+    CONF_AUTO_PRESET,
+    CONF_AUTO_PRESET_RULES,
+    CONF_OPTIMISTIC,
+    CONF_SUNRISE_OFF,
+    CONF_SUNSET_ON,
+    DEFAULT_AUTO_PRESET_RULES,
+    DEFAULT_OPTIMISTIC,
+    DOMAIN,
+    DOMAIN_DATA,
+    LOGGER,
+)
+from .playlist import MinleonPlaylistRunner
+from .preset_rules import parse_rules
+from .scheduler import MinleonAutoPresetScheduler
+from .tempo import MinleonTempoSync
+from .services import async_setup_services
+
+PLATFORMS: list[Platform] = [Platform.IMAGE, Platform.LIGHT, Platform.NUMBER, Platform.SELECT]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the minleon-lighting services."""
+    await async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up minleon-lighting from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    hass.data.setdefault(DOMAIN_DATA, {})
 
     # Create API client
     api = MinleonLightingApiClient(
@@ -27,18 +58,54 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         return False
 
     # Initialize state file and load persistent state
-    api._ensure_state_file()
+    await api.async_load_state()
+    api.set_optimistic(entry.options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC))
+
+    # Effect catalog (probed on first setup) decides what the restore below sends
+    catalog = MinleonEffectCatalog(hass, api, entry.entry_id)
+    await catalog.async_load()
+
+    # Restore the physical light state, off included, from before the reboot
+    LOGGER.info("Restoring lights to effect: %s", api.current_effect if api.is_on else "Off")
+    await api.async_repush_state()
+
+    rules = None
+    if entry.options.get(CONF_AUTO_PRESET):
+        rules = parse_rules(entry.options.get(CONF_AUTO_PRESET_RULES, DEFAULT_AUTO_PRESET_RULES))
+    scheduler = MinleonAutoPresetScheduler(
+        hass,
+        api,
+        rules,
+        entry.options.get(CONF_SUNSET_ON, False),
+        entry.options.get(CONF_SUNRISE_OFF, False),
+    )
+
+    tempo = MinleonTempoSync(hass, api, entry.entry_id)
+    await tempo.async_load()
+
+    resolver = MinleonHostResolver(hass, entry, api)
+    await resolver.async_start()
 
-    # Restore physical light state if lights were on before reboot
-    if api.is_on and api.current_effect != "Off":
-        LOGGER.info("Restoring lights to ON state with effect: %s", api.current_effect)
-        await api.async_turn_on()
+    heartbeat = MinleonHeartbeat(hass, api, entry.entry_id)
 
     hass.data[DOMAIN][entry.entry_id] = api
+    hass.data[DOMAIN_DATA][entry.entry_id] = {
+        "playlist": MinleonPlaylistRunner(api),
+        "scheduler": scheduler,
+        "tempo": tempo,
+        "catalog": catalog,
+        "resolver": resolver,
+        "heartbeat": heartbeat,
+        "options": dict(entry.options),
+    }
 
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    await scheduler.async_start()
+    heartbeat.start()
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     return True
 
 
@@ -47,7 +114,29 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
+        helpers = hass.data[DOMAIN_DATA].pop(entry.entry_id)
+        helpers["scheduler"].stop()
+        helpers["tempo"].stop()
+        await helpers["resolver"].async_stop()
+        await helpers["heartbeat"].async_stop()
+        await helpers["playlist"].async_stop()
+        if (streamer := helpers.get("audio")) is not None:
+            await streamer.async_stop()
+
         api = hass.data[DOMAIN].pop(entry.entry_id)
         await api.async_close()
+        forget_device_info(entry)
 
     return unload_ok
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change.
+
+    A new host from rediscovery is applied to the running client instead.
+    """
+    api = hass.data[DOMAIN][entry.entry_id]
+    if entry.data["host"] != api.address:
+        api.set_address(entry.data["host"])
+    if entry.options != hass.data[DOMAIN_DATA][entry.entry_id]["options"]:
+        await hass.config_entries.async_reload(entry.entry_id)
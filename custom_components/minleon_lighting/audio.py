@@ -0,0 +1,267 @@
+"""Audio-reactive streaming for minleon-lighting."""
+from __future__ import annotations
+
+import asyncio
+import os
+import stat
+import time
+import wave
+
+import numpy as np
+
+from .client import MinleonClient, background_priority
+from .const import DEFAULT_AUDIO_FPS, DEFAULT_AUDIO_SAMPLE_RATE, LOGGER
+from .realtime import MinleonRealtimeOutput
+
+# Number of frequency bands, one per bulb color slot
+BAND_COUNT = 5
+# Lowest and highest band edges in Hz
+BAND_MIN_HZ = 40
+BAND_MAX_HZ = 12000
+# Per-frame decay of the running band peaks used for normalization
+PEAK_DECAY = 0.995
+# Brightness floor so the lights never fully blank between beats
+MIN_BRIGHTNESS = 5
+# Slot levels are quantized to this many steps to avoid resending near-identical colors
+LEVEL_STEPS = 8
+
+
+class AudioSource:
+    """Blocking reader for 16-bit PCM audio from a WAV file or a raw pipe.
+
+    Raw input is expected as signed 16-bit little-endian mono samples.
+    """
+
+    def __init__(self, path: str, sample_rate: int = DEFAULT_AUDIO_SAMPLE_RATE) -> None:
+        """Initialize."""
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = 1
+        self._wav = None
+        self._file = None
+
+    def check(self) -> None:
+        """Raise OSError or ValueError if the source cannot be streamed.
+
+        A WAV file is opened to check its format. A pipe is only checked
+        for read access, as opening it waits for a writer.
+        """
+        if stat.S_ISFIFO(os.stat(self.path).st_mode):
+            if not os.access(self.path, os.R_OK):
+                raise PermissionError(f"Cannot read {self.path}")
+            return
+        self.open()
+        self.close()
+
+    def open(self) -> None:
+        """Open the source."""
+        if self.path.lower().endswith(".wav"):
+            try:
+                self._wav = wave.open(self.path, "rb")
+            except (wave.Error, EOFError) as ex:
+                raise ValueError("Not a readable WAV file") from ex
+            if self._wav.getsampwidth() != 2:
+                self._wav.close()
+                raise ValueError("Only 16-bit PCM WAV files are supported")
+            self.sample_rate = self._wav.getframerate()
+            self.channels = self._wav.getnchannels()
+        else:
+            self._file = open(self.path, "rb", buffering=0)
+
+    def read(self, frames: int) -> np.ndarray | None:
+        """Read up to frames samples as mono float32, or None at end of stream."""
+        if self._wav is not None:
+            data = self._wav.readframes(frames)
+        else:
+            data = self._file.read(frames * 2 * self.channels)
+        usable = len(data) - len(data) % (2 * self.channels)
+        if not usable:
+            return None
+        samples = np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1)
+        return samples
+
+    def close(self) -> None:
+        """Close the source."""
+        if self._wav is not None:
+            self._wav.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class BandAnalyzer:
+    """Compute normalized band levels for fixed-size blocks of samples."""
+
+    def __init__(self, sample_rate: int, block_size: int, bands: int = BAND_COUNT) -> None:
+        """Initialize."""
+        self.block_size = block_size
+        self._window = np.hanning(block_size).astype(np.float32)
+        freqs = np.fft.rfftfreq(block_size, 1 / sample_rate)
+        edges = np.geomspace(BAND_MIN_HZ, min(BAND_MAX_HZ, sample_rate / 2), bands + 1)
+        bins = np.searchsorted(freqs, edges)
+        self._starts = np.minimum(bins[:-1], len(freqs) - 1)
+        self._ends = np.maximum(bins[1:], self._starts + 1)
+        self._peaks = np.full(bands, 1e-9, dtype=np.float64)
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Return band levels between 0 and 1 for a block of samples."""
+        if len(samples) < self.block_size:
+            samples = np.pad(samples, (0, self.block_size - len(samples)))
+        power = np.abs(np.fft.rfft(samples * self._window)) ** 2
+        cumulative = np.concatenate(([0.0], np.cumsum(power)))
+        energies = cumulative[self._ends] - cumulative[self._starts]
+        self._peaks = np.maximum(energies, self._peaks * PEAK_DECAY)
+        return np.sqrt(energies / self._peaks)
+
+
+class MinleonAudioStreamer:
+    """Drive brightness and slot colors from a local audio stream.
+
+    Audio is analyzed at a fixed frame rate. A frame is dropped when the
+    previous one is still being sent, so slow controllers never build up
+    latency. With a realtime output, frames go out over UDP instead, with
+    brightness applied to the pixels, and none are dropped.
+    """
+
+    def __init__(
+        self,
+        api: MinleonClient,
+        path: str,
+        fps: int = DEFAULT_AUDIO_FPS,
+        sample_rate: int = DEFAULT_AUDIO_SAMPLE_RATE,
+        output: MinleonRealtimeOutput | None = None,
+    ) -> None:
+        """Initialize."""
+        self.api = api
+        self.output = output
+        self.path = path
+        self.fps = fps
+        self.sample_rate = sample_rate
+        self._task: asyncio.Task | None = None
+        self._started = 0.0
+        self._stopped: float | None = None
+        self._frames = 0
+        self._sent = 0
+        self._dropped = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        """Return True if the stream is running."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def stats(self) -> dict:
+        """Return frame rate and latency statistics."""
+        end = self._stopped if self._stopped is not None else time.monotonic()
+        elapsed = max(end - self._started, 1e-9)
+        return {
+            "frames": self._frames,
+            "sent": self._sent,
+            "dropped": self._dropped,
+            "fps": round(self._sent / elapsed, 2),
+            "latency_avg_ms": round(self._latency_total / self._sent * 1000, 1) if self._sent else None,
+            "latency_max_ms": round(self._latency_max * 1000, 1),
+        }
+
+    def start(self) -> None:
+        """Start streaming from a source that passed AudioSource.check."""
+        with background_priority():
+            self._task = self.api._create_task(self._run(), f"minleon_audio_{self.api.address}")
+
+    async def async_stop(self) -> dict:
+        """Stop streaming and return the final statistics."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        return self.stats
+
+    async def wait(self) -> dict:
+        """Wait for the stream to reach its end and return the statistics."""
+        if self._task is not None:
+            await self._task
+        return self.stats
+
+    async def _run(self) -> None:
+        """Read, analyze and send frames until the source ends."""
+        loop = asyncio.get_running_loop()
+        source = AudioSource(self.path, self.sample_rate)
+        await loop.run_in_executor(None, source.open)
+
+        block = source.sample_rate // self.fps
+        analyzer = BandAnalyzer(source.sample_rate, block)
+        base_colors = list(self.api.colors)
+        base_brightness = self.api.brightness
+        palette = np.array(base_colors, dtype=np.float32)
+        sender: asyncio.Task | None = None
+
+        LOGGER.info("Starting audio stream from %s at %d fps", self.path, self.fps)
+        self._started = time.monotonic()
+        start = loop.time()
+        tick = 0
+        try:
+            while True:
+                samples = await loop.run_in_executor(None, source.read, block)
+                if samples is None:
+                    break
+                captured = time.monotonic()
+                levels = analyzer.process(samples)
+                self._frames += 1
+
+                if self.output is not None:
+                    brightness = MIN_BRIGHTNESS + levels.mean() * (100 - MIN_BRIGHTNESS)
+                    scaled = palette * levels[:, None] * (brightness / 100)
+                    self.output.fill([tuple(c) for c in scaled.astype(int).tolist()])
+                    self.output.send()
+                    self._record_sent(captured)
+                elif sender is not None and not sender.done():
+                    self._dropped += 1
+                else:
+                    levels = np.round(levels * LEVEL_STEPS) / LEVEL_STEPS
+                    brightness = int(MIN_BRIGHTNESS + levels.mean() * (100 - MIN_BRIGHTNESS))
+                    colors = [tuple(c) for c in (palette * levels[:, None]).astype(int).tolist()]
+                    sender = loop.create_task(self._send_frame(brightness, colors, captured))
+
+                tick += 1
+                delay = start + tick / self.fps - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            if sender is not None:
+                await sender
+        finally:
+            if sender is not None:
+                sender.cancel()
+            self._stopped = time.monotonic()
+            await loop.run_in_executor(None, source.close)
+            if self.output is not None:
+                self.output.close()
+            # Put the palette and brightness back the way they were
+            await self.api.async_apply_palette(base_colors, only_changed=True)
+            await self.api.async_set_brightness(base_brightness)
+            # Frames do not update entities while streaming
+            self.api.notify_state_changed()
+            LOGGER.info("Audio stream from %s stopped: %s", self.path, self.stats)
+
+    async def _send_frame(
+        self, brightness: int, colors: list[tuple[int, int, int]], captured: float
+    ) -> None:
+        """Send a single frame, skipping values the controller already has."""
+        sends = [self.api.async_apply_palette(colors, only_changed=True)]
+        if brightness != self.api.brightness:
+            sends.append(self.api.async_set_brightness(brightness))
+        await asyncio.gather(*sends)
+        self._record_sent(captured)
+
+    def _record_sent(self, captured: float) -> None:
+        """Count a sent frame and its latency from capture."""
+        latency = time.monotonic() - captured
+        self._sent += 1
+        self._latency_total += latency
+        self._latency_max = max(self._latency_max, latency)
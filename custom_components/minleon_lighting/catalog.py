@@ -0,0 +1,80 @@
+"""Per-controller effect catalog for minleon-lighting."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .api import MinleonLightingApiClient, background_priority
+from .const import DOMAIN, EFFECT_PARAMETER_KEYS, KNOWN_EFFECTS, LOGGER
+
+STORAGE_VERSION = 1
+
+
+class MinleonEffectCatalog:
+    """Effects a controller accepts and the parameters each one uses.
+
+    The accepted effects are probed on first setup, or on request, and
+    cached on disk, then handed to the API client so it hides rejected
+    effects. Which parameters an effect uses cannot be probed; the static
+    EFFECT_PARAMETERS table applies unless overridden per effect.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: MinleonLightingApiClient, entry_id: str) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.api = api
+        self.effects: list[str] = list(KNOWN_EFFECTS)
+        self.parameters: dict[str, tuple[str, ...]] = {}
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.catalog_{entry_id}")
+
+    async def async_load(self) -> None:
+        """Load the cached catalog and apply it to the client, probing if none is stored."""
+        data = await self._store.async_load()
+        if data is None:
+            try:
+                await self.async_probe()
+            except HomeAssistantError as ex:
+                # Keep every known effect and probe again on the next setup
+                LOGGER.warning("%s", ex)
+            return
+        self.effects = data.get("effects", self.effects)
+        self.parameters = {
+            effect: tuple(parameters)
+            for effect, parameters in data.get("parameters", {}).items()
+        }
+        self.api.set_effect_catalog(self.effects, self.parameters)
+
+    async def async_probe(self) -> dict:
+        """Probe which effects the controller accepts and cache the result."""
+        with background_priority():
+            accepted = await self.api.async_probe_effects()
+        if "Off" not in accepted:
+            raise HomeAssistantError(f"Effect probe of {self.api.address} failed")
+        self.effects = accepted
+        await self._async_save()
+        return {
+            "accepted": accepted,
+            "rejected": [effect for effect in KNOWN_EFFECTS if effect not in accepted],
+        }
+
+    async def async_set_parameters(self, effect: str, parameters: list[str]) -> None:
+        """Override which parameters an effect uses."""
+        if effect not in KNOWN_EFFECTS:
+            raise HomeAssistantError(f"Unknown effect: {effect}")
+        unknown = set(parameters) - set(EFFECT_PARAMETER_KEYS)
+        if unknown:
+            raise HomeAssistantError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+        self.parameters[effect] = tuple(parameters)
+        await self._async_save()
+
+    async def _async_save(self) -> None:
+        """Store the catalog and apply it to the client."""
+        self.api.set_effect_catalog(self.effects, self.parameters)
+        await self._store.async_save(
+            {
+                "effects": self.effects,
+                "parameters": {effect: list(params) for effect, params in self.parameters.items()},
+            }
+        )
+        LOGGER.debug("Stored effect catalog for %s", self.api.address)
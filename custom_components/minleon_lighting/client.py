@@ -0,0 +1,1103 @@
+"""Async Minleon Pixel Dancer client.
+
+Only needs aiohttp, so it can be used and benchmarked outside Home
+Assistant; api.py adapts it to the integration.
+"""
+
+import asyncio
+import aiohttp
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+import heapq
+import itertools
+import json
+import time
+from typing import Callable, Iterator, List, Tuple, Dict, Optional
+
+from .const import LOGGER, KNOWN_EFFECTS, EFFECT_PARAMETERS, EFFECT_PARAMETER_KEYS
+from .journal import StateJournal
+
+
+# Weight of the newest sample in the smoothed command latency
+LATENCY_SMOOTHING = 0.2
+
+# Shared by every command so sends do not rebuild them
+_HEADERS = {"Content-Type": "text/plain;charset=UTF-8"}
+_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# Pings only tell whether the controller answers, so they give up sooner
+_PING_TIMEOUT = aiohttp.ClientTimeout(total=3)
+
+# A command as sent: the payload, kept for logging and journaling, and its encoded body
+Command = Tuple[dict, bytes]
+
+
+def _command(payload: dict) -> Command:
+    """Encode a payload the way the Pixel Dancer app does, without spaces."""
+    return payload, json.dumps(payload, separators=(",", ":")).encode()
+
+
+@lru_cache(maxsize=64)
+def _effect_command(effect: str) -> Command:
+    """Return the cached command that selects an effect (or "Off")."""
+    return _command({"fxn": 1, "fx": effect})
+
+
+@lru_cache(maxsize=1024)
+def _value_command(key: str, value) -> Command:
+    """Return the cached command that sets brightness or an effect parameter."""
+    return _command({"fxn": 1, key: value})
+
+
+@lru_cache(maxsize=1024)
+def _color_command(slot: int, color: Tuple[int, int, int]) -> Command:
+    """Return the cached command that sets a slot color; presets reuse these."""
+    return _command({"fxn": 1, "color": {"i": slot, "c": "#%02X%02X%02X" % color}})
+
+
+# A command that changes nothing, used to check that the controller answers
+_PING_COMMAND = _command({"fxn": 1})
+
+
+def _intent_field(payload: dict) -> Optional[str]:
+    """Return the piece of controller state a payload sets: its key, or color_<slot>."""
+    if "color" in payload:
+        return f"color_{payload['color']['i']}"
+    for key in payload:
+        if key != "fxn":
+            return key
+    return None
+
+
+# Seconds to collect state changes before writing them to the journal together,
+# and the longer window for background work such as tempo, fades and audio
+# frames, so streaming only writes its latest values every few seconds
+JOURNAL_FLUSH_DELAY = 0.5
+BACKGROUND_JOURNAL_DELAY = 10
+
+# Effect parameter names by command key, for journaling sent commands
+_PARAMETER_NAMES = {key: name for name, key in EFFECT_PARAMETER_KEYS.items()}
+
+# Valid range of each numeric apply_state value
+_STATE_RANGES = {
+    "brightness": (0, 100),
+    "speed": (0, 100),
+    "spacing": (1, 100),
+    "amount": (1, 100),
+    "trails": (0, 100),
+}
+
+# Consecutive failed commands before the controller is treated as moved
+FAILURE_THRESHOLD = 3
+
+# Dispatch priorities, lowest first, and the lane name reported for each
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+LANES = ("interactive", "background")
+
+# Commands in flight to one controller at once; the rest wait by priority
+MAX_IN_FLIGHT = 2
+
+_priority: ContextVar[int] = ContextVar("minleon_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Send commands issued in this block, and in tasks it starts, as background work.
+
+    Interactive commands waiting for the controller are always sent before
+    background ones, so bulk traffic yields between each of its commands.
+    """
+    token = _priority.set(PRIORITY_BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+# Effect name no firmware accepts, used to recognize rejected effects when probing
+PROBE_INVALID_EFFECT = "__minleon_probe__"
+
+# Compiled preset palettes, built on first use
+_PALETTES: Optional[Dict[str, Tuple[Tuple[int, int, int], ...]]] = None
+
+
+def preset_palettes() -> Dict[str, Tuple[Tuple[int, int, int], ...]]:
+    """Return the five-slot palette of every preset, compiling them on first use."""
+    global _PALETTES
+    if _PALETTES is None:
+        from .presets import compile_palettes
+
+        _PALETTES = compile_palettes()
+    return _PALETTES
+
+
+@lru_cache(maxsize=None)
+def preset_names() -> Tuple[str, ...]:
+    """Return the names of all presets as a shared tuple."""
+    return tuple(preset_palettes())
+
+
+class MinleonClient:
+    """Client for one Minleon Pixel Dancer controller.
+
+    With a state_dir, the last known state is kept in
+    minleon_lighting_state_<state_id>.json and a command journal next to
+    it, and restored by async_load_state.
+    """
+
+    def __init__(self, address: str, state_dir: Optional[str] = None, state_id: str = "default") -> None:
+        """Initialize API client."""
+        self.address = address
+        self._state_dir = state_dir
+        self._state_id = state_id
+        self._session = None
+        self._tasks: set = set()
+        self._base_url = f"http://{address}/api/control"
+
+        # Current state
+        self._is_on = False
+        self._current_effect = "Off"
+        self._brightness = 75
+        self._speed = 50
+        self._colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 255), (0, 0, 0)]  # Default colors
+        self._background_color = (0, 0, 0)
+
+        # Effect parameters (None until set, so restore never sends blind defaults)
+        self._spacing: Optional[int] = None
+        self._amount: Optional[int] = None
+        self._trails: Optional[int] = None
+
+        # Effects this controller accepts, per-effect parameter overrides,
+        # and parameters set while the current effect ignored them
+        self._supported_effects: Tuple[str, ...] = tuple(KNOWN_EFFECTS)
+        self._effect_parameters: Dict[str, Tuple[str, ...]] = {}
+        self._unsent_parameters: set = set()
+
+        # Last selected preset and effect (persisted when lights are off)
+        self._last_color_preset = "None"
+        self._last_effect = "Off"
+
+        # Smoothed round-trip time of successful commands, in seconds
+        self._latency = 0.05
+
+        # Dispatch gate: commands in flight, waiters ordered by priority,
+        # and per-lane [count, total seconds, max seconds] including queueing
+        self._in_flight = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._waiter_order = itertools.count()
+        self._lane_stats = [[0, 0.0, 0.0] for _ in LANES]
+
+        # Consecutive failed commands, and who to tell when there are too many
+        self._failures = 0
+        # Runs of FAILURE_THRESHOLD or more failed commands, ended or not
+        self._outages = 0
+        self._unreachable_callback: Optional[Callable[[], None]] = None
+
+        # Persistent state file path (will be set later)
+        self._state_file = None
+        self._state_ready = False
+        self._journal: Optional[StateJournal] = None
+        self._journal_pending: dict = {}
+        self._journal_due: Optional[float] = None
+        self._journal_task: Optional[asyncio.Task] = None
+
+        # Desired state not yet acknowledged by the controller, as the latest
+        # command per field, and the task sending it once the controller answers
+        self._desired: Dict[str, Command] = {}
+        self._reconcile_task: Optional[asyncio.Task] = None
+
+        # Optimistic updates: fields shown before the controller answered, as
+        # the latest command shown and the payload of the last confirmed value,
+        # how many were rolled back, and who to tell when the cached state moves
+        self._optimistic_updates = False
+        self._optimistic: Dict[str, Tuple[Command, dict]] = {}
+        self._rollbacks = 0
+        self._listeners: List[Callable[[], None]] = []
+        self._notify_handle: Optional[asyncio.Handle] = None
+
+    def _run_in_executor(self, func: Callable, *args) -> asyncio.Future:
+        """Run blocking work, such as state file I/O, off the event loop."""
+        return asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _create_task(self, coro, name: str) -> asyncio.Task:
+        """Start a task that outlives the call that starts it."""
+        task = asyncio.get_running_loop().create_task(coro, name=name)
+        # Keep a reference until it is done so it is not garbage collected
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    @property
+    def session(self):
+        """Get aiohttp session."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def async_close(self):
+        """Close the session, waiting for any pending state write."""
+        if self._notify_handle is not None:
+            self._notify_handle.cancel()
+            self._notify_handle = None
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            try:
+                await self._reconcile_task
+            except asyncio.CancelledError:
+                pass
+        if self._journal_task is not None:
+            # Write queued background values now instead of waiting them out
+            self._journal_due = time.monotonic()
+            await self._journal_task
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    def set_address(self, address: str) -> None:
+        """Point the client at a new address without touching its state."""
+        LOGGER.info("Controller moved from %s to %s", self.address, address)
+        self.address = address
+        self._base_url = f"http://{address}/api/control"
+        self._failures = 0
+
+    def set_unreachable_callback(self, callback: Optional[Callable[[], None]]) -> None:
+        """Set a callback run when commands keep failing."""
+        self._unreachable_callback = callback
+
+    def set_optimistic(self, enabled: bool) -> None:
+        """Show commands in the cached state before the controller answers, rolling back failures."""
+        self._optimistic_updates = enabled
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener whenever the cached state changes; return a function that removes it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def notify_state_changed(self) -> None:
+        """Tell listeners the cached state changed, e.g. when background work ends."""
+        self._schedule_notify()
+
+    def _schedule_notify(self) -> None:
+        """Tell listeners the cached state changed, once per event loop iteration.
+
+        Setters update the cached state right after a send returns, so
+        listeners run on the next iteration, once for a burst of commands.
+        """
+        if self._listeners and self._notify_handle is None:
+            self._notify_handle = asyncio.get_running_loop().call_soon(self._notify_listeners)
+
+    def _notify_listeners(self) -> None:
+        """Call every listener."""
+        self._notify_handle = None
+        for listener in list(self._listeners):
+            listener()
+
+    def _record_failure(self) -> None:
+        """Count a failed command and report the controller once it looks gone."""
+        self._failures += 1
+        if self._failures == FAILURE_THRESHOLD:
+            self._outages += 1
+        if self._failures >= FAILURE_THRESHOLD and self._unreachable_callback is not None:
+            self._unreachable_callback()
+
+    def _ensure_state_file(self):
+        """Ensure state file path is initialized.
+
+        Does blocking file I/O, so it runs in the executor via async_load_state.
+        The preset palettes are compiled here too so the first preset change
+        does not pay for it on the event loop.
+        """
+        if self._state_file is None and self._state_dir is not None:
+            try:
+                state_dir = self._state_dir
+                state_id = self._state_id
+                self._state_file = f"{state_dir}/minleon_lighting_state_{state_id}.json"
+                self._journal = StateJournal(
+                    self._state_file, f"{state_dir}/minleon_lighting_journal_{state_id}.jsonl"
+                )
+                self._load_persistent_state()
+                self._state_ready = True
+            except Exception as ex:
+                LOGGER.warning("Failed to initialize state file: %s", ex)
+        preset_palettes()
+
+    async def async_load_state(self) -> None:
+        """Load the persistent state without blocking the event loop."""
+        await self._run_in_executor(self._ensure_state_file)
+
+    def _load_persistent_state(self):
+        """Rebuild the last known state from the snapshot and command journal."""
+        try:
+            state = self._journal.load()
+            if not state:
+                return
+            self._last_color_preset = state.get('last_color_preset', 'None')
+            self._last_effect = state.get('last_effect', 'Off')
+            self._is_on = state.get('is_on', False)
+            self._brightness = state.get('brightness', self._brightness)
+            self._speed = state.get('speed', self._speed)
+            self._spacing = state.get('spacing')
+            self._amount = state.get('amount')
+            self._trails = state.get('trails')
+            for slot in range(1, 7):
+                if (hex_color := state.get(f'color_{slot}')) is not None:
+                    color = tuple(int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+                    if slot == 6:
+                        self._background_color = color
+                    else:
+                        self._colors[slot - 1] = color
+            # Restore current effect if lights were on
+            if self._is_on and self._last_effect != 'Off':
+                self._current_effect = self._last_effect
+            LOGGER.debug("Loaded persistent state: preset=%s, effect=%s, is_on=%s",
+                       self._last_color_preset, self._last_effect, self._is_on)
+        except Exception as ex:
+            LOGGER.warning("Failed to load persistent state: %s", ex)
+
+    def _snapshot(self) -> dict:
+        """Return the full state as stored in the snapshot file."""
+        state = {
+            'last_color_preset': self._last_color_preset,
+            'last_effect': self._last_effect,
+            'is_on': self._is_on,
+            'brightness': self._brightness,
+            'speed': self._speed,
+            'spacing': self._spacing,
+            'amount': self._amount,
+            'trails': self._trails
+        }
+        for slot, color in enumerate([*self._colors, self._background_color], start=1):
+            state[f'color_{slot}'] = "#{:02x}{:02x}{:02x}".format(*color).upper()
+        return state
+
+    def _save_persistent_state(self):
+        """Journal the whole cached state and tell listeners about it."""
+        self._journal_record(self._snapshot())
+        self._schedule_notify()
+
+    def _journal_command(self, payload: dict, delay: float = JOURNAL_FLUSH_DELAY):
+        """Journal the state a successful command set on the controller."""
+        record = {}
+        for key, value in payload.items():
+            if key == "int":
+                record['brightness'] = int(value)
+            elif key == "color":
+                record[f"color_{value['i']}"] = value['c']
+            elif key in _PARAMETER_NAMES:
+                record[_PARAMETER_NAMES[key]] = int(value)
+        if record:
+            self._journal_record(record, delay)
+
+    def _journal_record(self, record: dict, delay: float = JOURNAL_FLUSH_DELAY):
+        """Queue a journal record to be written within delay seconds.
+
+        Replay only applies the latest value of each key, so records that
+        arrive before the write are merged and written in the executor as
+        one record with a single sync, and sending commands never waits on
+        the disk.
+        """
+        if self._journal is None or not self._state_ready:
+            return
+        self._journal_pending.update(record)
+        due = time.monotonic() + delay
+        if self._journal_due is None or due < self._journal_due:
+            self._journal_due = due
+        if self._journal_task is None or self._journal_task.done():
+            self._journal_task = self._create_task(self._async_flush_journal(), f"minleon_journal_{self.address}")
+
+    async def _async_flush_journal(self):
+        """Write queued journal records until none are left."""
+        while self._journal_pending:
+            # Wake up regularly, as an interactive record may bring the write forward
+            while (remaining := self._journal_due - time.monotonic()) > 0:
+                await asyncio.sleep(min(remaining, JOURNAL_FLUSH_DELAY))
+            record, self._journal_pending = self._journal_pending, {}
+            self._journal_due = None
+            try:
+                await self._run_in_executor(self._journal.append, record, self._snapshot())
+            except Exception as ex:
+                LOGGER.warning("Failed to save persistent state: %s", ex)
+
+    async def _send_command(self, command: Command) -> bool:
+        """Send command to Minleon controller.
+
+        A failed interactive command is kept as the desired value of the
+        state it sets, replacing any older one, and is sent again once the
+        controller answers; a successful one supersedes it. Background work
+        such as audio frames and fades is not replayed. With optimistic updates the
+        cached state shows an interactive command while it is in flight;
+        background work such as audio frames only updates it on success.
+        """
+        field = _intent_field(command[0])
+        interactive = _priority.get() == PRIORITY_INTERACTIVE
+        optimistic = self._optimistic_updates and field is not None and interactive
+        if optimistic:
+            self._show_optimistic(field, command)
+        result = await self._post_command(command) is not None
+        if optimistic:
+            self._settle_optimistic(field, command, result)
+        if field is not None:
+            if result:
+                self._desired.pop(field, None)
+            elif interactive:
+                self._desired[field] = command
+            # Background work such as audio frames and fades would write
+            # every entity on each frame; its owner calls notify_state_changed
+            # when it ends, and persisted changes notify on their own
+            if interactive:
+                self._schedule_notify()
+        if result and self._desired and (self._reconcile_task is None or self._reconcile_task.done()):
+            self._reconcile_task = self._create_task(
+                self._async_reconcile(), f"minleon_reconcile_{self.address}"
+            )
+        return result
+
+    async def _send_intent(self, field: str, command: Command) -> bool:
+        """Send a desired value and record it as acknowledged unless it was replaced meanwhile."""
+        if await self._post_command(command) is None:
+            return False
+        if self._desired.get(field) is command:
+            del self._desired[field]
+            self._apply_acknowledged(command[0])
+            self._schedule_notify()
+        return True
+
+    def _show_optimistic(self, field: str, command: Command) -> None:
+        """Apply a command to the cached state before it is sent and tell listeners."""
+        shown = self._optimistic.get(field)
+        confirmed = shown[1] if shown is not None else self._field_payload(field)
+        self._optimistic[field] = (command, confirmed)
+        self._apply_payload(command[0])
+        self._schedule_notify()
+
+    def _settle_optimistic(self, field: str, command: Command, result: bool) -> None:
+        """Confirm an optimistic command, or roll its field back if it was the last one shown.
+
+        While a newer command for the field is in flight, an older one that
+        succeeds only becomes the value to roll back to.
+        """
+        entry = self._optimistic.get(field)
+        if entry is None:
+            return
+        shown, confirmed = entry
+        if shown is not command:
+            if result:
+                self._optimistic[field] = (shown, {**confirmed, **command[0]})
+            return
+        del self._optimistic[field]
+        if not result:
+            LOGGER.debug("Rolling back %s on %s to %s", field, self.address, confirmed)
+            self._rollbacks += 1
+            self._apply_payload(confirmed)
+            self._schedule_notify()
+
+    def _field_payload(self, field: str) -> dict:
+        """Return a payload holding the cached value of a field."""
+        if field == "fx":
+            # Showing an effect also moves last_effect, so it is rolled back too
+            return {
+                "fx": self._current_effect if self._is_on else "Off",
+                "last_effect": self._last_effect,
+            }
+        if field == "int":
+            return {"int": self._brightness}
+        if field.startswith("color_"):
+            slot = int(field[6:])
+            color = self._background_color if slot == 6 else self._colors[slot - 1]
+            return {"color": {"i": slot, "c": "#%02X%02X%02X" % tuple(color)}}
+        return {field: getattr(self, f"_{_PARAMETER_NAMES[field]}")}
+
+    def _apply_payload(self, payload: dict) -> None:
+        """Write the values a payload sets into the cached state."""
+        for key, value in payload.items():
+            if key == "fx":
+                self._current_effect = value
+                self._is_on = value != "Off"
+                # Turning off keeps the effect to turn on with, or the one saved with it
+                self._last_effect = value if value != "Off" else payload.get("last_effect", self._last_effect)
+            elif key == "int":
+                self._brightness = int(value)
+            elif key == "color":
+                color = tuple(int(value["c"][i:i + 2], 16) for i in (1, 3, 5))
+                if value["i"] == 6:
+                    self._background_color = color
+                else:
+                    self._colors[value["i"] - 1] = color
+            elif key in _PARAMETER_NAMES:
+                setattr(self, f"_{_PARAMETER_NAMES[key]}", None if value is None else int(value))
+
+    def _apply_acknowledged(self, payload: dict) -> None:
+        """Update the cached state from a desired value the controller accepted."""
+        self._apply_payload(payload)
+        for key in payload:
+            if key in _PARAMETER_NAMES:
+                self._unsent_parameters.discard(_PARAMETER_NAMES[key])
+        self._save_persistent_state()
+
+    async def _async_reconcile(self) -> None:
+        """Send the outstanding desired state until it is all acknowledged or a send fails.
+
+        Only the latest value per field is sent, the effect first so the
+        parameters after it apply to it, then any parameters deferred while
+        the previous effect ignored them.
+        """
+        with background_priority():
+            while self._desired:
+                pending = dict(self._desired)
+                LOGGER.info("Sending %d changes made while %s was unreachable", len(pending), self.address)
+                effect = pending.pop("fx", None)
+                if effect is not None and not await self._send_intent("fx", effect):
+                    return
+                results = await asyncio.gather(
+                    *(self._send_intent(field, command) for field, command in pending.items())
+                )
+                if not all(results):
+                    return
+            # Parameters set while the previous effect ignored them
+            if self._unsent_parameters:
+                await self._async_send_parameters(list(self._unsent_parameters))
+
+    async def _acquire(self, priority: int) -> None:
+        """Wait for a dispatch slot, behind any waiter with a lower priority value."""
+        if self._in_flight < MAX_IN_FLIGHT:
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._waiter_order), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # The slot was handed over just as we were cancelled
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the dispatch slot to the next waiter, or free it."""
+        while self._waiters:
+            waiter = heapq.heappop(self._waiters)[2]
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+    async def _post_command(self, command: Command) -> Optional[str]:
+        """Send command to Minleon controller and return the response body, or None on failure."""
+        priority = _priority.get()
+        queued = time.monotonic()
+        await self._acquire(priority)
+        try:
+            return await self._post_now(command)
+        finally:
+            self._release()
+            elapsed = time.monotonic() - queued
+            stats = self._lane_stats[priority]
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+
+    async def _post_now(self, command: Command) -> Optional[str]:
+        """Post a command's encoded body once a dispatch slot is held."""
+        payload, body = command
+        try:
+            LOGGER.debug("Sending command to %s: %s", self._base_url, payload)
+
+            start = time.monotonic()
+            async with self.session.post(
+                self._base_url,
+                data=body,
+                headers=_HEADERS,
+                timeout=_PING_TIMEOUT if command is _PING_COMMAND else _TIMEOUT
+            ) as response:
+                if response.status == 200:
+                    result = await response.text()
+                    LOGGER.debug("Command successful: %s", result)
+                    self._latency += LATENCY_SMOOTHING * (time.monotonic() - start - self._latency)
+                    self._failures = 0
+                    # Background sends such as audio frames only keep their
+                    # latest values, written every BACKGROUND_JOURNAL_DELAY
+                    if _priority.get() == PRIORITY_INTERACTIVE:
+                        self._journal_command(payload)
+                    else:
+                        self._journal_command(payload, BACKGROUND_JOURNAL_DELAY)
+                    # Accept any 200 response, including "200 OK" HTML responses
+                    return result
+                else:
+                    LOGGER.error("Command failed with status %s", response.status)
+                    return None
+
+        except asyncio.TimeoutError:
+            LOGGER.error("Timeout sending command to Minleon controller")
+        except Exception as ex:
+            LOGGER.error("Error sending command to Minleon controller: %s", ex)
+        self._record_failure()
+        return None
+
+    async def async_test_connection(self) -> bool:
+        """Test connection to the controller."""
+        try:
+            # A command that changes nothing, so a failure leaves no desired state behind
+            return await self._send_command(_PING_COMMAND)
+        except Exception as ex:
+            LOGGER.error("Connection test failed: %s", ex)
+            return False
+
+    async def async_ping(self) -> bool:
+        """Send a command that changes nothing and return whether the controller answered."""
+        return await self._send_command(_PING_COMMAND)
+
+    async def async_repush_state(self) -> bool:
+        """Send the whole cached state to a controller that lost it, e.g. after a power cut.
+
+        The cached state joins the desired state, without replacing values
+        still waiting to be sent, and goes out through the reconciliation
+        loop. Lights that are off take one command. Otherwise the effect
+        goes first, then brightness, the parameters the effect uses and the
+        six colors together.
+        """
+        commands = [_effect_command(self._current_effect if self._is_on else "Off")]
+        if self._is_on:
+            parameters = {
+                "speed": self._speed,
+                "spacing": self._spacing,
+                "amount": self._amount,
+                "trails": self._trails,
+            }
+            commands.append(_value_command("int", self._brightness))
+            commands.extend(
+                _value_command(EFFECT_PARAMETER_KEYS[name], str(value))
+                for name, value in parameters.items()
+                if value is not None and self.effect_uses(name)
+            )
+            slots = enumerate([*self._colors, self._background_color], start=1)
+            commands.extend(_color_command(slot, tuple(color)) for slot, color in slots)
+        for command in commands:
+            self._desired.setdefault(_intent_field(command[0]), command)
+
+        if self._reconcile_task is None or self._reconcile_task.done():
+            self._reconcile_task = self._create_task(
+                self._async_reconcile(), f"minleon_reconcile_{self.address}"
+            )
+        await asyncio.shield(self._reconcile_task)
+        return not self._desired
+
+    async def async_turn_on(self) -> bool:
+        """Turn on the lights with current effect."""
+        # Restore the last effect if currently off
+        if self._current_effect == "Off":
+            if self._last_effect != "Off":
+                self._current_effect = self._last_effect
+            else:
+                # Default to Fixed Colors when turning on for the first time
+                self._current_effect = "Fixed Colors"
+
+        result = await self._send_command(_effect_command(self._current_effect))
+        if result:
+            self._is_on = True
+            self._save_persistent_state()  # Save on/off state
+            # Apply current brightness and speed
+            await self._send_command(_value_command("int", self._brightness))
+            await self._async_send_parameters({"speed"} | self._unsent_parameters)
+        return result
+
+    async def async_turn_off(self) -> bool:
+        """Turn off the lights."""
+        result = await self._send_command(_effect_command("Off"))
+        if result:
+            self._is_on = False
+            self._current_effect = "Off"
+            self._save_persistent_state()  # Save on/off state
+        return result
+
+    async def async_set_effect(self, effect: str) -> bool:
+        """Set the lighting effect."""
+        if effect not in self._supported_effects:
+            LOGGER.warning("Unknown effect: %s", effect)
+            return False
+
+        result = await self._send_command(_effect_command(effect))
+        if result:
+            self._current_effect = effect
+            self._is_on = effect != "Off"
+            # Remember the last effect if it's not "Off"
+            if effect != "Off":
+                self._last_effect = effect
+                self._save_persistent_state()  # Save to file
+            # Send parameters that were deferred while the previous effect ignored them
+            if self._unsent_parameters:
+                await self._async_send_parameters(list(self._unsent_parameters))
+        return result
+
+    def effect_uses(self, parameter: str, effect: Optional[str] = None) -> bool:
+        """Return True if an effect (default: the current one) uses a parameter.
+
+        While the lights are off, the effect they will turn on with is used.
+        """
+        if effect is None:
+            effect = self._current_effect
+            if effect == "Off":
+                effect = self._last_effect if self._last_effect != "Off" else "Fixed Colors"
+        parameters = self._effect_parameters.get(effect, EFFECT_PARAMETERS.get(effect))
+        return parameters is None or parameter in parameters
+
+    def set_effect_catalog(
+        self, effects: List[str], parameters: Dict[str, Tuple[str, ...]]
+    ) -> None:
+        """Restrict the effects offered and override per-effect parameters."""
+        self._supported_effects = tuple(effect for effect in KNOWN_EFFECTS if effect in effects)
+        self._effect_parameters = dict(parameters)
+
+    async def async_probe_effects(self) -> List[str]:
+        """Send every known effect and return the ones the controller accepts.
+
+        An effect is rejected when the controller answers with an error, or
+        with the same response it gives a name no firmware knows. The cached
+        effect, brightness and parameters are sent again afterwards, even if
+        the probe fails or is cancelled.
+        """
+        accepted = []
+        try:
+            invalid = await self._post_command(_effect_command(PROBE_INVALID_EFFECT))
+            reference = await self._post_command(_effect_command("Off"))
+            # Only compare bodies if the firmware answers unknown effects differently
+            compare = invalid is not None and invalid != reference
+
+            for effect in KNOWN_EFFECTS:
+                body = await self._post_command(_effect_command(effect))
+                if body is None or (compare and body == invalid):
+                    continue
+                accepted.append(effect)
+        finally:
+            await self._async_restore_after_probe()
+        LOGGER.info("Controller %s accepts %d of %d effects", self.address, len(accepted), len(KNOWN_EFFECTS))
+        return accepted
+
+    async def _async_restore_after_probe(self) -> None:
+        """Put the lights back to the cached state after probing effects."""
+        if not await self._send_command(_effect_command(self._current_effect if self._is_on else "Off")):
+            return
+        if self._is_on:
+            await self._send_command(_value_command("int", str(self._brightness)))
+            await self._async_send_parameters(list(EFFECT_PARAMETER_KEYS))
+
+    async def async_set_brightness(self, brightness: int) -> bool:
+        """Set brightness (0-100)."""
+        if not 0 <= brightness <= 100:
+            LOGGER.error("Brightness must be between 0-100, got %s", brightness)
+            return False
+
+        result = await self._send_command(_value_command("int", str(brightness)))
+        if result:
+            self._brightness = brightness
+        return result
+
+    async def async_set_speed(self, speed: int) -> bool:
+        """Set effect speed (0-100)."""
+        if not 0 <= speed <= 100:
+            LOGGER.error("Speed must be between 0-100, got %s", speed)
+            return False
+
+        result = await self._async_send_parameter("speed", speed)
+        if result:
+            self._speed = speed
+        return result
+
+    async def async_set_spacing(self, spacing: int) -> bool:
+        """Set effect spacing (1-100)."""
+        if not 1 <= spacing <= 100:
+            LOGGER.error("Spacing must be between 1-100, got %s", spacing)
+            return False
+
+        result = await self._async_send_parameter("spacing", spacing)
+        if result:
+            self._spacing = spacing
+            self._save_persistent_state()
+        return result
+
+    async def async_set_amount(self, amount: int) -> bool:
+        """Set effect amount (1-100)."""
+        if not 1 <= amount <= 100:
+            LOGGER.error("Amount must be between 1-100, got %s", amount)
+            return False
+
+        result = await self._async_send_parameter("amount", amount)
+        if result:
+            self._amount = amount
+            self._save_persistent_state()
+        return result
+
+    async def async_set_trails(self, trails: int) -> bool:
+        """Set effect trails (0-100)."""
+        if not 0 <= trails <= 100:
+            LOGGER.error("Trails must be between 0-100, got %s", trails)
+            return False
+
+        result = await self._async_send_parameter("trails", trails)
+        if result:
+            self._trails = trails
+            self._save_persistent_state()
+        return result
+
+    async def _async_send_parameter(self, name: str, value: int) -> bool:
+        """Send an effect parameter, deferring it while the current effect ignores it."""
+        if not self.effect_uses(name):
+            LOGGER.debug("Effect %s ignores %s, deferring %s", self._current_effect, name, value)
+            self._unsent_parameters.add(name)
+            return True
+
+        result = await self._send_command(_value_command(EFFECT_PARAMETER_KEYS[name], str(value)))
+        if result:
+            self._unsent_parameters.discard(name)
+        return result
+
+    async def _async_send_parameters(self, names) -> bool:
+        """Send the given effect parameters that are set and used by the current effect."""
+        values = {
+            "speed": self._speed,
+            "spacing": self._spacing,
+            "amount": self._amount,
+            "trails": self._trails,
+        }
+        names = [name for name in names if values[name] is not None and self.effect_uses(name)]
+        LOGGER.debug("Sending effect parameters: %s", names)
+        results = await asyncio.gather(
+            *(self._send_command(_value_command(EFFECT_PARAMETER_KEYS[name], str(values[name]))) for name in names)
+        )
+        for name, result in zip(names, results):
+            if result:
+                self._unsent_parameters.discard(name)
+        return all(results)
+
+    async def async_set_color(self, slot: int, color: Tuple[int, int, int]) -> bool:
+        """Set color for a specific slot (1-5) or background (6)."""
+        if not 1 <= slot <= 6:
+            LOGGER.error("Color slot must be between 1-6, got %s", slot)
+            return False
+
+        result = await self._send_command(_color_command(slot, tuple(color)))
+
+        if result:
+            if slot == 6:
+                self._background_color = color
+            else:
+                self._colors[slot - 1] = color
+
+        return result
+
+    async def async_set_rgb_color(self, color: Tuple[int, int, int]) -> bool:
+        """Set the primary color (slot 1)."""
+        return await self.async_set_color(1, color)
+
+    @staticmethod
+    def get_preset_palette(preset_name: str) -> Optional[List[Tuple[int, int, int]]]:
+        """Return the five bulb slot colors of a preset, or None if unknown."""
+        palette = preset_palettes().get(preset_name)
+        return list(palette) if palette is not None else None
+
+    async def async_apply_palette(
+        self,
+        colors: List[Tuple[int, int, int]],
+        preset_name: Optional[str] = None,
+        only_changed: bool = False,
+    ) -> bool:
+        """Set all five bulb slots, remembering the preset name if given.
+
+        The slot commands are sent concurrently. With only_changed, slots that
+        already hold the requested color are skipped.
+        """
+        LOGGER.debug("Setting colors: %s", colors)
+        slots = [
+            (slot, color)
+            for slot, color in enumerate(colors, start=1)
+            if not only_changed or self._colors[slot - 1] != tuple(color)
+        ]
+        results = await asyncio.gather(
+            *(self.async_set_color(slot, color) for slot, color in slots)
+        )
+        result = all(results)
+
+        if preset_name is not None and result:
+            # Remember the last preset once its colors were accepted
+            self._last_color_preset = preset_name
+            self._save_persistent_state()  # Save to file
+        return result
+
+    async def async_apply_state(self, state: dict) -> Tuple[bool, int]:
+        """Apply a partial state, sending only values that differ from the current ones.
+
+        State keys are effect, colors, preset, brightness, speed, spacing,
+        amount and trails; a preset supplies the colors. Every value is
+        checked before anything is sent, so an invalid state changes
+        nothing. The effect is sent first so the parameters that follow are
+        checked against it, and a preset is only recorded once its colors
+        were accepted. Returns whether every command succeeded and how many
+        were sent.
+        """
+        effect = state.get("effect")
+        if effect is not None and effect not in self._supported_effects:
+            LOGGER.error("Unknown effect: %s", effect)
+            return False, 0
+        preset_name = state.get("preset")
+        colors = state.get("colors")
+        if preset_name is not None:
+            colors = self.get_preset_palette(preset_name)
+            if colors is None:
+                LOGGER.error("Unknown preset: %s", preset_name)
+                return False, 0
+        values = {name: state[name] for name in _STATE_RANGES if state.get(name) is not None}
+        for name, value in values.items():
+            low, high = _STATE_RANGES[name]
+            if not low <= value <= high:
+                LOGGER.error("%s must be between %s-%s, got %s", name.capitalize(), low, high, value)
+                return False, 0
+
+        results = []
+        if effect is not None and effect != (self._current_effect if self._is_on else "Off"):
+            results.append(await self.async_set_effect(effect))
+
+        color_sends = []
+        if colors is not None:
+            color_sends = [
+                self.async_set_color(slot, color)
+                for slot, color in enumerate(colors, start=1)
+                if self._colors[slot - 1] != tuple(color)
+            ]
+        sends = [
+            getattr(self, f"async_set_{name}")(value)
+            for name, value in values.items()
+            if value != getattr(self, f"_{name}")
+        ]
+        sent = await asyncio.gather(*color_sends, *sends)
+        results.extend(sent)
+
+        if preset_name is not None and all(sent[:len(color_sends)]):
+            self._last_color_preset = preset_name
+            self._save_persistent_state()
+        return all(results), len(results)
+
+    async def async_apply_holiday_preset(self, preset_name: str) -> bool:
+        """Apply a color preset (colors only, no effects)."""
+        LOGGER.info("Applying color preset: %s", preset_name)
+
+        palette = self.get_preset_palette(preset_name)
+        if palette is None:
+            LOGGER.error("Unknown preset: %s", preset_name)
+            return False
+
+        # Apply colors only - no effect, speed, or brightness changes
+        result = await self.async_apply_palette(palette, preset_name)
+        if result:
+            LOGGER.info("Color preset %s applied successfully", preset_name)
+        else:
+            LOGGER.warning("Color preset %s was not fully applied", preset_name)
+        return result
+
+    # Properties for state tracking
+    @property
+    def is_on(self) -> bool:
+        """Return if lights are on."""
+        return self._is_on
+
+    @property
+    def current_effect(self) -> str:
+        """Return current effect."""
+        return self._current_effect
+
+    @property
+    def brightness(self) -> int:
+        """Return current brightness (0-100)."""
+        return self._brightness
+
+    @property
+    def speed(self) -> int:
+        """Return current speed (0-100)."""
+        return self._speed
+
+    @property
+    def colors(self) -> List[Tuple[int, int, int]]:
+        """Return the current colors of the five bulb slots."""
+        return list(self._colors)
+
+    @property
+    def spacing(self) -> Optional[int]:
+        """Return current spacing (1-100), or None if never set."""
+        return self._spacing
+
+    @property
+    def amount(self) -> Optional[int]:
+        """Return current amount (1-100), or None if never set."""
+        return self._amount
+
+    @property
+    def trails(self) -> Optional[int]:
+        """Return current trails (0-100), or None if never set."""
+        return self._trails
+
+    @property
+    def background_color(self) -> Tuple[int, int, int]:
+        """Return the background color (slot 6)."""
+        return self._background_color
+
+    @property
+    def rgb_color(self) -> Tuple[int, int, int]:
+        """Return current primary color."""
+        return self._colors[0]
+
+    @property
+    def lane_latency(self) -> Dict[str, Dict[str, float]]:
+        """Return command count and latency, including queueing, per priority lane."""
+        return {
+            lane: {
+                "count": count,
+                "avg_ms": round(total / count * 1000, 1) if count else 0.0,
+                "max_ms": round(peak * 1000, 1),
+            }
+            for lane, (count, total, peak) in zip(LANES, self._lane_stats)
+        }
+
+    @property
+    def command_latency(self) -> float:
+        """Return the smoothed round-trip time of successful commands in seconds."""
+        return self._latency
+
+    @property
+    def pending_changes(self) -> List[str]:
+        """Return the fields whose desired value the controller has not acknowledged."""
+        return list(self._desired)
+
+    @property
+    def rollbacks(self) -> int:
+        """Return how many optimistic updates were rolled back."""
+        return self._rollbacks
+
+    @property
+    def consecutive_failures(self) -> int:
+        """Return how many commands failed since the last one that succeeded."""
+        return self._failures
+
+    @property
+    def outages(self) -> int:
+        """Return how many times FAILURE_THRESHOLD commands in a row failed."""
+        return self._outages
+
+    @property
+    def available_effects(self) -> Tuple[str, ...]:
+        """Return the effects this controller accepts, as a shared tuple."""
+        return self._supported_effects
+
+    @property
+    def last_color_preset(self) -> str:
+        """Return the last selected color preset."""
+        return self._last_color_preset
+
+    @property
+    def last_effect(self) -> str:
+        """Return the last selected effect."""
+        return self._last_effect
+
+    @property
+    def available_presets(self) -> Tuple[str, ...]:
+        """Return the presets from all categories, as a shared tuple."""
+        return preset_names()
+
@@ -7,18 +7,39 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.components import network
+from homeassistant.components.zeroconf import ZeroconfServiceInfo
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 
 from .api import MinleonLightingApiClient
-from .const import DOMAIN
+from .const import (
+    CONF_AUTO_PRESET,
+    CONF_AUTO_PRESET_RULES,
+    CONF_OPTIMISTIC,
+    CONF_REALTIME_PIXELS,
+    CONF_REALTIME_PROTOCOL,
+    CONF_SUNRISE_OFF,
+    CONF_SUNSET_ON,
+    DEFAULT_AUTO_PRESET_RULES,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_REALTIME_PIXELS,
+    DOMAIN,
+    REALTIME_DDP,
+    REALTIME_E131,
+    REALTIME_OFF,
+)
+from .probe import async_probe_host, async_scan_network, format_host
+from .preset_rules import parse_rules
 
 _LOGGER = logging.getLogger(__name__)
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
-        vol.Required("host"): str,
+        vol.Optional("host", default=""): str,
     }
 )
 
@@ -61,14 +82,26 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize."""
+        self._discovered_host: str | None = None
+        self._found_hosts: list[str] = []
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step."""
+        """Handle the initial step.
+
+        Leaving the host empty scans the local network for controllers.
+        """
         errors: dict[str, str] = {}
         if user_input is not None:
+            host = user_input["host"].strip()
+            if not host:
+                return await self.async_step_scan()
+            self._async_abort_entries_match({"host": host})
             try:
-                info = await validate_input(self.hass, user_input)
+                info = await validate_input(self.hass, {"host": host})
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except InvalidAuth:
@@ -77,12 +110,148 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
-                return self.async_create_entry(title=info["title"], data=user_input)
+                return self.async_create_entry(title=info["title"], data={"host": host})
 
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan a subnet for controllers."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                found = await async_scan_network(
+                    async_get_clientsession(self.hass), user_input["network"]
+                )
+            except ValueError:
+                errors["network"] = "invalid_network"
+            else:
+                configured = {
+                    entry.data.get("host") for entry in self._async_current_entries()
+                }
+                self._found_hosts = [host for host in found if host not in configured]
+                if self._found_hosts:
+                    return await self.async_step_pick()
+                errors["base"] = "no_devices_found"
+
+        source_ip = await network.async_get_source_ip(self.hass)
+        schema = vol.Schema(
+            {vol.Required("network", default=f"{source_ip}/24"): str}
+        )
+        return self.async_show_form(step_id="scan", data_schema=schema, errors=errors)
+
+    async def async_step_pick(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Pick one of the controllers found by a scan."""
+        if user_input is not None:
+            host = user_input["host"]
+            self._async_abort_entries_match({"host": host})
+            return self.async_create_entry(
+                title=f"Minleon Lights ({host})", data={"host": host}
+            )
+
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema({vol.Required("host"): vol.In(self._found_hosts)}),
+        )
+
+    async def async_step_zeroconf(
+        self, discovery_info: ZeroconfServiceInfo
+    ) -> FlowResult:
+        """Handle a controller announced over mDNS."""
+        host = format_host(str(discovery_info.ip_address), discovery_info.port or 80)
+        # The mDNS name survives DHCP changes, so a known name just moves the entry;
+        # the update listener hands the new host to the running client, no reload
+        await self.async_set_unique_id(discovery_info.name)
+        self._abort_if_unique_id_configured(updates={"host": host}, reload_on_update=False)
+        self._async_abort_entries_match({"host": host})
+        if await async_probe_host(async_get_clientsession(self.hass), host) is None:
+            return self.async_abort(reason="cannot_connect")
+        self._discovered_host = host
+        self.context["title_placeholders"] = {"host": host}
+        return await self.async_step_zeroconf_confirm()
+
+    async def async_step_zeroconf_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Confirm adding a discovered controller."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title=f"Minleon Lights ({self._discovered_host})",
+                data={"host": self._discovered_host},
+            )
+
+        return self.async_show_form(
+            step_id="zeroconf_confirm",
+            description_placeholders={"host": self._discovered_host},
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle options for minleon-lighting."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the automatic preset and sun options."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                parse_rules(user_input[CONF_AUTO_PRESET_RULES])
+            except ValueError as ex:
+                _LOGGER.debug("Invalid auto preset rules: %s", ex)
+                errors[CONF_AUTO_PRESET_RULES] = "invalid_rules"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_AUTO_PRESET, default=options.get(CONF_AUTO_PRESET, False)
+                ): bool,
+                vol.Optional(
+                    CONF_AUTO_PRESET_RULES,
+                    default=options.get(CONF_AUTO_PRESET_RULES, DEFAULT_AUTO_PRESET_RULES),
+                ): TextSelector(TextSelectorConfig(multiline=True)),
+                vol.Optional(
+                    CONF_SUNSET_ON, default=options.get(CONF_SUNSET_ON, False)
+                ): bool,
+                vol.Optional(
+                    CONF_SUNRISE_OFF, default=options.get(CONF_SUNRISE_OFF, False)
+                ): bool,
+                vol.Optional(
+                    CONF_REALTIME_PROTOCOL,
+                    default=options.get(CONF_REALTIME_PROTOCOL, REALTIME_OFF),
+                ): vol.In([REALTIME_OFF, REALTIME_DDP, REALTIME_E131]),
+                vol.Optional(
+                    CONF_REALTIME_PIXELS,
+                    default=options.get(CONF_REALTIME_PIXELS, DEFAULT_REALTIME_PIXELS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=4096)),
+                vol.Optional(
+                    CONF_OPTIMISTIC,
+                    default=options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC),
+                ): bool,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
@@ -0,0 +1,33 @@
+"""Diagnostics support for minleon-lighting."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DOMAIN_DATA
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return per-lane command latency and link health for a config entry.
+
+    Latency changes on every command, so it is reported here rather than
+    as a state attribute, where each change would write a new state.
+    """
+    api = hass.data[DOMAIN][entry.entry_id]
+    heartbeat = hass.data[DOMAIN_DATA][entry.entry_id]["heartbeat"]
+    return {
+        "host": api.address,
+        "options": dict(entry.options),
+        "command_latency": api.lane_latency,
+        "pending_changes": api.pending_changes,
+        "optimistic_rollbacks": api.rollbacks,
+        "consecutive_failures": api.consecutive_failures,
+        "outages": api.outages,
+        "heartbeat": {
+            "interval": heartbeat.interval,
+            "pings": heartbeat.pings,
+            "recoveries": heartbeat.recoveries,
+        },
+    }
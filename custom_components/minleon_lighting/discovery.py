@@ -0,0 +1,130 @@
+"""Controller discovery for minleon-lighting."""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import time
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import MinleonLightingApiClient
+from .const import DOMAIN, LOGGER
+from .probe import async_probe_host, async_scan_network
+
+# Minimum time between two searches for the same moved controller, in seconds
+RESOLVE_COOLDOWN = 300
+# Kernel neighbour table, mapping addresses on the local link to MAC addresses (Linux)
+ARP_TABLE = "/proc/net/arp"
+
+
+def read_arp_table() -> dict[str, str]:
+    """Return the MAC address of each recently reached IP address, empty where unavailable."""
+    try:
+        with open(ARP_TABLE, encoding="ascii") as file:
+            lines = file.read().splitlines()[1:]
+    except OSError:
+        return {}
+    table = {}
+    for line in lines:
+        fields = line.split()
+        if len(fields) >= 4 and fields[3] != "00:00:00:00:00:00":
+            table[fields[0]] = fields[3].lower()
+    return table
+
+
+class MinleonHostResolver:
+    """Find a controller again after DHCP moves it to another address.
+
+    The controller's MAC address, read from the neighbour table after a
+    probe, is kept in the entry. When commands keep failing, the last known
+    /24 is scanned and the client is pointed at the unclaimed host with that
+    MAC address, without reloading any entities. Every Pixel Dancer gives
+    the same answer to the probe, so where the MAC address cannot be read
+    (another subnet, or no neighbour table) the move only happens when
+    exactly one unclaimed controller answers on the subnet.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, api: MinleonLightingApiClient) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.entry = entry
+        self.api = api
+        self._task: asyncio.Task | None = None
+        self._last_attempt: float | None = None
+
+    async def async_start(self) -> None:
+        """Record the controller's MAC address and start watching for failures."""
+        if await async_probe_host(async_get_clientsession(self.hass), self.api.address) is not None:
+            table = await self.hass.async_add_executor_job(read_arp_table)
+            mac = table.get(self.api.address.partition(":")[0])
+            if mac is not None and self.entry.data.get("mac") != mac:
+                self.hass.config_entries.async_update_entry(
+                    self.entry, data={**self.entry.data, "mac": mac}
+                )
+        self.api.set_unreachable_callback(self.async_trigger)
+
+    @callback
+    def async_trigger(self) -> None:
+        """Start a search unless one is running or ran recently."""
+        if self._task is not None and not self._task.done():
+            return
+        if self._last_attempt is not None and time.monotonic() - self._last_attempt < RESOLVE_COOLDOWN:
+            return
+        self._last_attempt = time.monotonic()
+        self._task = self.hass.async_create_background_task(
+            self._async_resolve(), f"minleon_resolve_{self.entry.entry_id}"
+        )
+
+    async def async_stop(self) -> None:
+        """Stop watching and cancel a running search."""
+        self.api.set_unreachable_callback(None)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _async_resolve(self) -> None:
+        """Scan the last known subnet and move the client to the controller found there."""
+        session = async_get_clientsession(self.hass)
+        old_host = self.api.address
+        # A slow reply is not a move
+        if await async_probe_host(session, old_host) is not None:
+            return
+
+        address, _, port = old_host.partition(":")
+        try:
+            network = ipaddress.ip_network(f"{address}/24", strict=False)
+        except ValueError:
+            LOGGER.debug("Not searching for %s, it is not an IP address", old_host)
+            return
+
+        LOGGER.info("Controller at %s stopped answering, scanning %s", old_host, network)
+        found = await async_scan_network(session, str(network), (int(port or 80),))
+        claimed = {
+            entry.data.get("host")
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if entry.entry_id != self.entry.entry_id
+        }
+        candidates = [host for host in found if host not in claimed]
+        if (mac := self.entry.data.get("mac")) is not None:
+            # The scan filled the neighbour table for every host that answered
+            table = await self.hass.async_add_executor_job(read_arp_table)
+            candidates = [host for host in candidates if table.get(host.partition(":")[0]) == mac]
+        if len(candidates) != 1:
+            LOGGER.warning(
+                "Could not find controller %s again: %d candidates on %s",
+                old_host,
+                len(candidates),
+                network,
+            )
+            return
+
+        self.api.set_address(candidates[0])
+        self.hass.config_entries.async_update_entry(
+            self.entry, data={**self.entry.data, "host": candidates[0]}
+        )
@@ -0,0 +1,100 @@
+"""Base entity for minleon-lighting."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import time
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
+
+from .api import MinleonLightingApiClient
+from .const import DOMAIN
+
+# Minimum seconds between state writes of one entity; bursts collapse into a trailing write
+STATE_WRITE_INTERVAL = 0.5
+
+# DeviceInfo shared by every entity of a config entry
+_DEVICE_INFO: dict[str, DeviceInfo] = {}
+
+
+def device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the cached DeviceInfo for a config entry."""
+    if (info := _DEVICE_INFO.get(entry.entry_id)) is None:
+        info = _DEVICE_INFO[entry.entry_id] = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Minleon Pixel Dancer Controller",
+            manufacturer="Minleon",
+            model="Pixel Dancer",
+            sw_version="1.0",
+        )
+    return info
+
+
+def forget_device_info(entry: ConfigEntry) -> None:
+    """Drop the cached DeviceInfo of an unloaded config entry."""
+    _DEVICE_INFO.pop(entry.entry_id, None)
+
+
+class MinleonEntity(Entity):
+    """Common base for all minleon-lighting entities."""
+
+    _attr_has_entity_name = True
+    _attr_available = True
+
+    _last_state_write = 0.0
+    _pending_state_write: Callable[[], None] | None = None
+
+    def __init__(
+        self,
+        api: MinleonLightingApiClient,
+        entry: ConfigEntry,
+        unique_id_key: str | None,
+    ) -> None:
+        """Initialize."""
+        self.api = api
+        self._config_entry = entry
+        if unique_id_key:
+            self._attr_unique_id = f"minleon_{unique_id_key}_{entry.entry_id}"
+        else:
+            self._attr_unique_id = f"minleon_{entry.entry_id}"
+        self._attr_device_info = device_info(entry)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write state, at most once per STATE_WRITE_INTERVAL.
+
+        A write inside the interval is deferred to its end, so a burst such
+        as a slider drag or a preset ripple ends with one write of the
+        final state.
+        """
+        if self._pending_state_write is not None:
+            return
+        delay = self._last_state_write + STATE_WRITE_INTERVAL - time.monotonic()
+        if delay > 0:
+            self._pending_state_write = async_call_later(self.hass, delay, self._async_deferred_write)
+            return
+        self._last_state_write = time.monotonic()
+        super().async_write_ha_state()
+
+    @callback
+    def _async_deferred_write(self, _now: datetime) -> None:
+        """Write the state deferred by async_write_ha_state."""
+        self._pending_state_write = None
+        self._last_state_write = time.monotonic()
+        super().async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Write state whenever the client's cached state changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.api.add_listener(self.async_write_ha_state))
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a deferred state write."""
+        await super().async_will_remove_from_hass()
+        if self._pending_state_write is not None:
+            self._pending_state_write()
+            self._pending_state_write = None
@@ -0,0 +1,92 @@
+"""Controller power-loss detection for minleon-lighting."""
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from .api import MinleonLightingApiClient, background_priority
+from .const import LOGGER
+
+# Seconds between pings: right after a failure, at most while the
+# controller keeps answering, and the factor the interval grows by per
+# answered ping. The maximum stays well under a controller reboot, so a
+# restart between two pings is still noticed.
+HEARTBEAT_MIN_INTERVAL = 2
+HEARTBEAT_MAX_INTERVAL = 15
+HEARTBEAT_BACKOFF = 1.5
+
+
+class MinleonHeartbeat:
+    """Notice a controller coming back and give it its state again.
+
+    The firmware has no way to read its state, and after a power cut it
+    boots into its defaults while the client still caches the old state.
+    So any failed ping, or an outage seen by other commands, followed by a
+    ping that succeeds is treated as a restart, and the cached state is
+    re-sent.
+
+    The interval adapts to recent results: a failed ping drops it to
+    HEARTBEAT_MIN_INTERVAL so a reset GFCI is caught within seconds, and
+    every answered ping stretches it by HEARTBEAT_BACKOFF up to
+    HEARTBEAT_MAX_INTERVAL.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: MinleonLightingApiClient, entry_id: str) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.api = api
+        self.entry_id = entry_id
+        self.interval: float = HEARTBEAT_MIN_INTERVAL
+        self.pings = 0
+        self.recoveries = 0
+        self._down = False
+        self._outages = api.outages
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start checking the controller."""
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"minleon_heartbeat_{self.entry_id}"
+        )
+
+    async def async_stop(self) -> None:
+        """Stop checking the controller."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _async_run(self) -> None:
+        """Check the controller at the interval recent results chose."""
+        with background_priority():
+            while True:
+                await asyncio.sleep(self.interval)
+                await self._async_check()
+
+    async def _async_check(self) -> None:
+        """Ping, and re-send the state when the controller answers after a failure."""
+        self.pings += 1
+        answered = await self.api.async_ping()
+
+        if not answered or self.api.outages != self._outages:
+            self._outages = self.api.outages
+            if not self._down:
+                LOGGER.warning("Controller %s stopped answering", self.api.address)
+            self._down = True
+        if not answered:
+            self.interval = HEARTBEAT_MIN_INTERVAL
+            return
+        self.interval = min(self.interval * HEARTBEAT_BACKOFF, HEARTBEAT_MAX_INTERVAL)
+
+        if self._down:
+            LOGGER.info("Controller %s is back, re-sending its state", self.api.address)
+            if not await self.api.async_repush_state():
+                # Try again soon
+                self.interval = HEARTBEAT_MIN_INTERVAL
+                return
+            self._down = False
+            self.recoveries += 1
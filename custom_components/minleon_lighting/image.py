@@ -0,0 +1,98 @@
+"""Image platform for minleon-lighting effect previews."""
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+from homeassistant.components.image import ImageEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .api import MinleonLightingApiClient
+from .const import DOMAIN
+from .entity import MinleonEntity
+
+# Preview cache shared by every config entry
+PREVIEW_CACHE = f"{DOMAIN}_previews"
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Set up the effect preview image."""
+    api = hass.data[DOMAIN][entry.entry_id]
+    if (cache := hass.data.get(PREVIEW_CACHE)) is None:
+        # numpy is only loaded once a preview entity is set up
+        preview = await hass.async_add_executor_job(importlib.import_module, f"{__package__}.preview")
+        cache = hass.data[PREVIEW_CACHE] = preview.PreviewCache(
+            hass.config.path(f"{DOMAIN}_previews")
+        )
+    async_add_entities([MinleonEffectPreview(hass, api, entry, cache)], True)
+
+
+class MinleonEffectPreview(MinleonEntity, ImageEntity):
+    """Animated preview of the current effect in the current palette."""
+
+    _attr_content_type = "image/png"
+    _attr_icon = "mdi:animation-play"
+    _attr_name = "Effect Preview"
+    # Cache statistics change on every view
+    _unrecorded_attributes = frozenset(
+        {"memory_hits", "disk_hits", "misses", "hit_rate", "render_avg_ms", "render_max_ms"}
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: MinleonLightingApiClient,
+        entry: ConfigEntry,
+        cache,
+    ) -> None:
+        """Initialize."""
+        MinleonEntity.__init__(self, api, entry, "effect_preview")
+        ImageEntity.__init__(self, hass)
+        self._cache = cache
+        self._key: tuple | None = None
+
+    def _preview_key(self) -> tuple:
+        """Return the cache key of what the controller currently shows."""
+        effect = self.api.current_effect
+        if effect == "Off":
+            # Preview what turning the lights on would show
+            last_effect = self.api.last_effect
+            effect = last_effect if last_effect != "Off" else "Fixed Colors"
+        palette = tuple(tuple(color) for color in self.api.colors[:5]) + (
+            tuple(self.api.background_color),
+        )
+        return effect, palette, self.api.speed
+
+    @callback
+    def _async_refresh_key(self) -> None:
+        """Mark the image as updated when the effect, palette or speed changed."""
+        key = self._preview_key()
+        if key != self._key:
+            self._key = key
+            self._attr_image_last_updated = dt_util.utcnow()
+
+    async def async_update(self) -> None:
+        """Set the first preview key."""
+        self._async_refresh_key()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Refresh the preview key on every state change the client reports."""
+        self._async_refresh_key()
+        super().async_write_ha_state()
+
+    async def async_image(self) -> bytes | None:
+        """Return the preview, rendering it in the executor on a cache miss."""
+        key = self._key or self._preview_key()
+        if (image := self._cache.lookup(key)) is not None:
+            return image
+        image, source, render_time = await self.hass.async_add_executor_job(self._cache.fetch, key)
+        self._cache.store(key, image, source, render_time)
+        return image
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return preview cache statistics."""
+        return self._cache.stats
@@ -0,0 +1,81 @@
+"""Append-only state journal for minleon-lighting."""
+from __future__ import annotations
+
+import json
+import os
+
+from .const import LOGGER
+
+# Journal records kept before they are folded into the snapshot
+MAX_JOURNAL_RECORDS = 500
+
+
+class StateJournal:
+    """A state snapshot file plus an append-only journal of partial states.
+
+    Loading reads the snapshot and replays the journal over it, so the
+    result reflects every change that reached the journal. A line torn by a
+    crash ends the replay and is cut off. Once the journal holds
+    MAX_JOURNAL_RECORDS records it is compacted into the snapshot. Every
+    method does blocking file I/O and must run in the executor.
+    """
+
+    def __init__(self, snapshot_path: str, journal_path: str) -> None:
+        """Initialize."""
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self._records = 0
+
+    def load(self) -> dict:
+        """Return the snapshot with the journal replayed over it."""
+        state: dict = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as f:
+                state.update(json.load(f))
+        if os.path.exists(self.journal_path):
+            valid = 0
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        state.update(json.loads(line))
+                    except ValueError:
+                        break
+                    valid += len(line)
+                    self._records += 1
+                torn = f.seek(0, os.SEEK_END) > valid
+            if torn:
+                # Drop the torn tail so later appends start on a fresh line
+                LOGGER.debug("Dropping torn journal record in %s", self.journal_path)
+                os.truncate(self.journal_path, valid)
+        return state
+
+    def append(self, record: dict, snapshot: dict) -> None:
+        """Append a record and sync, compacting when the journal is full.
+
+        The snapshot must already include the record; it is only written
+        when the journal is compacted.
+        """
+        if self._records + 1 > MAX_JOURNAL_RECORDS:
+            self.compact(snapshot)
+            return
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._records += 1
+
+    def compact(self, snapshot: dict) -> None:
+        """Replace the snapshot atomically and empty the journal."""
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        # A crash before this truncation only replays records the snapshot already has
+        with open(self.journal_path, "w"):
+            pass
+        self._records = 0
+        LOGGER.debug("Compacted state journal into %s", self.snapshot_path)
@@ -17,8 +17,10 @@ from .const import (
     DEFAULT_BRIGHTNESS,
     DEFAULT_COLOR,
     KNOWN_EFFECTS,
+    COLOR_SLOTS,
 )
 from .api import MinleonLightingApiClient
+from .entity import MinleonEntity
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
@@ -29,23 +31,20 @@ async def async_setup_entry(hass, entry, async_add_entities):
     lights = [MinleonLightingLight(api, entry)]
 
     # Individual color slot entities (5 bulbs + 1 background)
-    for slot in range(1, 6):
-        lights.append(MinleonColorSlot(api, entry, slot, f"Bulb {slot}"))
-
-    # Background color (slot 6)
-    lights.append(MinleonColorSlot(api, entry, 6, "Background"))
+    for slot, slot_name in COLOR_SLOTS:
+        lights.append(MinleonColorSlot(api, entry, slot, slot_name))
 
     async_add_entities(lights)
 
 
-class MinleonLightingLight(LightEntity):
+class MinleonLightingLight(MinleonEntity, LightEntity):
     """minleon-lighting light class."""
 
     _attr_supported_features = LightEntityFeature.EFFECT
     _attr_supported_color_modes = {ColorMode.RGB}
     _attr_color_mode = ColorMode.RGB
     _attr_icon = "mdi:led-strip-variant"
-    _attr_has_entity_name = True
+    _attr_name = "Minleon Christmas Lights"
 
     def __init__(
         self,
@@ -53,32 +52,13 @@ class MinleonLightingLight(LightEntity):
         entry: ConfigEntry,
     ) -> None:
         """Initialize."""
-        self.api = api
-        self._config_entry = entry
-        self._attr_unique_id = f"minleon_{entry.entry_id}"
-        self._attr_name = "Minleon Christmas Lights"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": "Minleon Pixel Dancer Controller",
-            "manufacturer": "Minleon",
-            "model": "Pixel Dancer",
-            "sw_version": "1.0",
-        }
-
-    @property
-    def unique_id(self) -> str:
-        return self._attr_unique_id
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return True  # We'll assume it's available if configured
+        super().__init__(api, entry, None)
 
     @property
-    def effect_list(self) -> list[str]:
+    def effect_list(self) -> tuple[str, ...]:
         """Return the list of supported effects."""
         # Only return actual effects, not color presets
-        return self.api.available_effects.copy()
+        return self.api.available_effects
 
     @property
     def is_on(self) -> bool:
@@ -148,13 +128,12 @@ class MinleonLightingLight(LightEntity):
         pass
 
 
-class MinleonColorSlot(LightEntity):
+class MinleonColorSlot(MinleonEntity, LightEntity):
     """Individual color slot control."""
 
     _attr_supported_color_modes = {ColorMode.RGB}
     _attr_color_mode = ColorMode.RGB
     _attr_supported_features = 0  # No brightness, no on/off
-    _attr_has_entity_name = True
 
     def __init__(
         self,
@@ -164,29 +143,11 @@ class MinleonColorSlot(LightEntity):
         slot_name: str,
     ) -> None:
         """Initialize."""
-        self.api = api
-        self._config_entry = entry
+        super().__init__(api, entry, f"color_slot_{slot}")
         self._slot = slot
         self._slot_name = slot_name
-        self._attr_unique_id = f"minleon_color_slot_{slot}_{entry.entry_id}"
         self._attr_name = f"Color {slot_name}"
         self._attr_icon = "mdi:palette" if slot <= 5 else "mdi:wallpaper"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": "Minleon Pixel Dancer Controller",
-            "manufacturer": "Minleon",
-            "model": "Pixel Dancer",
-            "sw_version": "1.0",
-        }
-
-    @property
-    def unique_id(self) -> str:
-        return self._attr_unique_id
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return True
 
     @property
     def is_on(self) -> bool:
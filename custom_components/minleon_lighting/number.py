@@ -1,233 +1,108 @@
 """Number platform for minleon-lighting."""
+from __future__ import annotations
 
-from homeassistant.components.number import NumberEntity, NumberMode
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from homeassistant.components.number import (
+    NumberEntity,
+    NumberEntityDescription,
+    NumberMode,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import LOGGER, DOMAIN
 from .api import MinleonLightingApiClient
+from .entity import MinleonEntity
+
+
+@dataclass(frozen=True, kw_only=True)
+class MinleonNumberEntityDescription(NumberEntityDescription):
+    """Describes a Minleon effect parameter slider."""
+
+    value_fn: Callable[[MinleonLightingApiClient], int | None]
+    set_fn: Callable[[MinleonLightingApiClient, int], Awaitable[bool]]
+
+
+NUMBER_DESCRIPTIONS: tuple[MinleonNumberEntityDescription, ...] = (
+    MinleonNumberEntityDescription(
+        key="speed",
+        name="Speed",
+        icon="mdi:speedometer",
+        mode=NumberMode.SLIDER,
+        native_min_value=0,
+        native_max_value=100,
+        native_step=1,
+        value_fn=lambda api: api.speed,
+        set_fn=MinleonLightingApiClient.async_set_speed,
+    ),
+    MinleonNumberEntityDescription(
+        key="spacing",
+        name="Spacing",
+        icon="mdi:arrow-expand-horizontal",
+        mode=NumberMode.SLIDER,
+        native_min_value=1,
+        native_max_value=100,
+        native_step=1,
+        value_fn=lambda api: api.spacing,
+        set_fn=MinleonLightingApiClient.async_set_spacing,
+    ),
+    MinleonNumberEntityDescription(
+        key="amount",
+        name="Amount",
+        icon="mdi:numeric",
+        mode=NumberMode.SLIDER,
+        native_min_value=1,
+        native_max_value=100,
+        native_step=1,
+        value_fn=lambda api: api.amount,
+        set_fn=MinleonLightingApiClient.async_set_amount,
+    ),
+    MinleonNumberEntityDescription(
+        key="trails",
+        name="Trails",
+        icon="mdi:trail",
+        mode=NumberMode.SLIDER,
+        native_min_value=0,
+        native_max_value=100,
+        native_step=1,
+        value_fn=lambda api: api.trails,
+        set_fn=MinleonLightingApiClient.async_set_trails,
+    ),
+)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Setup number platform"""
     api = hass.data[DOMAIN][entry.entry_id]
-    numbers = [
-        MinleonSpeedControl(api, entry),
-        MinleonSpacingControl(api, entry),
-        MinleonAmountControl(api, entry),
-        MinleonTrailsControl(api, entry),
-    ]
-    async_add_entities(numbers)
-
-
-class MinleonSpeedControl(NumberEntity):
-    """Speed control for Minleon lighting."""
-
-    _attr_mode = NumberMode.SLIDER
-    _attr_native_min_value = 0
-    _attr_native_max_value = 100
-    _attr_native_step = 1
-    _attr_icon = "mdi:speedometer"
-    _attr_has_entity_name = True
-
-    def __init__(
-        self,
-        api: MinleonLightingApiClient,
-        entry: ConfigEntry,
-    ) -> None:
-        """Initialize."""
-        self.api = api
-        self._config_entry = entry
-        self._attr_unique_id = f"minleon_speed_{entry.entry_id}"
-        self._attr_name = "Speed"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": "Minleon Pixel Dancer Controller",
-            "manufacturer": "Minleon",
-            "model": "Pixel Dancer",
-            "sw_version": "1.0",
-        }
-
-    @property
-    def unique_id(self) -> str:
-        return self._attr_unique_id
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return True
-
-    @property
-    def native_value(self) -> float:
-        """Return the current speed value."""
-        return self.api.speed
-
-    async def async_set_native_value(self, value: float) -> None:
-        """Set new speed value."""
-        speed = int(value)
-        LOGGER.debug("Setting Minleon speed to %s", speed)
-
-        await self.api.async_set_speed(speed)
-        self.async_write_ha_state()
-
-
-class MinleonSpacingControl(NumberEntity):
-    """Spacing control for Minleon lighting effects."""
-
-    _attr_mode = NumberMode.SLIDER
-    _attr_native_min_value = 1
-    _attr_native_max_value = 100
-    _attr_native_step = 1
-    _attr_icon = "mdi:arrow-expand-horizontal"
-    _attr_has_entity_name = True
-
-    def __init__(
-        self,
-        api: MinleonLightingApiClient,
-        entry: ConfigEntry,
-    ) -> None:
-        """Initialize."""
-        self.api = api
-        self._config_entry = entry
-        self._attr_unique_id = f"minleon_spacing_{entry.entry_id}"
-        self._attr_name = "Spacing"
-        self._current_spacing = 0
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": "Minleon Pixel Dancer Controller",
-            "manufacturer": "Minleon",
-            "model": "Pixel Dancer",
-            "sw_version": "1.0",
-        }
-
-    @property
-    def unique_id(self) -> str:
-        return self._attr_unique_id
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return True
-
-    @property
-    def native_value(self) -> float:
-        """Return the current spacing value."""
-        return self._current_spacing
-
-    async def async_set_native_value(self, value: float) -> None:
-        """Set new spacing value."""
-        spacing = int(value)
-        LOGGER.debug("Setting Minleon spacing to %s", spacing)
-
-        result = await self.api._send_command({"fxn": 1, "spacing": str(spacing)})
-        if result:
-            self._current_spacing = spacing
-        self.async_write_ha_state()
+    async_add_entities(
+        MinleonNumber(api, entry, description) for description in NUMBER_DESCRIPTIONS
+    )
 
 
-class MinleonAmountControl(NumberEntity):
-    """Amount control for Minleon lighting effects."""
+class MinleonNumber(MinleonEntity, NumberEntity):
+    """Effect parameter slider for Minleon lighting."""
 
-    _attr_mode = NumberMode.SLIDER
-    _attr_native_min_value = 1
-    _attr_native_max_value = 100
-    _attr_native_step = 1
-    _attr_icon = "mdi:numeric"
-    _attr_has_entity_name = True
+    entity_description: MinleonNumberEntityDescription
 
     def __init__(
         self,
         api: MinleonLightingApiClient,
         entry: ConfigEntry,
+        description: MinleonNumberEntityDescription,
     ) -> None:
         """Initialize."""
-        self.api = api
-        self._config_entry = entry
-        self._attr_unique_id = f"minleon_amount_{entry.entry_id}"
-        self._attr_name = "Amount"
-        self._current_amount = 50
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": "Minleon Pixel Dancer Controller",
-            "manufacturer": "Minleon",
-            "model": "Pixel Dancer",
-            "sw_version": "1.0",
-        }
-
-    @property
-    def unique_id(self) -> str:
-        return self._attr_unique_id
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return True
+        super().__init__(api, entry, description.key)
+        self.entity_description = description
 
     @property
-    def native_value(self) -> float:
-        """Return the current amount value."""
-        return self._current_amount
+    def native_value(self) -> float | None:
+        """Return the current value."""
+        return self.entity_description.value_fn(self.api)
 
     async def async_set_native_value(self, value: float) -> None:
-        """Set new amount value."""
-        amount = int(value)
-        LOGGER.debug("Setting Minleon amount to %s", amount)
-
-        result = await self.api._send_command({"fxn": 1, "amount": str(amount)})
-        if result:
-            self._current_amount = amount
+        """Set new value."""
+        LOGGER.debug("Setting Minleon %s to %s", self.entity_description.key, int(value))
+        await self.entity_description.set_fn(self.api, int(value))
         self.async_write_ha_state()
-
-
-class MinleonTrailsControl(NumberEntity):
-    """Trails control for Minleon lighting effects."""
-
-    _attr_mode = NumberMode.SLIDER
-    _attr_native_min_value = 0
-    _attr_native_max_value = 100
-    _attr_native_step = 1
-    _attr_icon = "mdi:trail"
-    _attr_has_entity_name = True
-
-    def __init__(
-        self,
-        api: MinleonLightingApiClient,
-        entry: ConfigEntry,
-    ) -> None:
-        """Initialize."""
-        self.api = api
-        self._config_entry = entry
-        self._attr_unique_id = f"minleon_trails_{entry.entry_id}"
-        self._attr_name = "Trails"
-        self._current_trails = 50
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": "Minleon Pixel Dancer Controller",
-            "manufacturer": "Minleon",
-            "model": "Pixel Dancer",
-            "sw_version": "1.0",
-        }
-
-    @property
-    def unique_id(self) -> str:
-        return self._attr_unique_id
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return True
-
-    @property
-    def native_value(self) -> float:
-        """Return the current trails value."""
-        return self._current_trails
-
-    async def async_set_native_value(self, value: float) -> None:
-        """Set new trails value."""
-        trails = int(value)
-        LOGGER.debug("Setting Minleon trails to %s", trails)
-
-        result = await self.api._send_command({"fxn": 1, "trails": str(trails)})
-        if result:
-            self._current_trails = trails
-        self.async_write_ha_state()
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""Effect playlist engine for minleon-lighting."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+from .api import MinleonLightingApiClient, background_priority
+from .const import LOGGER
+
+# Number of brightness steps used for each half of a crossfade
+CROSSFADE_STEPS = 5
+
+
+@dataclass
+class PlaylistStep:
+    """A single step of a playlist."""
+
+    duration: float
+    effect: str | None = None
+    preset: str | None = None
+    brightness: int | None = None
+    speed: int | None = None
+    crossfade: float = 0.0
+
+    @property
+    def command_count(self) -> int:
+        """Return how many controller commands the step transition sends."""
+        count = 0
+        if self.preset is not None:
+            count += 1  # Palette slots are pushed concurrently
+        if self.effect is not None:
+            count += 1
+        if self.brightness is not None:
+            count += 1
+        if self.speed is not None:
+            count += 1
+        return count
+
+
+class MinleonPlaylistRunner:
+    """Run a playlist of steps against one controller.
+
+    Step deadlines are derived from a single monotonic start time, so slow
+    commands never push later steps back. Each transition is sent ahead of
+    its deadline by the expected time the commands take to go out.
+    """
+
+    def __init__(self, api: MinleonLightingApiClient) -> None:
+        """Initialize."""
+        self.api = api
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Return True if a playlist is currently running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self, steps: list[PlaylistStep], loops: int = 0) -> None:
+        """Start a playlist, replacing any running one.
+
+        A loops value of 0 repeats the playlist until it is stopped.
+        """
+        self.stop()
+        with background_priority():
+            self._task = self.api._create_task(
+                self._run(steps, loops), f"minleon_playlist_{self.api.address}"
+            )
+
+    def stop(self) -> None:
+        """Stop the running playlist, if any."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def async_stop(self) -> None:
+        """Stop the running playlist and wait for it to finish."""
+        task = self._task
+        self.stop()
+        if task is not None:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self, steps: list[PlaylistStep], loops: int) -> None:
+        """Run the playlist until it ends or is cancelled."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        iteration = 0
+        first = True
+        # Brightness to put back if the playlist stops in the middle of a crossfade
+        faded_from: int | None = None
+
+        LOGGER.info("Starting playlist with %d steps on %s", len(steps), self.api.address)
+        try:
+            while loops == 0 or iteration < loops:
+                for step in steps:
+                    colors = self._prefetch(step)
+                    lead = self.api.command_latency * step.command_count
+                    fade = min(step.crossfade, step.duration) / 2
+                    fading = bool(fade) and not first
+                    restore = self.api.brightness
+
+                    if fading:
+                        faded_from = restore
+                        await self._fade(deadline - fade - lead, fade, restore, 0)
+
+                    await self._sleep_until(deadline - lead)
+                    await self._apply(step, colors, fading)
+
+                    if fading:
+                        target = step.brightness if step.brightness is not None else restore
+                        await self._fade(deadline, fade, 0, target)
+                        faded_from = None
+
+                    deadline += step.duration
+                    first = False
+                iteration += 1
+        finally:
+            if faded_from is not None:
+                await self.api.async_set_brightness(faded_from)
+            # Brightness and speed steps do not update entities while running
+            self.api.notify_state_changed()
+            LOGGER.info("Playlist on %s stopped", self.api.address)
+
+    def _prefetch(self, step: PlaylistStep) -> list[tuple[int, int, int]] | None:
+        """Resolve the step's preset colors before its deadline."""
+        if step.preset is None:
+            return None
+        palette = self.api.get_preset_palette(step.preset)
+        if palette is None:
+            LOGGER.warning("Playlist references unknown preset: %s", step.preset)
+        return palette
+
+    async def _apply(
+        self,
+        step: PlaylistStep,
+        colors: list[tuple[int, int, int]] | None,
+        fading: bool,
+    ) -> None:
+        """Send the commands for a step transition."""
+        if colors is not None:
+            await self.api.async_apply_palette(colors, step.preset, only_changed=True)
+        if step.effect is not None:
+            await self.api.async_set_effect(step.effect)
+        if step.speed is not None:
+            await self.api.async_set_speed(step.speed)
+        if step.brightness is not None and not fading:
+            await self.api.async_set_brightness(step.brightness)
+
+    async def _fade(self, start: float, duration: float, begin: int, end: int) -> None:
+        """Ramp brightness from begin to end over duration, starting at start."""
+        for i in range(1, CROSSFADE_STEPS + 1):
+            await self._sleep_until(start + duration * i / CROSSFADE_STEPS)
+            await self.api.async_set_brightness(round(begin + (end - begin) * i / CROSSFADE_STEPS))
+
+    @staticmethod
+    async def _sleep_until(when: float) -> None:
+        """Sleep until the given event loop time."""
+        delay = when - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,100 @@
+"""Holiday preset rules and their date tables for minleon-lighting.
+
+Kept free of Home Assistant imports so the rules can be checked and
+tested on their own.
+"""
+from __future__ import annotations
+
+import calendar
+from datetime import date, timedelta
+import re
+
+_DATE_RE = re.compile(r"^(?:(\d{1,2})-(\d{1,2})|(easter|thanksgiving)([+-]\d+)?)$")
+
+
+def _easter(year: int) -> date:
+    """Return Western Easter Sunday for a year (anonymous Gregorian computus)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _thanksgiving(year: int) -> date:
+    """Return US Thanksgiving (fourth Thursday of November) for a year."""
+    first = date(year, 11, 1)
+    return first + timedelta(days=(3 - first.weekday()) % 7 + 21)
+
+
+def _resolve_date(token: str, year: int) -> date:
+    """Resolve a rule date token to a date in the given year."""
+    match = _DATE_RE.match(token.strip().lower())
+    if match is None:
+        raise ValueError(f"Invalid date: {token}")
+    month, day, anchor, offset = match.groups()
+    if anchor is None:
+        month, day = int(month), int(day)
+        if not 1 <= month <= 12:
+            raise ValueError(f"Invalid date: {token}")
+        # Clamp 02-29 and similar to the last day of the month
+        last_day = calendar.monthrange(year, month)[1]
+        if not 1 <= day <= 31:
+            raise ValueError(f"Invalid date: {token}")
+        return date(year, month, min(day, last_day))
+    base = _easter(year) if anchor == "easter" else _thanksgiving(year)
+    return base + timedelta(days=int(offset or 0))
+
+
+def parse_rules(text: str) -> list[tuple[str, str, str]]:
+    """Parse "start..end: Preset" lines into (start, end, preset) tuples.
+
+    Blank lines and lines starting with # are ignored. Raises ValueError on
+    malformed lines or unknown presets.
+    """
+    from .client import preset_palettes
+
+    rules = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        dates, sep, preset = line.partition(":")
+        start, dots, end = dates.partition("..")
+        preset = preset.strip()
+        if not sep or not dots or not preset:
+            raise ValueError(f"Invalid rule: {line}")
+        if preset not in preset_palettes():
+            raise ValueError(f"Unknown preset: {preset}")
+        # Validate both dates against a leap year
+        _resolve_date(start, 2000)
+        _resolve_date(end, 2000)
+        rules.append((start.strip(), end.strip(), preset))
+    return rules
+
+
+def build_year_table(year: int, rules: list[tuple[str, str, str]]) -> list[str | None]:
+    """Return the preset for every day of a year, indexed by day of year - 1.
+
+    A range whose end falls before its start wraps around the new year and
+    covers both the end and the beginning of the same calendar year.
+    """
+    days = 366 if calendar.isleap(year) else 365
+    table: list[str | None] = [None] * days
+    # Apply in reverse so the first matching rule ends up on top
+    for start_token, end_token, preset in reversed(rules):
+        start = _resolve_date(start_token, year).timetuple().tm_yday - 1
+        end = _resolve_date(end_token, year).timetuple().tm_yday - 1
+        if start <= end:
+            spans = [(start, end)]
+        else:
+            spans = [(start, days - 1), (0, end)]
+        for first, last in spans:
+            table[first:last + 1] = [preset] * (last - first + 1)
+    return table
@@ -0,0 +1,216 @@
+"""Color preset tables for minleon-lighting.
+
+The tables are only imported when a preset is first needed, and compiled
+once into ready-to-send slot palettes.
+"""
+from __future__ import annotations
+
+# Holiday presets from Pixel Dancer app
+HOLIDAY_PRESETS = {
+    "New Year": {"colors": ["#FFD700", "#FEFFFF"]},
+    "Valentines Day": {"colors": ["#E63B7A", "#F4A4C0"]},
+    "St Patricks Day": {"colors": ["#008000", "#FEFFFF"]},
+    "Mardi Gras": {"colors": ["#008000", "#800080", "#FFFF00"]},
+    "Easter": {"colors": ["#FFC0CB", "#800080", "#FFFF00"]},
+    "Earth Day": {"colors": ["#00FF00", "#0000FF"]},
+    "Independence Day": {"colors": ["#FF0000", "#FEFFFF", "#0000FF"]},
+    "Halloween": {"colors": ["#FF7F00", "#800080", "#008000"]},
+    "Thanksgiving": {"colors": ["#FF0000", "#FFA500", "#FFFF00"]},
+    "Christmas": {"colors": ["#FF0000", "#00FF00", "#FEFFFF"]},
+    "Hanukkah": {"colors": ["#FEFFFF", "#0000FF"]},
+    "Kwanzaa": {"colors": ["#FF0000", "#FEDF00"]}
+}
+
+# NFL Team presets
+NFL_PRESETS = {
+    "Arizona Cardinals": {"colors": ["#EFCA15", "#FF0000", "#002868", "#CE5C17"]},
+    "Atlanta Falcons": {"colors": ["#FF0000", "#002868", "#FFFFFE"]},
+    "Baltimore Ravens": {"colors": ["#000000", "#EFCA15", "#FF0000"]},
+    "Buffalo Bills": {"colors": ["#002A86", "#F3CC1B", "#4E9DD2", "#C6762F"]},
+    "Carolina Panthers": {"colors": ["#4E9DD2"]},
+    "Chicago Bears": {"colors": ["#FF0000", "#000000", "#FFFFFE"]},
+    "Cincinnati Bengals": {"colors": ["#DA251D", "#000000"]},
+    "Cleveland Browns": {"colors": ["#EFCA15", "#DA251D", "#002A86"]},
+    "Dallas Cowboys": {"colors": ["#0000EC", "#815300"]},
+    "Denver Broncos": {"colors": ["#FF7F00", "#FFFFFE"]},
+    "Detroit Lions": {"colors": ["#002673", "#C70E2E", "#F5DC0F", "#FFFFFE"]},
+    "Green Bay Packers": {"colors": ["#002A86", "#FFFFFE", "#01633C"]},
+    "Houston Texans": {"colors": ["#FF0000"]},
+    "Indianapolis Colts": {"colors": ["#010E5D", "#F5DC0F"]},
+    "Jacksonville Jaguars": {"colors": ["#FF0000", "#F5DC0F"]},
+    "Kansas City Chiefs": {"colors": ["#F5DC0F", "#00450E"]},
+    "Miami Dolphins": {"colors": ["#C70F2E", "#000000"]},
+    "Minnesota Vikings": {"colors": ["#FFFFFE", "#3D68C9"]},
+    "New Orleans Saints": {"colors": ["#F5DC0F", "#FF0000", "#3D68C9"]},
+    "New York Giants": {"colors": ["#BE8225", "#FFFFFE", "#592B20", "#7B7B7B"]},
+    "Oakland Raiders": {"colors": ["#592B20"]},
+    "Philadelphia Eagles": {"colors": ["#010E5D", "#F5DC0F"]},
+    "Pittsburgh Steelers": {"colors": ["#042A57", "#CEBC72", "#D4DDE1", "#FFFFFE"]},
+    "San Diego Chargers": {"colors": ["#AA0000", "#FFCC00", "#FFFFFE"]},
+    "San Francisco 49ers": {"colors": ["#FFCC00"]},
+    "Seattle Seahawks": {"colors": ["#009E3C"]},
+    "St Louis Rams": {"colors": ["#F3E6B3", "#0094DE", "#006E2B", "#A51C15"]},
+    "Tampa Bay Buccaneers": {"colors": ["#002655", "#FFFFFE"]},
+    "Tennessee Titans": {"colors": ["#CC0000", "#002D65", "#FFFFFE"]},
+    "Washington Commanders": {"colors": ["#008457", "#FFD520", "#34C2DE", "#000000"]}
+}
+
+# Country Flag presets
+NATION_PRESETS = {
+    "Argentina": {"colors": ["#F5EC00", "#FFFFFE", "#52D6FC"]},
+    "Australia": {"colors": ["#FF0000", "#FFFFFE", "#0000FF"]},
+    "Belgium": {"colors": ["#000000", "#FFFF00", "#FF0000"]},
+    "Brazil": {"colors": ["#00FF00", "#FEDF00", "#0000FF"]},
+    "Canada": {"colors": ["#FF0000", "#FFFFFE"]},
+    "Chile": {"colors": ["#FE0000", "#0100CF", "#FFFFFE"]},
+    "China": {"colors": ["#FF0000", "#FFFF00"]},
+    "Colombia": {"colors": ["#FF0000", "#013893", "#FDD116"]},
+    "Finland": {"colors": ["#0024C7", "#FFFFFE"]},
+    "France": {"colors": ["#0000FF", "#FFFFFE", "#FF0000"]},
+    "Germany": {"colors": ["#FECE00", "#DC0000", "#000000"]},
+    "Greece": {"colors": ["#029FE8", "#FEFEFC"]},
+    "Indonesia": {"colors": ["#FE0000", "#FFFFFE"]},
+    "Iran": {"colors": ["#00FF00", "#FFFFFE", "#DA0000"]},
+    "Italy": {"colors": ["#00FF00", "#FFFFFE", "#FF0000"]},
+    "Japan": {"colors": ["#FF0000", "#FFFFFE"]},
+    "Lebanon": {"colors": ["#FF0000", "#FEFEFE", "#00FF00"]},
+    "Malaysia": {"colors": ["#FF0000", "#08399C", "#FFDE00", "#FFFFFE"]},
+    "Mexico": {"colors": ["#006847", "#FFFFFE", "#FF0000"]},
+    "Netherlands": {"colors": ["#FF0000", "#FFFFFE", "#00329B"]},
+    "New Zealand": {"colors": ["#00247D", "#FF0000", "#FFFFFE"]},
+    "Norway": {"colors": ["#FF0000", "#FFFFFE", "#0000FF"]},
+    "Peru": {"colors": ["#FE0000", "#FFFFFE"]},
+    "Russia": {"colors": ["#FFFFFE", "#0000FE", "#FE0000"]},
+    "Saudi Arabia": {"colors": ["#00FF00", "#8FC3AF"]},
+    "Singapore": {"colors": ["#FF0000", "#F3F3F7"]},
+    "South Africa": {"colors": ["#FFAB01", "#00FF00", "#FFFFFE", "#FF0000", "#0000FF"]},
+    "Spain": {"colors": ["#DB000D", "#FBEA0E"]},
+    "Sweden": {"colors": ["#0983F0", "#FFFF00"]},
+    "Thailand": {"colors": ["#FD0102", "#FFFFFE", "#000097"]},
+    "United Kingdom": {"colors": ["#0000FF", "#FF0000", "#FFFFFE"]},
+    "United States": {"colors": ["#FF0000", "#FFFFFE", "#0000FF"]}
+}
+
+# Soccer Team presets
+SOCCER_PRESETS = {
+    "Arsenal": {"colors": ["#FF0000", "#FFFFFE"]},
+    "Aston Villa": {"colors": ["#FFD520", "#FF0000", "#6D76B3"]},
+    "Cardiff City": {"colors": ["#FF0000", "#EFD413", "#FFFFFE", "#0000FF"]},
+    "Chelsea": {"colors": ["#0000FF", "#FFFFFE"]},
+    "Crystal Palace": {"colors": ["#013BD0", "#FFFFFE", "#AEAEAE", "#FF0000"]},
+    "Everton": {"colors": ["#0000FF", "#FFFFFE"]},
+    "Fulham": {"colors": ["#FF0000", "#FFFFFE"]},
+    "Hull City": {"colors": ["#FAA619", "#FFFFFE"]},
+    "Liverpool": {"colors": ["#E1040D", "#0000EC", "#FFFFFE"]},
+    "Manchester City": {"colors": ["#B9B810", "#115D9B", "#FFFFFE", "#000000"]},
+    "Manchester United": {"colors": ["#FF0000", "#FFFF00"]},
+    "Newcastle United": {"colors": ["#D6D7D9", "#12B2DE", "#EBCD7C"]},
+    "Norwich City": {"colors": ["#FFF300", "#00FF00"]},
+    "Southampton": {"colors": ["#FF0700", "#FFFFFE", "#FDEC2E", "#00FF00"]},
+    "Stoke City": {"colors": ["#F90103", "#10127F", "#FFFFFE"]},
+    "Sunderland": {"colors": ["#000000", "#F10400", "#C4BC00"]},
+    "Swansea City": {"colors": ["#000000", "#FFFFFE"]},
+    "Tottenham Hotspur": {"colors": ["#FFFFFE", "#00015F"]},
+    "West Bromwich Albion": {"colors": ["#38377F", "#8B5F37"]},
+    "West Ham United": {"colors": ["#FAD31D", "#901F4E"]}
+}
+
+# Australian Football presets
+AUSTRALIAN_FOOTBALL_PRESETS = {
+    "Brisbane Broncos": {"colors": ["#650038", "#FCCC3B"]},
+    "Canberra Raiders": {"colors": ["#01A750", "#5F707C"]},
+    "Canterbury-Bankstown Bulldogs": {"colors": ["#00458C", "#FFFFFE"]},
+    "Cronulla-Sutherland Sharks": {"colors": ["#008FC5", "#000000", "#FFFFFE"]},
+    "Gold Coast Titans": {"colors": ["#FFAB01", "#00A9E7", "#FFFFFE"]},
+    "Manly-Warringah Sea Eagles": {"colors": ["#69143B", "#FCFCFC"]},
+    "Melbourne Storm": {"colors": ["#64027B", "#E9C01A", "#070D51"]},
+    "New Zealand Warriors": {"colors": ["#008752", "#FFFFFE", "#000000"]},
+    "Newcastle Knights": {"colors": ["#EE3124", "#000000", "#0055A5", "#FFFFFE"]},
+    "North Queensland Cowboys": {"colors": ["#FFDE00", "#001949"]},
+    "Parramatta Eels": {"colors": ["#012C92", "#FFD001", "#FFFFFE"]},
+    "Penrith Panthers": {"colors": ["#231F20", "#006F83", "#A82D45"]},
+    "South Sydney Rabbitohs": {"colors": ["#00582D", "#CB1B22", "#FFFFFE"]},
+    "St. George Illawarra Dragons": {"colors": ["#000000", "#D92B1C", "#FFFDFE"]},
+    "Sydney Roosters": {"colors": ["#EE3124", "#003A74", "#FFFFFE", "#F8CE50"]},
+    "Wests Tigers": {"colors": ["#F6831F", "#EEEFEF"]}
+}
+
+# NBA Team presets
+NBA_PRESETS = {
+    "Atlanta Hawks": {"colors": ["#E03A3E", "#C1D32F"]},
+    "Boston Celtics": {"colors": ["#007A33", "#BA9653"]},
+    "Brooklyn Nets": {"colors": ["#000000", "#FFFFFF"]},
+    "Charlotte Hornets": {"colors": ["#1D1160", "#00788C"]},
+    "Chicago Bulls": {"colors": ["#CE1141", "#000000"]},
+    "Cleveland Cavaliers": {"colors": ["#6F263D", "#FFB81C"]},
+    "Dallas Mavericks": {"colors": ["#00538C", "#002B5E"]},
+    "Denver Nuggets": {"colors": ["#0E2240", "#FEC524"]},
+    "Detroit Pistons": {"colors": ["#C8102E", "#1D42BA"]},
+    "Golden State Warriors": {"colors": ["#1D428A", "#FFC72C"]},
+    "Houston Rockets": {"colors": ["#CE1141", "#000000"]},
+    "Indiana Pacers": {"colors": ["#002D62", "#FDBB30"]},
+    "LA Clippers": {"colors": ["#C8102E", "#1D428A"]},
+    "Los Angeles Lakers": {"colors": ["#552583", "#FDB927"]},
+    "Memphis Grizzlies": {"colors": ["#5D76A9", "#12173F"]},
+    "Miami Heat": {"colors": ["#98002E", "#F9A01B"]},
+    "Milwaukee Bucks": {"colors": ["#00471B", "#EEE1C6"]},
+    "Minnesota Timberwolves": {"colors": ["#0C2340", "#236192"]},
+    "New Orleans Pelicans": {"colors": ["#0C2340", "#C8102E"]},
+    "New York Knicks": {"colors": ["#006BB6", "#F58426"]},
+    "Ohio State Buckeyes": {"colors": ["#BB0000", "#666666"]},
+    "Oklahoma City Thunder": {"colors": ["#007AC1", "#EF3B24"]},
+    "Orlando Magic": {"colors": ["#0077C0", "#C4CED4"]},
+    "Philadelphia 76ers": {"colors": ["#006BB6", "#ED174C"]},
+    "Phoenix Suns": {"colors": ["#1D1160", "#E56020"]},
+    "Portland Trail Blazers": {"colors": ["#E03A3E", "#000000"]},
+    "Sacramento Kings": {"colors": ["#5A2D81", "#63727A"]},
+    "San Antonio Spurs": {"colors": ["#C4CED4", "#000000"]},
+    "Toronto Raptors": {"colors": ["#CE1141", "#000000"]},
+    "Utah Jazz": {"colors": ["#002B5C", "#00471B"]},
+    "Washington Wizards": {"colors": ["#002B5C", "#E31837"]}
+}
+
+
+PRESET_CATEGORIES = (
+    HOLIDAY_PRESETS,
+    NFL_PRESETS,
+    NATION_PRESETS,
+    SOCCER_PRESETS,
+    AUSTRALIAN_FOOTBALL_PRESETS,
+    NBA_PRESETS,
+)
+
+
+def _parse(hex_color: str) -> tuple[int, int, int]:
+    """Convert #RRGGBB to an RGB tuple."""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[j:j+2], 16) for j in (0, 2, 4))
+
+
+def preset_colors(name: str) -> list[tuple[int, int, int]] | None:
+    """Return a preset's own colors, without slot padding, or None if unknown."""
+    for presets in PRESET_CATEGORIES:
+        if name in presets:
+            return [_parse(color) for color in presets[name]["colors"]]
+    return None
+
+
+def compile_palettes() -> dict[str, tuple[tuple[int, int, int], ...]]:
+    """Compile every preset into its five bulb slot colors.
+
+    Slots beyond a preset's colors are cleared to black. Earlier categories
+    win when names collide.
+    """
+    palettes: dict[str, tuple[tuple[int, int, int], ...]] = {}
+    for presets in PRESET_CATEGORIES:
+        for name, preset in presets.items():
+            if name in palettes:
+                continue
+            palette = []
+            for i in range(5):
+                if i < len(preset["colors"]):
+                    palette.append(_parse(preset["colors"][i]))
+                else:
+                    palette.append((0, 0, 0))
+            palettes[name] = tuple(palette)
+    return palettes
@@ -0,0 +1,163 @@
+"""Cached animated effect previews for minleon-lighting."""
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from .const import LOGGER
+from .renderer import EffectRenderer
+
+# Preview strip size and animation
+PREVIEW_PIXELS = 50
+PIXEL_SIZE = 8
+PREVIEW_FRAMES = 30
+PREVIEW_FPS = 15
+
+# Cache bounds: encoded previews kept in memory, and bytes kept on disk
+MEMORY_ENTRIES = 32
+DISK_BYTES = 20 * 1024 * 1024
+
+PreviewKey = tuple[str, tuple[tuple[int, int, int], ...], int]
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    """Return a PNG chunk."""
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_apng(frames: np.ndarray, fps: int) -> bytes:
+    """Encode frames of shape (count, height, width, 3) as a looping animated PNG."""
+    count, height, width, _ = frames.shape
+    parts = [
+        b"\x89PNG\r\n\x1a\n",
+        _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+        _chunk(b"acTL", struct.pack(">II", count, 0)),
+    ]
+    # Every scanline gets filter type 0 (none)
+    rows = np.zeros((height, 1 + width * 3), dtype=np.uint8)
+    sequence = 0
+    for index, frame in enumerate(frames):
+        parts.append(
+            _chunk(b"fcTL", struct.pack(">IIIIIHHBB", sequence, width, height, 0, 0, 1, fps, 0, 0))
+        )
+        sequence += 1
+        rows[:, 1:] = frame.reshape(height, width * 3)
+        data = zlib.compress(rows.tobytes(), 6)
+        if index == 0:
+            parts.append(_chunk(b"IDAT", data))
+        else:
+            parts.append(_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+            sequence += 1
+    parts.append(_chunk(b"IEND", b""))
+    return b"".join(parts)
+
+
+def render_preview(effect: str, colors: tuple, background: tuple[int, int, int], speed: int) -> bytes:
+    """Render an animated preview strip of an effect."""
+    renderer = EffectRenderer(PREVIEW_PIXELS, list(colors), background, {"speed": speed})
+    frames = np.empty((PREVIEW_FRAMES, PIXEL_SIZE, PREVIEW_PIXELS * PIXEL_SIZE, 3), dtype=np.uint8)
+    for index in range(PREVIEW_FRAMES):
+        strip = np.repeat(renderer.render(effect, index / PREVIEW_FPS), PIXEL_SIZE, axis=0)
+        frames[index] = strip[None]
+    return encode_apng(frames, PREVIEW_FPS)
+
+
+class PreviewCache:
+    """Two-level LRU cache of preview images keyed by (effect, palette, speed).
+
+    lookup() and store() touch only the in-memory level and run on the
+    event loop; fetch() reads the disk level or renders, and runs in the
+    executor. The disk level is bounded by total size, evicting the least
+    recently used files.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Initialize."""
+        self.directory = directory
+        self._memory: OrderedDict[PreviewKey, bytes] = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._render_total = 0.0
+        self._render_max = 0.0
+
+    def lookup(self, key: PreviewKey) -> bytes | None:
+        """Return a preview from memory, or None."""
+        if (image := self._memory.get(key)) is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+        return image
+
+    def store(self, key: PreviewKey, image: bytes, source: str, render_time: float) -> None:
+        """Keep a fetched preview in memory and record how it was obtained."""
+        if source == "disk":
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            self._render_total += render_time
+            self._render_max = max(self._render_max, render_time)
+        self._memory[key] = image
+        while len(self._memory) > MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def fetch(self, key: PreviewKey) -> tuple[bytes, str, float]:
+        """Return (image, "disk" or "render", render seconds), reading or rendering it."""
+        path = os.path.join(self.directory, self._file_name(key))
+        try:
+            with open(path, "rb") as f:
+                image = f.read()
+            os.utime(path)
+            return image, "disk", 0.0
+        except OSError:
+            pass
+
+        start = time.perf_counter()
+        effect, palette, speed = key
+        image = render_preview(effect, palette[:5], palette[5], speed)
+        elapsed = time.perf_counter() - start
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(image)
+            self._trim_disk()
+        except OSError as ex:
+            LOGGER.warning("Failed to cache effect preview: %s", ex)
+        return image, "render", elapsed
+
+    @property
+    def stats(self) -> dict:
+        """Return hit counts, hit rate and render times."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((lookups - self.misses) / lookups, 3) if lookups else None,
+            "render_avg_ms": round(self._render_total / self.misses * 1000, 1) if self.misses else None,
+            "render_max_ms": round(self._render_max * 1000, 1),
+        }
+
+    @staticmethod
+    def _file_name(key: PreviewKey) -> str:
+        """Return the disk file name of a key."""
+        return hashlib.sha1(repr(key).encode()).hexdigest() + ".png"
+
+    def _trim_disk(self) -> None:
+        """Delete the least recently used files until the directory fits DISK_BYTES."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= DISK_BYTES:
+                break
+            os.remove(path)
+            total -= size
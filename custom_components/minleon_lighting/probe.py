@@ -0,0 +1,72 @@
+"""Finding Pixel Dancer controllers on the network for minleon-lighting.
+
+Needs only aiohttp, so scripts can scan without Home Assistant.
+"""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+
+import aiohttp
+
+from .const import LOGGER
+
+# Command with no fields: accepted by the controller without changing anything
+PROBE_PAYLOAD = json.dumps({"fxn": 1}, separators=(",", ":")).encode()
+PROBE_TIMEOUT = 0.5
+SCAN_CONCURRENCY = 64
+# Largest network the scan accepts (a /22)
+MAX_SCAN_HOSTS = 1024
+
+
+def format_host(address: str, port: int) -> str:
+    """Return the host string the API client expects for an address and port."""
+    return address if port == 80 else f"{address}:{port}"
+
+
+async def async_probe_host(
+    session: aiohttp.ClientSession, host: str, timeout: float = PROBE_TIMEOUT
+) -> str | None:
+    """Return the controller's response body if host answers like a Pixel Dancer."""
+    try:
+        async with session.post(
+            f"http://{host}/api/control",
+            data=PROBE_PAYLOAD,
+            headers={"Content-Type": "text/plain;charset=UTF-8"},
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            if response.status != 200:
+                return None
+            return await response.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+        return None
+
+
+async def async_scan_network(
+    session: aiohttp.ClientSession,
+    network: str,
+    ports: tuple[int, ...] = (80,),
+    timeout: float = PROBE_TIMEOUT,
+    concurrency: int = SCAN_CONCURRENCY,
+) -> dict[str, str]:
+    """Probe every address of a network and map the hosts that answer to their response.
+
+    At most concurrency probes run at once, each bounded by timeout, so a
+    /24 finishes in a few seconds even when nothing answers.
+    """
+    net = ipaddress.ip_network(network, strict=False)
+    if net.num_addresses > MAX_SCAN_HOSTS:
+        raise ValueError(f"Network {network} is too large to scan")
+    addresses = list(net.hosts()) or [net.network_address]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(host: str) -> str | None:
+        async with semaphore:
+            return await async_probe_host(session, host, timeout)
+
+    hosts = [format_host(str(address), port) for address in addresses for port in ports]
+    responses = await asyncio.gather(*(probe(host) for host in hosts))
+    found = {host: body for host, body in zip(hosts, responses) if body is not None}
+    LOGGER.debug("Scan of %s found %d controllers", network, len(found))
+    return found
@@ -0,0 +1,123 @@
+"""On-demand CPU and allocation profiling of minleon-lighting."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DOMAIN, LOGGER
+
+# Frames kept per allocation; more attributes allocations to their callers
+TRACEMALLOC_FRAMES = 10
+
+# Entries of each kind returned in the service response
+TOP_ENTRIES = 15
+
+_PACKAGE_DIR = os.path.dirname(__file__)
+
+_lock = asyncio.Lock()
+
+
+def _top_functions(profile_path: str) -> list[dict]:
+    """Return the package functions with the most cumulative time."""
+    stats = pstats.Stats(profile_path)
+    rows = [
+        (cumulative, total, calls, f"{os.path.basename(file)}:{line}({name})")
+        for (file, line, name), (_, calls, total, cumulative, _) in stats.stats.items()
+        if file.startswith(_PACKAGE_DIR)
+    ]
+    rows.sort(reverse=True)
+    return [
+        {
+            "function": function,
+            "calls": calls,
+            "total_ms": round(total * 1000, 2),
+            "cumulative_ms": round(cumulative * 1000, 2),
+        }
+        for cumulative, total, calls, function in rows[:TOP_ENTRIES]
+    ]
+
+
+def _save_allocations(snapshot: tracemalloc.Snapshot, path: str) -> list[dict]:
+    """Keep the package's allocations, dump them and return the largest sites.
+
+    An allocation is charged to the innermost package line on its stack, so
+    memory allocated by a library on behalf of this package is included.
+    """
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(True, os.path.join(_PACKAGE_DIR, "*"), all_frames=True),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+    snapshot.dump(path)
+    sites: dict[str, list[int]] = {}
+    for trace in snapshot.traces:
+        frame = next(
+            frame for frame in reversed(trace.traceback) if frame.filename.startswith(_PACKAGE_DIR)
+        )
+        site = sites.setdefault(f"{os.path.basename(frame.filename)}:{frame.lineno}", [0, 0])
+        site[0] += trace.size
+        site[1] += 1
+    largest = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:TOP_ENTRIES]
+    return [
+        {"site": site, "size_kib": round(size / 1024, 1), "count": count}
+        for site, (size, count) in largest
+    ]
+
+
+async def async_profile(hass: HomeAssistant, seconds: float) -> dict:
+    """Profile the event loop and record allocations for a number of seconds.
+
+    The CPU profile covers everything running on the event loop, including
+    entity property reads, services and background tasks, and is written
+    in pstats format (snakeviz, gprof2dot, pstats). The allocation snapshot
+    is restricted to this package and can be opened with
+    tracemalloc.Snapshot.load. Both files go to the config directory.
+    """
+    if _lock.locked():
+        raise HomeAssistantError("A Minleon profile is already running")
+    async with _lock:
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        profile_path = hass.config.path(f"{DOMAIN}_profile_{stamp}.prof")
+        allocations_path = hass.config.path(f"{DOMAIN}_allocations_{stamp}.tracemalloc")
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as ex:
+            # Another profiler, such as the profiler integration, is active
+            if started_tracing:
+                tracemalloc.stop()
+            raise HomeAssistantError(f"Cannot start profiling: {ex}") from ex
+
+        LOGGER.warning("Profiling for %s seconds", seconds)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+
+        await hass.async_add_executor_job(profiler.dump_stats, profile_path)
+        top_functions = await hass.async_add_executor_job(_top_functions, profile_path)
+        top_allocations = await hass.async_add_executor_job(
+            _save_allocations, snapshot, allocations_path
+        )
+        LOGGER.warning("Profile written to %s and %s", profile_path, allocations_path)
+        return {
+            "cpu_profile": profile_path,
+            "allocations": allocations_path,
+            "top_functions": top_functions,
+            "top_allocations": top_allocations,
+        }
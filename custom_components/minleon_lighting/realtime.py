@@ -0,0 +1,215 @@
+"""UDP realtime pixel output (DDP or E1.31) for minleon-lighting."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import struct
+import time
+import uuid
+
+from .const import LOGGER, REALTIME_DDP, REALTIME_E131
+
+DDP_PORT = 4048
+DDP_HEADER = 10
+# Pixel bytes per DDP packet (480 RGB pixels)
+DDP_MAX_DATA = 1440
+DDP_FLAGS = 0x40  # version 1
+DDP_PUSH = 0x01
+DDP_TYPE_RGB24 = 0x0B
+DDP_ID_DISPLAY = 1
+
+E131_PORT = 5568
+E131_HEADER = 126
+# DMX channels used per universe (170 RGB pixels)
+E131_MAX_DATA = 510
+E131_SOURCE_NAME = b"minleon-lighting"
+E131_PRIORITY = 100
+
+
+class DdpPacketizer:
+    """Preallocated DDP packets for a frame of RGB pixels."""
+
+    port = DDP_PORT
+    header = DDP_HEADER
+    max_data = DDP_MAX_DATA
+
+    def __init__(self, frame_size: int) -> None:
+        """Build one packet per DDP_MAX_DATA bytes of the frame."""
+        self.packets: list[bytearray] = []
+        for offset in range(0, frame_size, self.max_data):
+            length = min(self.max_data, frame_size - offset)
+            packet = bytearray(self.header + length)
+            struct.pack_into(">BBBBIH", packet, 0, DDP_FLAGS, 0, DDP_TYPE_RGB24, DDP_ID_DISPLAY, offset, length)
+            self.packets.append(packet)
+        # Only the last packet of a frame tells the receiver to display it
+        self.packets[-1][0] |= DDP_PUSH
+
+    def stamp(self, sequence: int) -> None:
+        """Write the frame sequence number, 1-15, into every packet."""
+        number = sequence % 15 + 1
+        for packet in self.packets:
+            packet[1] = number
+
+
+class E131Packetizer:
+    """Preallocated E1.31 (sACN) packets, one universe per packet."""
+
+    port = E131_PORT
+    header = E131_HEADER
+    max_data = E131_MAX_DATA
+
+    def __init__(self, frame_size: int, universe: int = 1) -> None:
+        """Build one packet per universe, starting at the given universe."""
+        cid = uuid.uuid4().bytes
+        self.packets: list[bytearray] = []
+        for index, offset in enumerate(range(0, frame_size, self.max_data)):
+            length = min(self.max_data, frame_size - offset)
+            size = self.header + length
+            packet = bytearray(size)
+            # Root layer
+            struct.pack_into(">HH12sHI16s", packet, 0, 0x0010, 0, b"ASC-E1.17", 0x7000 | (size - 16), 4, cid)
+            # Framing layer
+            struct.pack_into(
+                ">HI64sBHBBH", packet, 38,
+                0x7000 | (size - 38), 2, E131_SOURCE_NAME, E131_PRIORITY, 0, 0, 0, universe + index,
+            )
+            # DMP layer, with the DMX start code as the first property value
+            struct.pack_into(">HBBHHHB", packet, 115, 0x7000 | (size - 115), 2, 0xA1, 0, 1, length + 1, 0)
+            self.packets.append(packet)
+
+    def stamp(self, sequence: int) -> None:
+        """Write the frame sequence number, 0-255, into every packet."""
+        number = sequence % 256
+        for packet in self.packets:
+            packet[111] = number
+
+
+class MinleonRealtimeOutput:
+    """Stream RGB frames to a controller over UDP.
+
+    Renderers write pixels into the preallocated frame buffer; sending
+    copies each slice of it into a preallocated packet, so steady-state
+    streaming allocates nothing per frame. Frames are paced to a fixed
+    rate and dropped, not queued, when rendering falls behind.
+    """
+
+    def __init__(self, host: str, protocol: str, pixels: int, universe: int = 1) -> None:
+        """Initialize."""
+        if protocol == REALTIME_DDP:
+            self._packetizer = DdpPacketizer(pixels * 3)
+        elif protocol == REALTIME_E131:
+            self._packetizer = E131Packetizer(pixels * 3, universe)
+        else:
+            raise ValueError(f"Unknown realtime protocol: {protocol}")
+        self.host = host.partition(":")[0]
+        self.protocol = protocol
+        self.pixels = pixels
+        self.frame = bytearray(pixels * 3)
+        self._view = memoryview(self.frame)
+        header = self._packetizer.header
+        step = self._packetizer.max_data
+        self._slices = [
+            (memoryview(packet)[header:], self._view[i * step:i * step + len(packet) - header])
+            for i, packet in enumerate(self._packetizer.packets)
+        ]
+        self._transport: asyncio.DatagramTransport | None = None
+        self._sequence = 0
+        self._task: asyncio.Task | None = None
+        self._started = 0.0
+        self._stopped: float | None = None
+        self._sent = 0
+        self._dropped = 0
+        self._late_max = 0.0
+
+    async def async_open(self) -> None:
+        """Open the UDP socket."""
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=(self.host, self._packetizer.port)
+        )
+
+    def close(self) -> None:
+        """Close the UDP socket."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def fill(self, colors: list[tuple[int, int, int]]) -> None:
+        """Fill the frame with equal segments, one per color."""
+        segment = -(-self.pixels // len(colors))
+        for index, color in enumerate(colors):
+            start = index * segment
+            end = min(start + segment, self.pixels)
+            if start >= end:
+                break
+            self._view[start * 3:end * 3] = bytes(color) * (end - start)
+
+    def send(self) -> None:
+        """Send the current frame with the next sequence number."""
+        self._sequence += 1
+        self._packetizer.stamp(self._sequence)
+        for data, source in self._slices:
+            data[:] = source
+        for packet in self._packetizer.packets:
+            self._transport.sendto(packet)
+        self._sent += 1
+
+    @property
+    def stats(self) -> dict:
+        """Return frame rate and pacing statistics."""
+        end = self._stopped if self._stopped is not None else time.monotonic()
+        elapsed = max(end - self._started, 1e-9)
+        return {
+            "protocol": self.protocol,
+            "sent": self._sent,
+            "dropped": self._dropped,
+            "fps": round(self._sent / elapsed, 2),
+            "late_max_ms": round(self._late_max * 1000, 1),
+        }
+
+    def start(self, render: Callable[[int], bool], fps: int) -> None:
+        """Call render(frame_number) and send its frame at fps until it returns False."""
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(render, fps), name=f"minleon_realtime_{self.host}"
+        )
+
+    async def async_stop(self) -> dict:
+        """Stop streaming and return the final statistics."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        return self.stats
+
+    async def wait(self) -> dict:
+        """Wait for the render function to end the stream and return the statistics."""
+        if self._task is not None:
+            await self._task
+        return self.stats
+
+    async def _run(self, render: Callable[[int], bool], fps: int) -> None:
+        """Render and send frames on a fixed schedule."""
+        loop = asyncio.get_running_loop()
+        interval = 1 / fps
+        self._started = time.monotonic()
+        start = loop.time()
+        tick = 0
+        LOGGER.info("Streaming %s frames to %s at %d fps", self.protocol, self.host, fps)
+        try:
+            while render(tick):
+                self.send()
+                tick += 1
+                behind = loop.time() - (start + tick * interval)
+                if behind >= interval:
+                    # Skip the frames whose slots have already passed
+                    skipped = int(behind / interval)
+                    self._dropped += skipped
+                    tick += skipped
+                self._late_max = max(self._late_max, behind)
+                await asyncio.sleep(max(start + tick * interval - loop.time(), 0))
+        finally:
+            self._stopped = time.monotonic()
+            LOGGER.info("Realtime stream to %s stopped: %s", self.host, self.stats)
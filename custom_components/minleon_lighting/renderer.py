@@ -0,0 +1,288 @@
+"""Client-side pixel renderer for minleon-lighting effects."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+import numpy as np
+
+from .realtime import MinleonRealtimeOutput
+
+if TYPE_CHECKING:
+    # Only for annotations, so rendering needs NumPy but not aiohttp
+    from .client import MinleonClient
+
+# Parameter values used when the client has none set
+DEFAULT_PARAMETERS = {"speed": 50, "spacing": 3, "amount": 30, "trails": 40}
+
+
+class FrameSink(Protocol):
+    """Destination for rendered frames of shape (pixels, 3), dtype uint8."""
+
+    def write(self, frame: np.ndarray) -> None:
+        """Consume a frame. The array is reused, so copy it to keep it."""
+
+    def close(self) -> None:
+        """Release the sink."""
+
+
+class MemorySink:
+    """Keep the most recent frames in a preallocated ring buffer."""
+
+    def __init__(self, pixels: int, capacity: int = 1) -> None:
+        """Initialize."""
+        self.frames = np.zeros((capacity, pixels, 3), dtype=np.uint8)
+        self.count = 0
+
+    def write(self, frame: np.ndarray) -> None:
+        """Store a frame, overwriting the oldest one."""
+        self.frames[self.count % len(self.frames)] = frame
+        self.count += 1
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+    def ordered(self) -> np.ndarray:
+        """Return the stored frames, oldest first."""
+        filled = min(self.count, len(self.frames))
+        start = self.count % len(self.frames) if self.count > len(self.frames) else 0
+        return np.roll(self.frames, -start, axis=0)[:filled]
+
+
+class FileSink:
+    """Append frames as raw RGB bytes to a file."""
+
+    def __init__(self, path: str) -> None:
+        """Open the file."""
+        self._file = open(path, "wb")
+
+    def write(self, frame: np.ndarray) -> None:
+        """Append a frame."""
+        self._file.write(frame.data)
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class RealtimeSink:
+    """Send frames through a UDP realtime output."""
+
+    def __init__(self, output: MinleonRealtimeOutput) -> None:
+        """Initialize with an opened output of the same pixel count."""
+        self.output = output
+        self._target = np.frombuffer(output.frame, dtype=np.uint8).reshape(-1, 3)
+
+    def write(self, frame: np.ndarray) -> None:
+        """Copy the frame into the output buffer and send it."""
+        self._target[:] = frame
+        self.output.send()
+
+    def close(self) -> None:
+        """Close the output."""
+        self.output.close()
+
+
+class EffectRenderer:
+    """Approximate controller effects as frames of RGB pixels.
+
+    The firmware's effects are not documented, so each effect is drawn by
+    the closest of a handful of vectorized families (static bands, chase,
+    wave, sparkle, comet, pulse, strobe, fire). All work happens in
+    preallocated arrays; render() returns the same frame array every call.
+    """
+
+    def __init__(
+        self,
+        pixels: int,
+        colors: list[tuple[int, int, int]],
+        background: tuple[int, int, int] = (0, 0, 0),
+        parameters: dict[str, int] | None = None,
+        seed: int = 0,
+    ) -> None:
+        """Initialize."""
+        self.pixels = pixels
+        self.palette = np.array(colors, dtype=np.float32)
+        self.background = np.array(background, dtype=np.float32)
+        self.parameters = {**DEFAULT_PARAMETERS, **(parameters or {})}
+        self.frame = np.zeros((pixels, 3), dtype=np.uint8)
+        self._work = np.zeros((pixels, 3), dtype=np.float32)
+        self._next = np.zeros((pixels, 3), dtype=np.float32)
+        self._level = np.zeros(pixels, dtype=np.float32)
+        self._scratch = np.zeros(pixels, dtype=np.float32)
+        self._position = np.arange(pixels, dtype=np.float32)
+        self._slots = np.zeros(pixels, dtype=np.intp)
+        self._rng = np.random.default_rng(seed)
+        self._families = {
+            "static": self._static,
+            "chase": self._chase,
+            "wave": self._wave,
+            "sparkle": self._sparkle,
+            "comet": self._comet,
+            "pulse": self._pulse,
+            "strobe": self._strobe,
+            "fire": self._fire,
+        }
+
+    @classmethod
+    def from_client(cls, api: MinleonClient, pixels: int) -> EffectRenderer:
+        """Create a renderer from a client's palette and effect parameters."""
+        parameters = {
+            name: value
+            for name, value in (
+                ("speed", api.speed),
+                ("spacing", api.spacing),
+                ("amount", api.amount),
+                ("trails", api.trails),
+            )
+            if value is not None
+        }
+        return cls(pixels, api.colors, api.background_color, parameters)
+
+    def render(self, effect: str, t: float) -> np.ndarray:
+        """Render the frame of an effect at t seconds and return it."""
+        if effect == "Off":
+            self.frame[:] = 0
+            return self.frame
+        self._families[EFFECT_FAMILIES.get(effect, "static")](t)
+        np.clip(self._work, 0, 255, out=self._work)
+        self.frame[:] = self._work
+        return self.frame
+
+    def stream(self, effect: str, sink: FrameSink, frames: int, fps: float) -> None:
+        """Render frames at the timestamps of a fixed frame rate into a sink."""
+        for index in range(frames):
+            sink.write(self.render(effect, index / fps))
+
+    @property
+    def _rate(self) -> float:
+        """Return pixels per second for the speed parameter."""
+        return 2 + self.parameters["speed"] * 0.6
+
+    def _bands(self, offset: float) -> None:
+        """Set _slots to palette bands of spacing pixels, shifted by offset."""
+        spacing = max(self.parameters["spacing"], 1)
+        np.add(self._position, offset, out=self._scratch)
+        np.floor_divide(self._scratch, spacing, out=self._scratch)
+        np.mod(self._scratch, len(self.palette), out=self._scratch)
+        self._slots[:] = self._scratch
+
+    def _blend(self) -> None:
+        """Mix palette colors of _slots with the background by _level."""
+        np.take(self.palette, self._slots, axis=0, out=self._work, mode="clip")
+        self._work -= self.background
+        self._work *= self._level[:, None]
+        self._work += self.background
+
+    def _static(self, t: float) -> None:
+        self._bands(0)
+        self._level[:] = 1
+        self._blend()
+
+    def _chase(self, t: float) -> None:
+        self._bands(-t * self._rate)
+        # Trails dim every other band instead of blanking it
+        spacing = max(self.parameters["spacing"], 1)
+        np.add(self._position, -t * self._rate, out=self._scratch)
+        np.floor_divide(self._scratch, spacing, out=self._scratch)
+        np.mod(self._scratch, 2, out=self._scratch)
+        np.multiply(self._scratch, 1 - self.parameters["trails"] / 100, out=self._level)
+        np.subtract(1, self._level, out=self._level)
+        self._blend()
+
+    def _wave(self, t: float) -> None:
+        # Interpolate between neighbouring palette colors along the strip
+        spacing = max(self.parameters["spacing"], 1) * 4
+        count = len(self.palette)
+        np.add(self._position, t * self._rate, out=self._scratch)
+        self._scratch /= spacing
+        np.mod(self._scratch, count, out=self._scratch)
+        self._slots[:] = self._scratch
+        self._scratch -= self._slots
+        np.take(self.palette, self._slots, axis=0, out=self._work, mode="clip")
+        self._slots += 1
+        self._slots %= count
+        np.take(self.palette, self._slots, axis=0, out=self._next, mode="clip")
+        self._next -= self._work
+        self._next *= self._scratch[:, None]
+        self._work += self._next
+
+    def _sparkle(self, t: float) -> None:
+        # A random amount% of pixels lit, each in a random palette color
+        self._rng.random(dtype=np.float32, out=self._scratch)
+        self._scratch *= len(self.palette)
+        self._slots[:] = self._scratch
+        self._rng.random(dtype=np.float32, out=self._level)
+        np.less(self._level, self.parameters["amount"] / 100, out=self._level, casting="unsafe")
+        self._blend()
+
+    def _comet(self, t: float) -> None:
+        # Heads every spacing * 10 pixels with exponential tails behind them
+        period = max(self.parameters["spacing"], 1) * 10
+        tail = 1 + self.parameters["trails"] / 5
+        np.subtract(t * self._rate, self._position, out=self._scratch)
+        np.mod(self._scratch, period, out=self._scratch)
+        self._scratch /= -tail
+        np.exp(self._scratch, out=self._level)
+        self._bands(0)
+        self._blend()
+
+    def _pulse(self, t: float) -> None:
+        self._bands(0)
+        phase = t * self._rate / 20
+        self._level[:] = 0.5 - 0.5 * np.cos(2 * np.pi * phase)
+        self._blend()
+
+    def _strobe(self, t: float) -> None:
+        self._bands(0)
+        self._level[:] = 1.0 if int(t * self._rate / 4) % 2 == 0 else 0.0
+        self._blend()
+
+    def _fire(self, t: float) -> None:
+        self._slots[:] = 0
+        self._rng.random(dtype=np.float32, out=self._level)
+        self._level *= 0.6
+        self._level += 0.4
+        self._blend()
+
+
+# Renderer family for each known effect; anything unlisted is drawn static
+EFFECT_FAMILIES = {
+    "Fixed Colors": "static",
+    "Christmas Tree": "static",
+    "Candy Cane": "static",
+    "Show": "static",
+    "Test": "static",
+    "Chase": "chase",
+    "Theater": "chase",
+    "Shift": "chase",
+    "Bands": "chase",
+    "Bars": "chase",
+    "Markers": "chase",
+    "Ping Pong": "chase",
+    "Color Wave": "wave",
+    "Rainbow": "wave",
+    "Blend": "wave",
+    "Twist": "wave",
+    "Paint": "wave",
+    "Expand": "wave",
+    "Circles": "wave",
+    "Sparkle": "sparkle",
+    "Twinkle": "sparkle",
+    "Stars": "sparkle",
+    "Snow": "sparkle",
+    "Fireworks": "sparkle",
+    "Comet": "comet",
+    "Meteor": "comet",
+    "Scanner": "comet",
+    "Worms": "comet",
+    "Rain": "comet",
+    "Icicle": "comet",
+    "Glow": "pulse",
+    "Pulsate": "pulse",
+    "Breathe": "pulse",
+    "Fade": "pulse",
+    "Fader": "pulse",
+    "Lightning": "strobe",
+    "Strobe": "strobe",
+    "Fire": "fire",
+}
@@ -0,0 +1,96 @@
+"""Calendar and sun driven automatic presets for minleon-lighting."""
+from __future__ import annotations
+
+from datetime import date
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_sunrise,
+    async_track_sunset,
+    async_track_time_change,
+)
+from homeassistant.util import dt as dt_util
+
+from .api import MinleonLightingApiClient, background_priority
+from .const import LOGGER
+from .preset_rules import build_year_table
+
+
+class MinleonAutoPresetScheduler:
+    """Pick a holiday preset by date and switch lights by sun events.
+
+    The date to preset mapping is computed once per year into a lookup
+    table, and checked once a day shortly after midnight.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: MinleonLightingApiClient,
+        rules: list[tuple[str, str, str]] | None,
+        sunset_on: bool,
+        sunrise_off: bool,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.api = api
+        self._rules = rules
+        self._sunset_on = sunset_on
+        self._sunrise_off = sunrise_off
+        self._table_year: int | None = None
+        self._table: list[str | None] = []
+        self._unsubs: list = []
+
+    def preset_for(self, day: date) -> str | None:
+        """Return the preset for a day, or None if no rule matches."""
+        if self._rules is None:
+            return None
+        if day.year != self._table_year:
+            self._table = build_year_table(day.year, self._rules)
+            self._table_year = day.year
+        return self._table[day.timetuple().tm_yday - 1]
+
+    async def async_start(self) -> None:
+        """Start listening and apply today's preset."""
+        if self._rules is not None:
+            self._unsubs.append(
+                async_track_time_change(self.hass, self._async_daily, hour=0, minute=0, second=5)
+            )
+            await self._async_apply_today()
+        if self._sunset_on:
+            self._unsubs.append(async_track_sunset(self.hass, self._async_sunset))
+        if self._sunrise_off:
+            self._unsubs.append(async_track_sunrise(self.hass, self._async_sunrise))
+
+    @callback
+    def stop(self) -> None:
+        """Stop all listeners."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    async def _async_apply_today(self) -> None:
+        """Push today's preset if it differs from the current one."""
+        preset_name = self.preset_for(dt_util.now().date())
+        if preset_name is None or preset_name == self.api.last_color_preset:
+            return
+        LOGGER.info("Auto preset switching to %s", preset_name)
+        palette = self.api.get_preset_palette(preset_name)
+        with background_priority():
+            await self.api.async_apply_palette(palette, preset_name, only_changed=True)
+
+    async def _async_daily(self, now) -> None:
+        """Handle the daily preset check."""
+        await self._async_apply_today()
+
+    async def _async_sunset(self) -> None:
+        """Turn the lights on at sunset."""
+        LOGGER.info("Sunset: turning on lights at %s", self.api.address)
+        await self._async_apply_today()
+        with background_priority():
+            await self.api.async_turn_on()
+
+    async def _async_sunrise(self) -> None:
+        """Turn the lights off at sunrise."""
+        LOGGER.info("Sunrise: turning off lights at %s", self.api.address)
+        with background_priority():
+            await self.api.async_turn_off()
@@ -0,0 +1,480 @@
+"""Services for minleon-lighting."""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import time
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID, ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .api import MinleonLightingApiClient
+from .const import (
+    CONF_REALTIME_PIXELS,
+    CONF_REALTIME_PROTOCOL,
+    DEFAULT_AUDIO_FPS,
+    DEFAULT_AUDIO_SAMPLE_RATE,
+    DEFAULT_REALTIME_PIXELS,
+    DEFAULT_TEMPO_THRESHOLD,
+    DOMAIN,
+    DOMAIN_DATA,
+    EFFECT_PARAMETER_KEYS,
+    KNOWN_EFFECTS,
+    LOGGER,
+    REALTIME_OFF,
+)
+from .playlist import MinleonPlaylistRunner, PlaylistStep
+from .profiler import async_profile
+from .tempo import MinleonTempoSync
+from .tempo_curve import normalize_curve
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_STEPS = "steps"
+ATTR_LOOPS = "loops"
+ATTR_SOURCE = "source"
+ATTR_FPS = "fps"
+ATTR_SAMPLE_RATE = "sample_rate"
+ATTR_BPM = "bpm"
+ATTR_THRESHOLD = "threshold"
+ATTR_POINTS = "points"
+ATTR_EFFECT = "effect"
+ATTR_PARAMETERS = "parameters"
+ATTR_PRESET = "preset"
+ATTR_COLORS = "colors"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+ATTR_SECONDS = "seconds"
+ATTR_MODE = "mode"
+
+# Partial state keys accepted by apply_state
+STATE_KEYS = ("effect", "preset", "colors", "brightness", "speed", "spacing", "amount", "trails")
+DEFAULT_MAX_CONCURRENCY = 8
+
+SERVICE_START_PLAYLIST = "start_playlist"
+SERVICE_STOP_PLAYLIST = "stop_playlist"
+SERVICE_START_AUDIO_STREAM = "start_audio_stream"
+SERVICE_STOP_AUDIO_STREAM = "stop_audio_stream"
+SERVICE_SET_TEMPO = "set_tempo"
+SERVICE_START_TEMPO_SYNC = "start_tempo_sync"
+SERVICE_STOP_TEMPO_SYNC = "stop_tempo_sync"
+SERVICE_CALIBRATE_TEMPO = "calibrate_tempo"
+SERVICE_PROBE_EFFECTS = "probe_effects"
+SERVICE_SET_EFFECT_PARAMETERS = "set_effect_parameters"
+SERVICE_APPLY_STATE = "apply_state"
+SERVICE_PROFILE = "profile"
+SERVICE_SPREAD_PALETTE = "spread_palette"
+
+# Mirrors spread.SPREAD_MODES, which needs numpy to import
+SPREAD_MODES = ("sequence", "gradient")
+
+TARGET_SCHEMA = {
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+}
+
+PLAYLIST_STEP_SCHEMA = vol.Schema(
+    {
+        vol.Required("duration"): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+        vol.Optional("effect"): vol.In(KNOWN_EFFECTS),
+        vol.Optional("preset"): cv.string,
+        vol.Optional("brightness"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("speed"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("crossfade", default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+START_PLAYLIST_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Required(ATTR_STEPS): vol.All(cv.ensure_list, [PLAYLIST_STEP_SCHEMA], vol.Length(min=1)),
+        vol.Optional(ATTR_LOOPS, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+
+STOP_PLAYLIST_SCHEMA = vol.Schema(TARGET_SCHEMA)
+
+START_AUDIO_STREAM_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Required(ATTR_SOURCE): cv.string,
+        vol.Optional(ATTR_FPS, default=DEFAULT_AUDIO_FPS): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+        vol.Optional(ATTR_SAMPLE_RATE, default=DEFAULT_AUDIO_SAMPLE_RATE): vol.All(
+            vol.Coerce(int), vol.Range(min=8000, max=192000)
+        ),
+    }
+)
+
+STOP_AUDIO_STREAM_SCHEMA = vol.Schema(TARGET_SCHEMA)
+
+SET_TEMPO_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Required(ATTR_BPM): vol.All(vol.Coerce(float), vol.Range(min=1, max=400)),
+    }
+)
+
+START_TEMPO_SYNC_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Optional(ATTR_THRESHOLD, default=DEFAULT_TEMPO_THRESHOLD): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=50)
+        ),
+    }
+)
+
+STOP_TEMPO_SYNC_SCHEMA = vol.Schema(TARGET_SCHEMA)
+
+CALIBRATE_TEMPO_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Required(ATTR_POINTS): vol.All(
+            cv.ensure_list, [vol.ExactSequence([vol.Coerce(float), vol.Coerce(int)])]
+        ),
+    }
+)
+
+
+PROBE_EFFECTS_SCHEMA = vol.Schema(TARGET_SCHEMA)
+
+SET_EFFECT_PARAMETERS_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Required(ATTR_EFFECT): vol.In(KNOWN_EFFECTS),
+        vol.Required(ATTR_PARAMETERS): vol.All(
+            cv.ensure_list, [vol.In(list(EFFECT_PARAMETER_KEYS))]
+        ),
+    }
+)
+
+RGB_SCHEMA = vol.All(vol.ExactSequence([cv.byte, cv.byte, cv.byte]), vol.Coerce(tuple))
+
+APPLY_STATE_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Optional(ATTR_EFFECT): vol.In(KNOWN_EFFECTS),
+        vol.Exclusive(ATTR_PRESET, "palette"): cv.string,
+        vol.Exclusive(ATTR_COLORS, "palette"): vol.All(
+            cv.ensure_list, [RGB_SCHEMA], vol.Length(min=1, max=5)
+        ),
+        vol.Optional("brightness"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("speed"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional("spacing"): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional("amount"): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional("trails"): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=64)
+        ),
+    }
+)
+
+SPREAD_PALETTE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **TARGET_SCHEMA,
+            vol.Exclusive(ATTR_PRESET, "palette"): cv.string,
+            vol.Exclusive(ATTR_COLORS, "palette"): vol.All(
+                cv.ensure_list, [RGB_SCHEMA], vol.Length(min=1)
+            ),
+            vol.Optional(ATTR_MODE, default="sequence"): vol.In(SPREAD_MODES),
+            vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=64)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_PRESET, ATTR_COLORS),
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SECONDS, default=30): vol.All(vol.Coerce(float), vol.Range(min=1, max=600)),
+    }
+)
+
+
+def resolve_entry_ids(hass: HomeAssistant, call: ServiceCall) -> list[str]:
+    """Return the config entry ids targeted by a service call.
+
+    Targets may be given as config entry ids, device ids, or both. With no
+    target, every loaded controller is used.
+    """
+    loaded = hass.data.get(DOMAIN, {})
+    entry_ids = list(call.data.get(ATTR_CONFIG_ENTRY_ID, []))
+
+    if device_ids := call.data.get(ATTR_DEVICE_ID):
+        registry = dr.async_get(hass)
+        for device_id in device_ids:
+            device = registry.async_get(device_id)
+            if device is None:
+                raise HomeAssistantError(f"Unknown device: {device_id}")
+            entry_ids.extend(
+                entry_id for entry_id in device.config_entries if entry_id in loaded
+            )
+
+    if ATTR_CONFIG_ENTRY_ID not in call.data and ATTR_DEVICE_ID not in call.data:
+        entry_ids = list(loaded)
+
+    for entry_id in entry_ids:
+        if entry_id not in loaded:
+            raise HomeAssistantError(f"Minleon controller not loaded: {entry_id}")
+
+    # Preserve order while dropping duplicates
+    return list(dict.fromkeys(entry_ids))
+
+
+def get_playlist(hass: HomeAssistant, entry_id: str) -> MinleonPlaylistRunner:
+    """Return the playlist runner for a loaded config entry."""
+    return hass.data[DOMAIN_DATA][entry_id]["playlist"]
+
+
+def get_tempo(hass: HomeAssistant, entry_id: str) -> MinleonTempoSync:
+    """Return the tempo sync for a loaded config entry."""
+    return hass.data[DOMAIN_DATA][entry_id]["tempo"]
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_start_playlist(call: ServiceCall) -> None:
+        """Start a playlist on the targeted controllers."""
+        for step in call.data[ATTR_STEPS]:
+            if "preset" in step and MinleonLightingApiClient.get_preset_palette(step["preset"]) is None:
+                raise HomeAssistantError(f"Unknown preset: {step['preset']}")
+
+        steps = [PlaylistStep(**step) for step in call.data[ATTR_STEPS]]
+        for entry_id in resolve_entry_ids(hass, call):
+            LOGGER.debug("Starting playlist on %s", entry_id)
+            get_playlist(hass, entry_id).start(steps, call.data[ATTR_LOOPS])
+
+    async def async_stop_playlist(call: ServiceCall) -> None:
+        """Stop the playlist on the targeted controllers."""
+        for entry_id in resolve_entry_ids(hass, call):
+            await get_playlist(hass, entry_id).async_stop()
+
+    async def async_start_audio_stream(call: ServiceCall) -> None:
+        """Start an audio-reactive stream on the targeted controllers."""
+        source = call.data[ATTR_SOURCE]
+        if not hass.config.is_allowed_path(source):
+            raise HomeAssistantError(f"Access to {source} is not allowed")
+
+        # numpy is only loaded once audio streaming is actually used
+        audio = await hass.async_add_executor_job(importlib.import_module, f"{__package__}.audio")
+        # Fail the service call, not the stream task, on a missing or unreadable source
+        try:
+            await hass.async_add_executor_job(
+                audio.AudioSource(source, call.data[ATTR_SAMPLE_RATE]).check
+            )
+        except (OSError, ValueError) as ex:
+            raise HomeAssistantError(f"Cannot stream audio from {source}: {ex}") from ex
+
+        for entry_id in resolve_entry_ids(hass, call):
+            helpers = hass.data[DOMAIN_DATA][entry_id]
+            if (streamer := helpers.get("audio")) is not None:
+                await streamer.async_stop()
+            api = hass.data[DOMAIN][entry_id]
+
+            # Stream over UDP when the controller has a realtime input, else over HTTP
+            output = None
+            options = hass.config_entries.async_get_entry(entry_id).options
+            protocol = options.get(CONF_REALTIME_PROTOCOL, REALTIME_OFF)
+            if protocol != REALTIME_OFF:
+                output = audio.MinleonRealtimeOutput(
+                    api.address,
+                    protocol,
+                    options.get(CONF_REALTIME_PIXELS, DEFAULT_REALTIME_PIXELS),
+                )
+                await output.async_open()
+
+            streamer = audio.MinleonAudioStreamer(
+                api,
+                source,
+                call.data[ATTR_FPS],
+                call.data[ATTR_SAMPLE_RATE],
+                output,
+            )
+            helpers["audio"] = streamer
+            streamer.start()
+
+    async def async_stop_audio_stream(call: ServiceCall) -> ServiceResponse:
+        """Stop the audio stream and report its frame rate and latency."""
+        results = {}
+        for entry_id in resolve_entry_ids(hass, call):
+            streamer = hass.data[DOMAIN_DATA][entry_id].pop("audio", None)
+            if streamer is not None:
+                results[entry_id] = await streamer.async_stop()
+        return results
+
+    async def async_set_tempo(call: ServiceCall) -> None:
+        """Map a BPM value to effect speed on the targeted controllers."""
+        for entry_id in resolve_entry_ids(hass, call):
+            await get_tempo(hass, entry_id).async_set_bpm(call.data[ATTR_BPM])
+
+    async def async_start_tempo_sync(call: ServiceCall) -> None:
+        """Follow a BPM sensor on the targeted controllers."""
+        for entry_id in resolve_entry_ids(hass, call):
+            get_tempo(hass, entry_id).track(call.data[ATTR_ENTITY_ID], call.data[ATTR_THRESHOLD])
+
+    async def async_stop_tempo_sync(call: ServiceCall) -> None:
+        """Stop following the BPM sensor on the targeted controllers."""
+        for entry_id in resolve_entry_ids(hass, call):
+            get_tempo(hass, entry_id).stop()
+
+    async def async_calibrate_tempo(call: ServiceCall) -> None:
+        """Store a BPM to speed calibration for the targeted controllers."""
+        try:
+            normalize_curve(call.data[ATTR_POINTS])
+        except ValueError as ex:
+            raise HomeAssistantError(str(ex)) from ex
+        for entry_id in resolve_entry_ids(hass, call):
+            await get_tempo(hass, entry_id).async_calibrate(call.data[ATTR_POINTS])
+
+    async def async_probe_effects(call: ServiceCall) -> ServiceResponse:
+        """Probe which effects the targeted controllers accept."""
+        results = {}
+        for entry_id in resolve_entry_ids(hass, call):
+            results[entry_id] = await hass.data[DOMAIN_DATA][entry_id]["catalog"].async_probe()
+        return results
+
+    async def async_set_effect_parameters(call: ServiceCall) -> None:
+        """Override which parameters an effect uses on the targeted controllers."""
+        for entry_id in resolve_entry_ids(hass, call):
+            await hass.data[DOMAIN_DATA][entry_id]["catalog"].async_set_parameters(
+                call.data[ATTR_EFFECT], call.data[ATTR_PARAMETERS]
+            )
+
+    async def async_apply_state(call: ServiceCall) -> ServiceResponse:
+        """Apply a partial state to the targeted controllers concurrently.
+
+        Each controller only receives the values it does not already have.
+        Returns per-controller success, command count and elapsed time.
+        """
+        preset = call.data.get(ATTR_PRESET)
+        if preset is not None and MinleonLightingApiClient.get_preset_palette(preset) is None:
+            raise HomeAssistantError(f"Unknown preset: {preset}")
+
+        state = {key: call.data[key] for key in STATE_KEYS if key in call.data}
+        semaphore = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENCY])
+
+        async def apply(entry_id: str) -> dict:
+            async with semaphore:
+                start = time.monotonic()
+                success, commands = await hass.data[DOMAIN][entry_id].async_apply_state(state)
+                return {
+                    "success": success,
+                    "commands": commands,
+                    "elapsed_ms": round((time.monotonic() - start) * 1000, 1),
+                }
+
+        entry_ids = resolve_entry_ids(hass, call)
+        results = await asyncio.gather(*(apply(entry_id) for entry_id in entry_ids))
+        return dict(zip(entry_ids, results))
+
+    async def async_spread_palette(call: ServiceCall) -> ServiceResponse:
+        """Spread one palette over the targeted controllers, in the order given.
+
+        Every controller's five slots are computed in one pass and pushed
+        concurrently; slots that already hold their color are not resent.
+        Returns each controller's palette and how many slots were sent.
+        """
+        colors = call.data.get(ATTR_COLORS)
+        if (preset := call.data.get(ATTR_PRESET)) is not None:
+            # The preset's own colors, not its five slots padded with black
+            from .presets import preset_colors
+
+            colors = preset_colors(preset)
+            if colors is None:
+                raise HomeAssistantError(f"Unknown preset: {preset}")
+
+        entry_ids = resolve_entry_ids(hass, call)
+        spread = await hass.async_add_executor_job(importlib.import_module, f"{__package__}.spread")
+        palettes = spread.spread_palette(colors, len(entry_ids), call.data[ATTR_MODE]).tolist()
+        semaphore = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENCY])
+
+        async def push(entry_id: str, palette: list[list[int]]) -> dict:
+            api = hass.data[DOMAIN][entry_id]
+            palette = [tuple(color) for color in palette]
+            changed = sum(current != color for current, color in zip(api.colors, palette))
+            success = True
+            if changed:
+                async with semaphore:
+                    success = await api.async_apply_palette(palette, only_changed=True)
+            return {"success": success, "palette": palette, "commands": changed}
+
+        results = await asyncio.gather(
+            *(push(entry_id, palette) for entry_id, palette in zip(entry_ids, palettes))
+        )
+        return dict(zip(entry_ids, results))
+
+    async def async_run_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the integration and report where the files were written."""
+        return await async_profile(hass, call.data[ATTR_SECONDS])
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_PLAYLIST, async_start_playlist, schema=START_PLAYLIST_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_PLAYLIST, async_stop_playlist, schema=STOP_PLAYLIST_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_AUDIO_STREAM,
+        async_start_audio_stream,
+        schema=START_AUDIO_STREAM_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_AUDIO_STREAM,
+        async_stop_audio_stream,
+        schema=STOP_AUDIO_STREAM_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_TEMPO, async_set_tempo, schema=SET_TEMPO_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_TEMPO_SYNC, async_start_tempo_sync, schema=START_TEMPO_SYNC_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_TEMPO_SYNC, async_stop_tempo_sync, schema=STOP_TEMPO_SYNC_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_CALIBRATE_TEMPO, async_calibrate_tempo, schema=CALIBRATE_TEMPO_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROBE_EFFECTS,
+        async_probe_effects,
+        schema=PROBE_EFFECTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_EFFECT_PARAMETERS,
+        async_set_effect_parameters,
+        schema=SET_EFFECT_PARAMETERS_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_STATE,
+        async_apply_state,
+        schema=APPLY_STATE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SPREAD_PALETTE,
+        async_spread_palette,
+        schema=SPREAD_PALETTE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_run_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,70 @@
+"""Spreading one palette across several controllers for minleon-lighting."""
+from __future__ import annotations
+
+import numpy as np
+
+# Bulb slots per controller
+SLOTS = 5
+
+SPREAD_SEQUENCE = "sequence"
+SPREAD_GRADIENT = "gradient"
+SPREAD_MODES = (SPREAD_SEQUENCE, SPREAD_GRADIENT)
+
+
+def _rgb_to_hsv(rgb: np.ndarray) -> np.ndarray:
+    """Convert rows of RGB in 0-1 to HSV, with hue in turns (0-1)."""
+    high = rgb.max(axis=1)
+    low = rgb.min(axis=1)
+    spread = high - low
+    safe = np.where(spread > 0, spread, 1)
+    r, g, b = rgb.T
+    hue = np.select(
+        [spread == 0, high == r, high == g],
+        [0, ((g - b) / safe) % 6, (b - r) / safe + 2],
+        (r - g) / safe + 4,
+    ) / 6
+    saturation = np.where(high > 0, spread / np.where(high > 0, high, 1), 0)
+    return np.stack([hue, saturation, high], axis=1)
+
+
+def _hsv_to_rgb(hsv: np.ndarray) -> np.ndarray:
+    """Convert rows of HSV, hue in turns, to RGB in 0-1."""
+    hue, saturation, value = hsv.T
+    k = (np.array([5, 3, 1])[None, :] + hue[:, None] * 6) % 6
+    return value[:, None] - value[:, None] * saturation[:, None] * np.clip(
+        np.minimum(k, 4 - k), 0, 1
+    )
+
+
+def spread_palette(colors: list[tuple[int, int, int]], controllers: int, mode: str) -> np.ndarray:
+    """Return the five-slot palette of each controller, shape (controllers, 5, 3).
+
+    The slots of all controllers form one strip, in controller order. With
+    sequence, the colors repeat along it, so controller 1 gets the first
+    five colors and controller 2 the next ones. With gradient, the colors
+    are evenly spaced stops of a ramp that takes the short way around the
+    hue circle between them.
+    """
+    stops = np.asarray(colors, dtype=np.float64)
+    count = controllers * SLOTS
+    if mode == SPREAD_SEQUENCE or len(stops) == 1:
+        strip = stops[np.arange(count) % len(stops)]
+    else:
+        hsv = _rgb_to_hsv(stops / 255)
+        # Gray stops take the hue of a neighbour so the ramp does not swing through red
+        gray = hsv[:, 1] == 0
+        if not gray.all():
+            colored = np.flatnonzero(~gray)
+            nearest = colored[np.abs(np.arange(len(hsv))[:, None] - colored[None, :]).argmin(axis=1)]
+            hsv[gray, 0] = hsv[nearest[gray], 0]
+        # Unwrap hue so each step goes less than half a turn
+        steps = np.diff(hsv[:, 0])
+        hsv[1:, 0] = hsv[0, 0] + np.cumsum((steps + 0.5) % 1 - 0.5)
+
+        position = np.linspace(0, len(stops) - 1, count)
+        index = np.minimum(position.astype(int), len(stops) - 2)
+        fraction = (position - index)[:, None]
+        ramp = hsv[index] + (hsv[index + 1] - hsv[index]) * fraction
+        ramp[:, 0] %= 1
+        strip = _hsv_to_rgb(ramp) * 255
+    return np.rint(strip).astype(np.uint8).reshape(controllers, SLOTS, 3)
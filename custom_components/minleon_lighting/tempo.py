@@ -0,0 +1,91 @@
+"""Tempo sync of effect speed to a BPM source for minleon-lighting."""
+from __future__ import annotations
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.storage import Store
+
+from .api import MinleonLightingApiClient, background_priority
+from .const import DEFAULT_TEMPO_CURVE, DEFAULT_TEMPO_THRESHOLD, DOMAIN, LOGGER
+from .tempo_curve import map_bpm, normalize_curve
+
+STORAGE_VERSION = 1
+
+
+class MinleonTempoSync:
+    """Track a BPM value and keep the effect speed in step with it.
+
+    The speed is only sent when the mapped value moves by more than the
+    threshold, so a jittery BPM source does not flood the controller.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: MinleonLightingApiClient, entry_id: str) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.api = api
+        self.curve: list[tuple[float, int]] = list(DEFAULT_TEMPO_CURVE)
+        self.threshold = DEFAULT_TEMPO_THRESHOLD
+        self.updates_received = 0
+        self.updates_sent = 0
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.tempo_{entry_id}")
+        self._unsub = None
+
+    async def async_load(self) -> None:
+        """Load the stored calibration curve, if any."""
+        data = await self._store.async_load()
+        if data and data.get("curve"):
+            self.curve = [tuple(point) for point in data["curve"]]
+
+    async def async_calibrate(self, points: list) -> None:
+        """Replace and store the calibration curve."""
+        self.curve = normalize_curve(points)
+        await self._store.async_save({"curve": self.curve})
+        LOGGER.info("Stored tempo calibration for %s: %s", self.api.address, self.curve)
+
+    async def async_set_bpm(self, bpm: float) -> bool:
+        """Map a BPM value to speed and send it if it moved enough."""
+        self.updates_received += 1
+        speed = map_bpm(self.curve, bpm)
+        if abs(speed - self.api.speed) <= self.threshold:
+            return True
+        LOGGER.debug("Tempo %.1f BPM maps to speed %d", bpm, speed)
+        self.updates_sent += 1
+        return await self.api.async_set_speed(speed)
+
+    def track(self, entity_id: str, threshold: int) -> None:
+        """Follow a sensor that reports BPM."""
+        self.stop()
+        self.threshold = threshold
+        self._unsub = async_track_state_change_event(
+            self.hass, [entity_id], self._async_state_changed
+        )
+        if (state := self.hass.states.get(entity_id)) is not None:
+            self.hass.async_create_task(self._async_apply_state(state.state))
+
+    @callback
+    def stop(self) -> None:
+        """Stop following the BPM sensor."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+            # Speed changes from the sensor do not update entities while following it
+            self.api.notify_state_changed()
+
+    async def _async_state_changed(self, event: Event) -> None:
+        """Handle a BPM sensor update."""
+        if (state := event.data.get("new_state")) is not None:
+            await self._async_apply_state(state.state)
+
+    async def _async_apply_state(self, value: str) -> None:
+        """Apply a BPM sensor state."""
+        if value in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            return
+        try:
+            bpm = float(value)
+        except ValueError:
+            LOGGER.warning("Ignoring non-numeric BPM value: %s", value)
+            return
+        if bpm > 0:
+            with background_priority():
+                await self.async_set_bpm(bpm)
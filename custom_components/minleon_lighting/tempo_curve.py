@@ -0,0 +1,34 @@
+"""BPM to effect speed calibration curves for minleon-lighting."""
+from __future__ import annotations
+
+from bisect import bisect_left
+
+
+def map_bpm(curve: list[tuple[float, int]], bpm: float) -> int:
+    """Map a BPM value to a controller speed with a piecewise-linear curve.
+
+    Values outside the curve are clamped to its end points.
+    """
+    bpms = [point[0] for point in curve]
+    index = bisect_left(bpms, bpm)
+    if index == 0:
+        return curve[0][1]
+    if index == len(curve):
+        return curve[-1][1]
+    (low_bpm, low_spd), (high_bpm, high_spd) = curve[index - 1], curve[index]
+    fraction = (bpm - low_bpm) / (high_bpm - low_bpm)
+    return round(low_spd + (high_spd - low_spd) * fraction)
+
+
+def normalize_curve(points: list) -> list[tuple[float, int]]:
+    """Sort calibration points by BPM, rejecting duplicates and bad values."""
+    curve = sorted((float(bpm), int(spd)) for bpm, spd in points)
+    if len(curve) < 2:
+        raise ValueError("Calibration needs at least two points")
+    for bpm, spd in curve:
+        if bpm <= 0 or not 0 <= spd <= 100:
+            raise ValueError(f"Invalid calibration point: {bpm}, {spd}")
+    for (bpm, _), (next_bpm, _) in zip(curve, curve[1:]):
+        if bpm == next_bpm:
+            raise ValueError(f"Duplicate calibration BPM: {bpm}")
+    return curve
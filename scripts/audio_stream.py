@@ -0,0 +1,52 @@
+"""Run the audio-reactive stream offline against a WAV file.
+
+Starts a local simulated controller (unless --host is given), streams the
+WAV file through the API client and prints the achieved frame rate and
+end-to-end latency.
+
+    python scripts/audio_stream.py show.wav --fps 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import standalone  # noqa: E402,F401
+from minleon_lighting.audio import MinleonAudioStreamer  # noqa: E402
+from minleon_lighting.client import MinleonClient  # noqa: E402
+from simulator import start_controllers  # noqa: E402
+
+
+async def _main(args: argparse.Namespace) -> None:
+    controllers = []
+    host = args.host
+    if host is None:
+        controllers = await start_controllers(1, args.port, args.latency / 1000)
+        host = f"127.0.0.1:{args.port}"
+
+    api = MinleonClient(host)
+    try:
+        streamer = MinleonAudioStreamer(api, args.wav, args.fps)
+        streamer.start()
+        stats = await streamer.wait()
+    finally:
+        await api.async_close()
+        for controller in controllers:
+            await controller.stop()
+
+    for key, value in stats.items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("wav", help="16-bit PCM WAV file")
+    parser.add_argument("--fps", type=int, default=20)
+    parser.add_argument("--host", help="real controller address instead of the simulator")
+    parser.add_argument("--port", type=int, default=8080, help="simulator port")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulator latency in ms")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,63 @@
+"""Benchmark the client-side effect renderer.
+
+Renders one effect from each renderer family at several pixel counts and
+reports the average and worst per-frame render time and the frame rate it
+allows. Frames go to an in-memory sink, so only rendering is measured.
+
+    python scripts/bench_render.py --pixels 150 1000 5000 --frames 400
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import standalone  # noqa: E402,F401
+from minleon_lighting.renderer import (  # noqa: E402
+    EFFECT_FAMILIES,
+    EffectRenderer,
+    MemorySink,
+)
+
+PALETTE = [(255, 0, 0), (0, 255, 0), (255, 255, 255), (255, 215, 0), (0, 0, 255)]
+
+
+def representatives() -> list[str]:
+    """Return the first effect of every renderer family."""
+    seen: dict[str, str] = {}
+    for effect, family in EFFECT_FAMILIES.items():
+        seen.setdefault(family, effect)
+    return list(seen.values())
+
+
+def measure(effect: str, pixels: int, frames: int) -> tuple[float, float]:
+    """Return average and worst render time in milliseconds."""
+    renderer = EffectRenderer(pixels, PALETTE)
+    sink = MemorySink(pixels)
+    renderer.render(effect, 0)
+    worst = 0.0
+    start = time.perf_counter()
+    for index in range(frames):
+        frame_start = time.perf_counter()
+        sink.write(renderer.render(effect, index / 40))
+        worst = max(worst, time.perf_counter() - frame_start)
+    average = (time.perf_counter() - start) / frames
+    return average * 1000, worst * 1000
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f"{'effect':<14}{'pixels':>8}{'avg ms':>10}{'max ms':>10}{'max fps':>10}")
+    for effect in representatives():
+        for pixels in args.pixels:
+            average, worst = measure(effect, pixels, args.frames)
+            print(f"{effect:<14}{pixels:>8}{average:>10.3f}{worst:>10.3f}{1000 / average:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pixels", type=int, nargs="+", default=[150, 1000, 5000])
+    parser.add_argument("--frames", type=int, default=400, help="frames per measurement")
+    main(parser.parse_args())
@@ -0,0 +1,95 @@
+"""Benchmark integration import and per-entry setup time.
+
+Measures a cold import of the integration and its platforms in a fresh
+interpreter, then the integration's own per-entry setup work (client
+creation, connection test, state load and restore) for 1 and 20 entries
+against local simulated controllers. Platform forwarding inside Home
+Assistant is not included.
+
+    python scripts/bench_startup.py
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.minleon_lighting.api import MinleonLightingApiClient  # noqa: E402
+from simulator import start_controllers  # noqa: E402
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import custom_components.minleon_lighting
+import custom_components.minleon_lighting.light
+import custom_components.minleon_lighting.number
+import custom_components.minleon_lighting.select
+print(time.perf_counter() - start)
+"""
+
+
+def measure_import(runs: int) -> list[float]:
+    """Time a cold import of the integration in fresh interpreters."""
+    times = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET],
+            cwd=ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return times
+
+
+async def setup_entry(hass: HomeAssistant, port: int, index: int) -> MinleonLightingApiClient:
+    """Run the per-entry setup steps of async_setup_entry."""
+    entry = SimpleNamespace(entry_id=f"bench{index}")
+    api = MinleonLightingApiClient(f"127.0.0.1:{port}", entry, hass)
+    await api.async_test_connection()
+    await api.async_load_state()
+    if api.is_on and api.current_effect != "Off":
+        await api.async_repush_state()
+    return api
+
+
+async def measure_setup(count: int, port: int) -> float:
+    """Time setting up count entries concurrently."""
+    controllers = await start_controllers(count, port)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        start = time.perf_counter()
+        apis = await asyncio.gather(*(setup_entry(hass, port + i, i) for i in range(count)))
+        elapsed = time.perf_counter() - start
+        for api in apis:
+            await api.async_close()
+    for controller in controllers:
+        await controller.stop()
+    return elapsed
+
+
+async def _main(args: argparse.Namespace) -> None:
+    times = measure_import(args.runs)
+    print(f"cold import: best {min(times) * 1000:.1f} ms, worst {max(times) * 1000:.1f} ms")
+    for count in (1, 20):
+        elapsed = await measure_setup(count, args.port)
+        print(f"setup {count:>2} entries: {elapsed * 1000:.1f} ms ({elapsed / count * 1000:.2f} ms/entry)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="cold import runs")
+    parser.add_argument("--port", type=int, default=8080, help="first simulator port")
+    asyncio.run(_main(parser.parse_args()))
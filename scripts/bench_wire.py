@@ -0,0 +1,141 @@
+"""Benchmark command encoding and send throughput against the simulator.
+
+Times encoding a show's worth of commands the old way (json.dumps, hex
+formatting, a new timeout and headers per call) against the cached
+commands, then measures end-to-end throughput for two workloads:
+
+- transition: effect, preset palette and brightness changes, one after another
+- streaming: rapidly changing palettes sent concurrently, skipping unchanged slots
+
+Run it on two checkouts to compare the end-to-end numbers.
+
+    python scripts/bench_wire.py --transitions 200 --frames 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import random
+import sys
+import time
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import standalone  # noqa: E402,F401
+from minleon_lighting.const import KNOWN_EFFECTS  # noqa: E402
+from simulator import start_controllers  # noqa: E402
+
+try:
+    from minleon_lighting import client as api_module
+
+    def make_client(address: str):
+        """Return a client for the simulator."""
+        return api_module.MinleonClient(address)
+
+    get_preset_palette = api_module.MinleonClient.get_preset_palette
+except ImportError:
+    # Checkouts from before the client was split out of api.py need Home Assistant
+    from minleon_lighting import api as api_module
+
+    def make_client(address: str):
+        """Return a client for the simulator."""
+        return api_module.MinleonLightingApiClient(address, None, None)
+
+    get_preset_palette = api_module.MinleonLightingApiClient.get_preset_palette
+
+PRESETS = ("Christmas", "Halloween", "Valentines Day", "St Patricks Day", "Independence Day")
+
+
+def legacy_encode(payload: dict) -> tuple:
+    """Encode a command the way the client did before payloads were cached."""
+    if "color" in payload:
+        slot, color = payload["color"]
+        payload = {"fxn": 1, "color": {"i": slot, "c": "#{:02x}{:02x}{:02x}".format(*color).upper()}}
+    return (
+        json.dumps(payload),
+        {"Content-Type": "text/plain;charset=UTF-8"},
+        aiohttp.ClientTimeout(total=10),
+    )
+
+
+def measure_encoding(rounds: int) -> tuple[float, float]:
+    """Return microseconds per command for the legacy and cached encoders."""
+    palettes = [get_preset_palette(name) or [] for name in PRESETS]
+    commands = [{"fxn": 1, "fx": effect} for effect in KNOWN_EFFECTS]
+    commands += [{"fxn": 1, "int": str(value)} for value in range(101)]
+    commands += [
+        {"fxn": 1, "color": (slot, tuple(color))}
+        for palette in palettes
+        for slot, color in enumerate(palette, start=1)
+    ]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for payload in commands:
+            legacy_encode(payload)
+    legacy = (time.perf_counter() - start) / (rounds * len(commands)) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for payload in commands:
+            if "fx" in payload:
+                api_module._effect_command(payload["fx"])
+            elif "int" in payload:
+                api_module._value_command("int", payload["int"])
+            else:
+                api_module._color_command(*payload["color"])
+    cached = (time.perf_counter() - start) / (rounds * len(commands)) * 1e6
+    return legacy, cached
+
+
+async def measure_transitions(api, count: int) -> float:
+    """Return transitions per second for sequential effect, palette and brightness changes."""
+    start = time.perf_counter()
+    for i in range(count):
+        await api.async_set_effect(KNOWN_EFFECTS[1 + i % (len(KNOWN_EFFECTS) - 1)])
+        await api.async_apply_holiday_preset(PRESETS[i % len(PRESETS)])
+        await api.async_set_brightness(40 + i % 60)
+    return count / (time.perf_counter() - start)
+
+
+async def measure_streaming(api, frames: int) -> float:
+    """Return frames per second for changing palettes sent as fast as possible."""
+    rng = random.Random(0)
+    levels = [0, 64, 128, 192, 255]
+    start = time.perf_counter()
+    for _ in range(frames):
+        palette = [tuple(rng.choice(levels) for _ in range(3)) for _ in range(5)]
+        await api.async_apply_palette(palette, only_changed=True)
+    return frames / (time.perf_counter() - start)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    # Checkouts from before the command cache only have the end-to-end numbers
+    if hasattr(api_module, "_color_command"):
+        legacy, cached = measure_encoding(args.rounds)
+        print(f"encode: legacy {legacy:.2f} us/command, cached {cached:.2f} us/command")
+
+    controllers = await start_controllers(1, args.port)
+    api = make_client(f"127.0.0.1:{args.port}")
+    try:
+        rate = await measure_transitions(api, args.transitions)
+        print(f"transition: {rate:.1f} transitions/s")
+        rate = await measure_streaming(api, args.frames)
+        print(f"streaming: {rate:.1f} frames/s ({controllers[0].commands} commands total)")
+    finally:
+        await api.async_close()
+        for controller in controllers:
+            await controller.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080, help="simulator port")
+    parser.add_argument("--rounds", type=int, default=200, help="encoding rounds")
+    parser.add_argument("--transitions", type=int, default=200, help="transitions to send")
+    parser.add_argument("--frames", type=int, default=500, help="streaming frames to send")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,79 @@
+"""Measure a BPM to speed calibration curve against the simulator.
+
+Sweeps the speed setting, reads the effect rate the simulator reports for
+each value and prints calibration points for the calibrate_tempo service.
+It then replays a jittery BPM trace through the tempo mapping and reports
+how many speed updates each threshold would send.
+
+    python scripts/calibrate_tempo.py --step 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import random
+import sys
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import standalone  # noqa: E402,F401
+from minleon_lighting.client import MinleonClient  # noqa: E402
+from minleon_lighting.tempo_curve import map_bpm  # noqa: E402
+from simulator import start_controllers  # noqa: E402
+
+
+async def measure_curve(port: int, step: int) -> list[tuple[float, int]]:
+    """Sweep speed on a simulated controller and record the effect rate."""
+    api = MinleonClient(f"127.0.0.1:{port}")
+    points = []
+    async with aiohttp.ClientSession() as session:
+        for speed in range(0, 101, step):
+            await api.async_set_speed(speed)
+            async with session.get(f"http://127.0.0.1:{port}/sim/state") as response:
+                state = await response.json()
+            points.append((round(state["effect_rate"], 1), speed))
+    await api.async_close()
+    return points
+
+
+def replay(curve: list[tuple[float, int]], threshold: int, samples: int) -> int:
+    """Count the speed updates sent for a jittery BPM trace."""
+    rng = random.Random(0)
+    speed = map_bpm(curve, 120)
+    sent = 0
+    bpm = 120.0
+    for _ in range(samples):
+        bpm = min(max(bpm + rng.gauss(0, 1.5), 60), 180)
+        mapped = map_bpm(curve, bpm)
+        if abs(mapped - speed) > threshold:
+            speed = mapped
+            sent += 1
+    return sent
+
+
+async def _main(args: argparse.Namespace) -> None:
+    controllers = await start_controllers(1, args.port)
+    try:
+        curve = await measure_curve(args.port, args.step)
+    finally:
+        for controller in controllers:
+            await controller.stop()
+
+    print("Calibration points (bpm, speed):")
+    print(json.dumps(curve))
+    print()
+    print(f"Speed updates for {args.samples} BPM samples:")
+    for threshold in (0, 1, 2, 3, 5):
+        print(f"  threshold {threshold}: {replay(curve, threshold, args.samples)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080, help="simulator port")
+    parser.add_argument("--step", type=int, default=10, help="speed step of the sweep")
+    parser.add_argument("--samples", type=int, default=1000, help="BPM samples to replay")
+    asyncio.run(_main(parser.parse_args()))
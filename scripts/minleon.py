@@ -0,0 +1,187 @@
+"""Control or benchmark many Pixel Dancer controllers from the command line.
+
+Uses the integration's standalone client, so only aiohttp is needed, not
+Home Assistant. Hosts come from --host and from a hosts file with one
+host[:port] per line (# starts a comment). Every command runs on all
+hosts concurrently.
+
+    python scripts/minleon.py --hosts hosts.txt on
+    python scripts/minleon.py --hosts hosts.txt effect Chase
+    python scripts/minleon.py --hosts hosts.txt preset Christmas
+    python scripts/minleon.py --hosts hosts.txt brightness 60
+    python scripts/minleon.py --hosts hosts.txt sequence show.json
+    python scripts/minleon.py --hosts hosts.txt --bench --count 50
+
+A sequence file is a JSON list of steps, each with a duration in seconds
+and any of effect, preset, colors, brightness, speed, spacing, amount and
+trails, for example [{"duration": 5, "effect": "Chase", "preset": "Christmas"}].
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import standalone  # noqa: E402,F401
+from minleon_lighting.client import MinleonClient  # noqa: E402
+from minleon_lighting.const import KNOWN_EFFECTS  # noqa: E402
+
+NUMBER_COMMANDS = ("brightness", "speed", "spacing", "amount", "trails")
+STATE_KEYS = ("effect", "preset", "colors", "brightness", "speed", "spacing", "amount", "trails")
+
+
+def read_hosts(args: argparse.Namespace) -> list[str]:
+    """Return the hosts from the command line and the hosts file, without duplicates."""
+    hosts = list(args.host)
+    if args.hosts:
+        for line in Path(args.hosts).read_text().splitlines():
+            if host := line.split("#", 1)[0].strip():
+                hosts.append(host)
+    return list(dict.fromkeys(hosts))
+
+
+def read_sequence(path: str) -> list[dict]:
+    """Load and check a sequence file."""
+    steps = json.loads(Path(path).read_text())
+    if not isinstance(steps, list) or not steps:
+        raise SystemExit(f"{path}: expected a list of steps")
+    for index, step in enumerate(steps, start=1):
+        unknown = set(step) - {"duration", *STATE_KEYS}
+        if unknown:
+            raise SystemExit(f"{path}: step {index} has unknown keys {sorted(unknown)}")
+        if "effect" in step and step["effect"] not in KNOWN_EFFECTS:
+            raise SystemExit(f"{path}: step {index} has unknown effect {step['effect']}")
+        if "colors" in step:
+            step["colors"] = [tuple(color) for color in step["colors"]]
+    return steps
+
+
+async def run_command(client: MinleonClient, args: argparse.Namespace) -> bool:
+    """Run a single command on one controller."""
+    if args.command == "on":
+        return await client.async_turn_on()
+    if args.command == "off":
+        return await client.async_turn_off()
+    if args.command == "effect":
+        return await client.async_set_effect(args.value)
+    if args.command == "preset":
+        return await client.async_apply_holiday_preset(args.value)
+    setter = getattr(client, f"async_set_{args.command}")
+    return await setter(args.value)
+
+
+async def run_sequence(clients: dict[str, MinleonClient], steps: list[dict], loops: int) -> dict[str, bool]:
+    """Apply each step to every controller together, on a fixed schedule."""
+    ok = dict.fromkeys(clients, True)
+    start = time.monotonic()
+    elapsed = 0.0
+    for loop in range(loops):
+        for index, step in enumerate(steps, start=1):
+            state = {key: step[key] for key in STATE_KEYS if key in step}
+            results = await asyncio.gather(*(client.async_apply_state(state) for client in clients.values()))
+            for host, (success, _) in zip(clients, results):
+                ok[host] = ok[host] and success
+            failed = [host for host, (success, _) in zip(clients, results) if not success]
+            print(f"loop {loop + 1} step {index}: {len(clients) - len(failed)}/{len(clients)} ok"
+                  + (f", failed: {' '.join(failed)}" if failed else ""))
+            # Deadlines are fixed from the start so timing does not drift
+            elapsed += step.get("duration", 0)
+            await asyncio.sleep(max(start + elapsed - time.monotonic(), 0))
+    return ok
+
+
+async def bench(client: MinleonClient, count: int) -> list[float | None]:
+    """Return the round-trip time of count no-op commands, None for failures."""
+    times: list[float | None] = []
+    for _ in range(count):
+        start = time.perf_counter()
+        success = await client.async_ping()
+        times.append(time.perf_counter() - start if success else None)
+    return times
+
+
+def print_bench(results: dict[str, list[float | None]]) -> None:
+    """Print per-host latency statistics."""
+    print(f"{'host':<24}{'ok':>6}{'min ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for host, times in results.items():
+        good = sorted(t * 1000 for t in times if t is not None)
+        if not good:
+            print(f"{host:<24}{0:>6}{'-':>10}{'-':>10}{'-':>10}{'-':>10}")
+            continue
+        p99 = good[min(int(len(good) * 0.99), len(good) - 1)]
+        print(
+            f"{host:<24}{f'{len(good)}/{len(times)}':>6}{good[0]:>10.1f}"
+            f"{statistics.median(good):>10.1f}{p99:>10.1f}{good[-1]:>10.1f}"
+        )
+
+
+async def _main(args: argparse.Namespace) -> int:
+    hosts = read_hosts(args)
+    if not hosts:
+        raise SystemExit("no hosts given, use --host or --hosts")
+    steps = read_sequence(args.value) if args.command == "sequence" else None
+    clients = {host: MinleonClient(host) for host in hosts}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(coro):
+        async with semaphore:
+            return await coro
+
+    start = time.monotonic()
+    try:
+        if args.bench:
+            results = await asyncio.gather(
+                *(limited(bench(client, args.count)) for client in clients.values())
+            )
+            print_bench(dict(zip(clients, results)))
+            ok = {host: None not in times for host, times in zip(clients, results)}
+        elif steps is not None:
+            ok = await run_sequence(clients, steps, args.loops)
+        else:
+            results = await asyncio.gather(
+                *(limited(run_command(client, args)) for client in clients.values())
+            )
+            ok = dict(zip(clients, results))
+            for host, success in ok.items():
+                print(f"{host:<24}{'ok' if success else 'FAILED'}")
+    finally:
+        await asyncio.gather(*(client.async_close() for client in clients.values()))
+
+    failed = sum(not success for success in ok.values())
+    print(f"{len(ok) - failed}/{len(ok)} controllers ok in {time.monotonic() - start:.2f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0], formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["on", "off", "effect", "preset", *NUMBER_COMMANDS, "sequence"],
+    )
+    parser.add_argument("value", nargs="?", help="effect, preset, number or sequence file")
+    parser.add_argument("--host", action="append", default=[], help="controller host[:port], repeatable")
+    parser.add_argument("--hosts", help="file with one host[:port] per line")
+    parser.add_argument("--concurrency", type=int, default=64, help="controllers handled at once")
+    parser.add_argument("--loops", type=int, default=1, help="times to run a sequence")
+    parser.add_argument("--bench", action="store_true", help="measure per-host latency instead")
+    parser.add_argument("--count", type=int, default=20, help="round trips per host with --bench")
+    args = parser.parse_args()
+    if not args.bench and args.command is None:
+        parser.error("a command or --bench is required")
+    if args.command not in (None, "on", "off") and args.value is None:
+        parser.error(f"{args.command} needs a value")
+    if args.command in NUMBER_COMMANDS:
+        try:
+            args.value = int(args.value)
+        except ValueError:
+            parser.error(f"{args.command} needs a whole number, got {args.value!r}")
+    sys.exit(asyncio.run(_main(args)))
@@ -0,0 +1,61 @@
+"""Check controller discovery against several simulated controllers.
+
+Starts simulators on consecutive loopback ports, scans loopback for them
+alongside closed ports, and reports what was found and how long the scan
+took. A full /24 with nothing listening is timed as well.
+
+    python scripts/scan_network.py --count 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+import time
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import standalone  # noqa: E402,F401
+from minleon_lighting.probe import (  # noqa: E402
+    async_scan_network,
+    format_host,
+)
+from simulator import start_controllers  # noqa: E402
+
+
+async def _main(args: argparse.Namespace) -> None:
+    controllers = await start_controllers(args.count, args.port)
+    expected = {format_host("127.0.0.1", c.port) for c in controllers}
+    # Scan twice as many ports as there are controllers so closed ports are probed too
+    ports = tuple(range(args.port, args.port + args.count * 2))
+    try:
+        async with aiohttp.ClientSession() as session:
+            start = time.perf_counter()
+            found = await async_scan_network(session, "127.0.0.1/32", ports, args.timeout)
+            elapsed = time.perf_counter() - start
+            print(f"Found {len(found)}/{len(expected)} controllers in {elapsed * 1000:.0f} ms")
+            if set(found) != expected:
+                print(f"  Mismatch: expected {sorted(expected)}, found {sorted(found)}")
+
+            start = time.perf_counter()
+            empty = await async_scan_network(session, args.network, timeout=args.timeout)
+            elapsed = time.perf_counter() - start
+            print(f"Scanned {args.network} in {elapsed:.2f} s, found {len(empty)}")
+
+        for controller in controllers:
+            print(f"  127.0.0.1:{controller.port} received {controller.commands} probe(s)")
+    finally:
+        for controller in controllers:
+            await controller.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=3, help="number of controllers")
+    parser.add_argument("--port", type=int, default=8080, help="first port")
+    parser.add_argument("--timeout", type=float, default=0.5, help="probe timeout in seconds")
+    parser.add_argument("--network", default="127.0.1.0/24", help="empty network to time")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,164 @@
+"""Local Pixel Dancer simulator for offline testing.
+
+Emulates the controller's /api/control endpoint on one or more loopback
+ports and keeps the state each command sets, so scripts and the
+integration can be exercised without real hardware. Faults (500 errors,
+hung requests, connection resets and slow responses) can be injected at
+random for soak testing.
+
+    python scripts/simulator.py --count 3 --port 8080 --error 0.05 --reset 0.02
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import json
+import random
+import time
+
+from aiohttp import web
+
+
+def effect_rate(speed: int) -> float:
+    """Return the modeled effect cycles per minute for a speed value.
+
+    A simple exponential model of the firmware: every 25 speed steps
+    doubles the rate, from 30 cycles per minute at speed 0.
+    """
+    return 30 * 2 ** (speed / 25)
+
+
+@dataclass
+class Faults:
+    """Probability of each injected fault per request."""
+
+    error: float = 0.0  # answer 500
+    timeout: float = 0.0  # hold the request for hang seconds before answering
+    reset: float = 0.0  # close the connection without answering
+    slow: float = 0.0  # send the response body a byte at a time
+    hang: float = 12.0
+    slow_delay: float = 0.2
+
+    def pick(self, rng: random.Random) -> str | None:
+        """Return the fault to inject into a request, or None."""
+        roll = rng.random()
+        for name in ("error", "timeout", "reset", "slow"):
+            roll -= getattr(self, name)
+            if roll < 0:
+                return name
+        return None
+
+
+class SimulatedController:
+    """A single simulated Pixel Dancer controller."""
+
+    def __init__(
+        self, port: int, latency: float = 0.0, faults: Faults | None = None, seed: int = 0
+    ) -> None:
+        """Initialize."""
+        self.port = port
+        self.latency = latency
+        self.faults = faults
+        self.state: dict = {"fx": "Off", "colors": {}}
+        self.commands = 0
+        self.injected: dict[str, int] = {}
+        self.started = time.monotonic()
+        self._rng = random.Random(seed + port)
+        self._runner: web.AppRunner | None = None
+
+    async def handle_control(self, request: web.Request) -> web.StreamResponse:
+        """Handle a POST to /api/control."""
+        try:
+            payload = json.loads(await request.read() or b"{}")
+        except ValueError:
+            return web.Response(status=400, text="Bad Request")
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        fault = self.faults.pick(self._rng) if self.faults else None
+        if fault is not None:
+            self.injected[fault] = self.injected.get(fault, 0) + 1
+        if fault == "error":
+            return web.Response(status=500, text="Internal Server Error")
+        if fault == "reset":
+            request.transport.close()
+            return web.Response(text="200 OK")
+        if fault == "timeout":
+            await asyncio.sleep(self.faults.hang)
+
+        self.commands += 1
+        for key, value in payload.items():
+            if key == "color":
+                self.state["colors"][str(value["i"])] = value["c"]
+            elif key != "fxn":
+                self.state[key] = value
+        if fault == "slow":
+            response = web.StreamResponse()
+            response.content_length = 6
+            await response.prepare(request)
+            for byte in b"200 OK":
+                await asyncio.sleep(self.faults.slow_delay)
+                await response.write(bytes([byte]))
+            await response.write_eof()
+            return response
+        return web.Response(text="200 OK")
+
+    async def handle_state(self, request: web.Request) -> web.Response:
+        """Return the simulated state, for inspection by test scripts."""
+        speed = int(self.state.get("spd", 50))
+        return web.json_response(
+            {**self.state, "commands": self.commands, "effect_rate": effect_rate(speed)}
+        )
+
+    async def start(self, host: str = "127.0.0.1") -> None:
+        """Start serving."""
+        app = web.Application()
+        app.router.add_post("/api/control", self.handle_control)
+        app.router.add_get("/sim/state", self.handle_state)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, self.port).start()
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def start_controllers(
+    count: int, port: int, latency: float = 0.0, faults: Faults | None = None
+) -> list[SimulatedController]:
+    """Start count simulated controllers on consecutive ports."""
+    controllers = [SimulatedController(port + i, latency, faults) for i in range(count)]
+    for controller in controllers:
+        await controller.start()
+    return controllers
+
+
+async def _main(args: argparse.Namespace) -> None:
+    faults = Faults(args.error, args.timeout, args.reset, args.slow)
+    controllers = await start_controllers(args.count, args.port, args.latency / 1000, faults)
+    for controller in controllers:
+        print(f"Simulated controller on 127.0.0.1:{controller.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for controller in controllers:
+            await controller.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1, help="number of controllers")
+    parser.add_argument("--port", type=int, default=8080, help="first port")
+    parser.add_argument("--latency", type=float, default=0.0, help="added latency in ms")
+    parser.add_argument("--error", type=float, default=0.0, help="probability of a 500 answer")
+    parser.add_argument("--timeout", type=float, default=0.0, help="probability of a hung request")
+    parser.add_argument("--reset", type=float, default=0.0, help="probability of a connection reset")
+    parser.add_argument("--slow", type=float, default=0.0, help="probability of a slow response")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
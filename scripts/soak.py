@@ -0,0 +1,204 @@
+"""Soak test many clients against faulty simulated controllers.
+
+Starts a simulated controller per client on consecutive loopback ports,
+injecting 500 errors, hung requests, connection resets and slow responses
+at random, and drives one MinleonClient per controller with a
+randomized storm of on/off, effect, preset and slider commands. Reports
+command latency percentiles per action, event-loop lag, memory growth of
+Python allocations, and any aiohttp sessions or tasks left behind once
+every client is closed.
+
+    python scripts/soak.py --controllers 50 --seconds 600 --rate 2 --error 0.02 --reset 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict
+import gc
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import standalone  # noqa: E402,F401
+from minleon_lighting.client import MinleonClient  # noqa: E402
+from minleon_lighting.const import KNOWN_EFFECTS  # noqa: E402
+from simulator import Faults, start_controllers  # noqa: E402
+
+PRESETS = ("Christmas", "Halloween", "Valentines Day", "St Patricks Day", "Independence Day")
+
+# Seconds between event-loop lag samples, and between memory samples
+LAG_INTERVAL = 0.05
+MEMORY_INTERVAL = 10
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return a percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def slider_drag(api: MinleonClient, rng: random.Random, setter: str) -> bool:
+    """Send a quick run of values, like dragging a slider."""
+    value = rng.randint(1, 100)
+    results = []
+    for _ in range(rng.randint(3, 8)):
+        value = min(max(value + rng.randint(-10, 10), 1), 100)
+        results.append(await getattr(api, setter)(value))
+    return all(results)
+
+
+ACTIONS = {
+    "turn_on": lambda api, rng: api.async_turn_on(),
+    "turn_off": lambda api, rng: api.async_turn_off(),
+    "effect": lambda api, rng: api.async_set_effect(rng.choice(KNOWN_EFFECTS[1:])),
+    "preset": lambda api, rng: api.async_apply_holiday_preset(rng.choice(PRESETS)),
+    "brightness": lambda api, rng: slider_drag(api, rng, "async_set_brightness"),
+    "speed": lambda api, rng: slider_drag(api, rng, "async_set_speed"),
+    "spacing": lambda api, rng: slider_drag(api, rng, "async_set_spacing"),
+}
+
+
+class Soak:
+    """Command storm and health measurements."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        """Initialize."""
+        self.args = args
+        self.latency: dict[str, list[float]] = defaultdict(list)
+        self.failures: dict[str, int] = defaultdict(int)
+        self.lag: list[float] = []
+        self.memory: list[tuple[float, int]] = []
+        self.deadline = 0.0
+
+    async def storm(self, api: MinleonClient, seed: int) -> None:
+        """Send random actions to one client until the deadline."""
+        rng = random.Random(seed)
+        names = list(ACTIONS)
+        while time.monotonic() < self.deadline:
+            await asyncio.sleep(rng.expovariate(self.args.rate))
+            name = rng.choice(names)
+            start = time.monotonic()
+            if not await ACTIONS[name](api, rng):
+                self.failures[name] += 1
+            self.latency[name].append(time.monotonic() - start)
+
+    async def watch_loop(self) -> None:
+        """Sample how late the event loop wakes up."""
+        loop = asyncio.get_running_loop()
+        while time.monotonic() < self.deadline:
+            start = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.lag.append(loop.time() - start - LAG_INTERVAL)
+
+    async def watch_memory(self) -> None:
+        """Sample traced Python memory."""
+        start = time.monotonic()
+        while time.monotonic() < self.deadline:
+            self.memory.append((time.monotonic() - start, tracemalloc.get_traced_memory()[0]))
+            await asyncio.sleep(MEMORY_INTERVAL)
+        self.memory.append((time.monotonic() - start, tracemalloc.get_traced_memory()[0]))
+
+    def report(self) -> None:
+        """Print latency, failures, loop lag and memory."""
+        print(f"{'action':<12}{'count':>8}{'failed':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        everything = []
+        for name in ACTIONS:
+            values = self.latency[name]
+            everything.extend(values)
+            print(
+                f"{name:<12}{len(values):>8}{self.failures[name]:>8}"
+                f"{percentile(values, 0.5) * 1000:>10.1f}{percentile(values, 0.99) * 1000:>10.1f}"
+                f"{max(values, default=0) * 1000:>10.1f}"
+            )
+        print(
+            f"{'all':<12}{len(everything):>8}{sum(self.failures.values()):>8}"
+            f"{percentile(everything, 0.5) * 1000:>10.1f}{percentile(everything, 0.99) * 1000:>10.1f}"
+            f"{max(everything, default=0) * 1000:>10.1f}"
+        )
+        print(
+            f"event loop lag: p50 {percentile(self.lag, 0.5) * 1000:.1f} ms, "
+            f"p99 {percentile(self.lag, 0.99) * 1000:.1f} ms, max {max(self.lag, default=0) * 1000:.1f} ms"
+        )
+        # The first sample is taken before connections are warm
+        if len(self.memory) > 2:
+            (t0, first), (t1, last) = self.memory[1], self.memory[-1]
+            rate = (last - first) / max(t1 - t0, 1) * 3600
+            print(f"memory: {first / 1e6:.1f} MB -> {last / 1e6:.1f} MB ({rate / 1e6:+.2f} MB/hour)")
+
+
+def open_sessions() -> int:
+    """Return the number of aiohttp sessions that were never closed."""
+    gc.collect()
+    return sum(
+        1 for obj in gc.get_objects() if isinstance(obj, aiohttp.ClientSession) and not obj.closed
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    faults = Faults(args.error, args.timeout, args.reset, args.slow, hang=args.hang)
+    controllers = await start_controllers(args.controllers, args.port, args.latency / 1000, faults)
+    tracemalloc.start()
+    baseline_tasks = len(asyncio.all_tasks())
+    soak = Soak(args)
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        apis = []
+        for index in range(args.controllers):
+            api = MinleonClient(f"127.0.0.1:{args.port + index}", state_dir, f"soak{index}")
+            await api.async_load_state()
+            apis.append(api)
+
+        print(
+            f"{args.controllers} controllers, {args.rate} actions/s each, {args.seconds} s, "
+            f"faults: {faults}"
+        )
+        soak.deadline = time.monotonic() + args.seconds
+        await asyncio.gather(
+            soak.watch_loop(),
+            soak.watch_memory(),
+            *(soak.storm(api, index) for index, api in enumerate(apis)),
+        )
+        sessions = open_sessions()
+        for api in apis:
+            await api.async_close()
+
+    injected = defaultdict(int)
+    for controller in controllers:
+        for name, count in controller.injected.items():
+            injected[name] += count
+        await controller.stop()
+    # Let closed connections finish before counting what is left
+    await asyncio.sleep(0.5)
+    leaked_tasks = len(asyncio.all_tasks()) - baseline_tasks
+    leaked_sessions = open_sessions()
+    tracemalloc.stop()
+
+    soak.report()
+    print(f"faults injected: {dict(injected) or 'none'}")
+    print(f"sessions: {sessions} open while running (one per client), {leaked_sessions} left after close")
+    print(f"tasks left after close: {leaked_tasks}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--controllers", type=int, default=50)
+    parser.add_argument("--port", type=int, default=9000, help="first simulator port")
+    parser.add_argument("--seconds", type=float, default=120, help="storm duration")
+    parser.add_argument("--rate", type=float, default=1.0, help="actions per second per controller")
+    parser.add_argument("--latency", type=float, default=20.0, help="simulated controller latency in ms")
+    parser.add_argument("--error", type=float, default=0.02, help="probability of a 500 answer")
+    parser.add_argument("--timeout", type=float, default=0.002, help="probability of a hung request")
+    parser.add_argument("--reset", type=float, default=0.01, help="probability of a connection reset")
+    parser.add_argument("--slow", type=float, default=0.02, help="probability of a slow response")
+    parser.add_argument("--hang", type=float, default=12.0, help="seconds a hung request is held")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,23 @@
+"""Import the integration's modules without Home Assistant.
+
+The package __init__ sets up the integration and needs Home Assistant, but
+the client, probe, tempo curve, preset rules, journal, audio, renderer and
+realtime modules only need aiohttp and NumPy. Importing this module
+registers the integration directory as a bare package named
+minleon_lighting, whose __init__ is never run, so scripts and tests can use:
+
+    import standalone  # noqa: F401
+    from minleon_lighting.client import MinleonClient
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import types
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1] / "custom_components" / "minleon_lighting"
+
+if "minleon_lighting" not in sys.modules:
+    _package = types.ModuleType("minleon_lighting")
+    _package.__path__ = [str(PACKAGE_DIR)]
+    sys.modules["minleon_lighting"] = _package
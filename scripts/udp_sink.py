@@ -0,0 +1,152 @@
+"""Receive DDP or E1.31 frames locally and check their rate and ordering.
+
+Listens on the protocol's standard port on loopback, validates each packet
+header, reassembles frames and counts out-of-order or missing sequence
+numbers. With --drive it also streams a moving pattern to itself through
+the integration's realtime output and prints both sides' statistics.
+
+    python scripts/udp_sink.py --protocol ddp --drive --fps 40 --pixels 600
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import struct
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import standalone  # noqa: E402,F401
+from minleon_lighting.const import REALTIME_DDP, REALTIME_E131  # noqa: E402
+from minleon_lighting.realtime import (  # noqa: E402
+    DDP_PORT,
+    DDP_PUSH,
+    DDP_TYPE_RGB24,
+    E131_HEADER,
+    E131_PORT,
+    MinleonRealtimeOutput,
+)
+
+
+class FrameSink(asyncio.DatagramProtocol):
+    """Validate incoming packets and record complete frames."""
+
+    def __init__(self, protocol: str, first_universe: int = 1) -> None:
+        """Initialize."""
+        self.protocol = protocol
+        self.first_universe = first_universe
+        self.frames: list[float] = []
+        self.bad_packets = 0
+        self.out_of_order = 0
+        self.bytes_per_frame = 0
+        self._sequence: int | None = None
+        self._frame_bytes = 0
+        self._received = 0.0
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        """Handle one packet."""
+        self._received = time.monotonic()
+        if self.protocol == REALTIME_DDP:
+            self._ddp(data)
+        else:
+            self._e131(data)
+
+    def _ddp(self, data: bytes) -> None:
+        if len(data) < 10:
+            self.bad_packets += 1
+            return
+        flags, sequence, data_type, _, offset, length = struct.unpack_from(">BBBBIH", data)
+        if flags & 0xC0 != 0x40 or data_type != DDP_TYPE_RGB24 or len(data) != 10 + length:
+            self.bad_packets += 1
+            return
+        if offset == 0:
+            self._check_sequence(sequence, 15, 1)
+            self._frame_bytes = 0
+        self._frame_bytes += length
+        if flags & DDP_PUSH:
+            self._complete()
+
+    def _e131(self, data: bytes) -> None:
+        if len(data) < E131_HEADER or data[4:13] != b"ASC-E1.17":
+            self.bad_packets += 1
+            return
+        sequence = data[111]
+        universe, = struct.unpack_from(">H", data, 113)
+        count, = struct.unpack_from(">H", data, 123)
+        if len(data) != E131_HEADER + count - 1:
+            self.bad_packets += 1
+            return
+        if universe == self.first_universe:
+            if self._frame_bytes:
+                self._complete()
+            self._check_sequence(sequence, 256, 0)
+            self._frame_bytes = 0
+        self._frame_bytes += count - 1
+
+    def _check_sequence(self, sequence: int, modulo: int, base: int) -> None:
+        if self._sequence is not None and sequence != (self._sequence - base + 1) % modulo + base:
+            self.out_of_order += 1
+        self._sequence = sequence
+
+    def _complete(self) -> None:
+        self.frames.append(self._received)
+        self.bytes_per_frame = self._frame_bytes
+
+    def report(self) -> str:
+        """Summarize what was received."""
+        # E1.31 has no end-of-frame marker, so the last frame is still open
+        if self.protocol == REALTIME_E131 and self._frame_bytes:
+            self._complete()
+            self._frame_bytes = 0
+        if len(self.frames) < 2:
+            return f"received {len(self.frames)} frames"
+        elapsed = self.frames[-1] - self.frames[0]
+        gaps = [b - a for a, b in zip(self.frames, self.frames[1:])]
+        return (
+            f"received {len(self.frames)} frames of {self.bytes_per_frame} bytes, "
+            f"{(len(self.frames) - 1) / elapsed:.1f} fps, max gap {max(gaps) * 1000:.1f} ms, "
+            f"{self.out_of_order} out of order, {self.bad_packets} bad packets"
+        )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    loop = asyncio.get_running_loop()
+    port = DDP_PORT if args.protocol == REALTIME_DDP else E131_PORT
+    transport, sink = await loop.create_datagram_endpoint(
+        lambda: FrameSink(args.protocol), local_addr=("127.0.0.1", port)
+    )
+    try:
+        if args.drive:
+            output = MinleonRealtimeOutput("127.0.0.1", args.protocol, args.pixels)
+            await output.async_open()
+            total = int(args.seconds * args.fps)
+
+            colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+
+            def render(frame: int) -> bool:
+                shift = frame % len(colors)
+                output.fill(colors[shift:] + colors[:shift])
+                return frame < total
+
+            output.start(render, args.fps)
+            print(f"sent: {await output.wait()}")
+            output.close()
+            await asyncio.sleep(0.2)
+        else:
+            print(f"Listening for {args.protocol} on 127.0.0.1:{port} for {args.seconds} s")
+            await asyncio.sleep(args.seconds)
+        print(sink.report())
+    finally:
+        transport.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--protocol", choices=[REALTIME_DDP, REALTIME_E131], default=REALTIME_DDP)
+    parser.add_argument("--seconds", type=float, default=5, help="how long to stream or listen")
+    parser.add_argument("--drive", action="store_true", help="stream a test pattern to the sink")
+    parser.add_argument("--fps", type=int, default=40, help="frame rate when driving")
+    parser.add_argument("--pixels", type=int, default=600, help="pixels per frame when driving")
+    asyncio.run(_main(parser.parse_args()))
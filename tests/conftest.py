@@ -0,0 +1,7 @@
+"""Shared test setup: import the integration's modules without Home Assistant."""
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import standalone  # noqa: E402,F401
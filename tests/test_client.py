@@ -0,0 +1,165 @@
+"""Tests for the standalone client's state handling."""
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from minleon_lighting.client import MinleonClient, background_priority  # noqa: E402
+
+
+class FakeResponse:
+    """One request to FakeController."""
+
+    status = 200
+
+    def __init__(self, controller: "FakeController", body: bytes) -> None:
+        self._controller = controller
+        self._body = body
+
+    async def __aenter__(self):
+        controller = self._controller
+        if controller.release is not None:
+            await controller.release.wait()
+        if not controller.up:
+            raise OSError("controller unreachable")
+        controller.sent.append(json.loads(self._body))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def text(self) -> str:
+        return "ok"
+
+
+class FakeController:
+    """Stand-in for the aiohttp session that records payloads and fails while down."""
+
+    def __init__(self) -> None:
+        self.up = True
+        self.sent: list[dict] = []
+        self.release: asyncio.Event | None = None
+
+    def post(self, url, data, headers, timeout) -> FakeResponse:
+        return FakeResponse(self, data)
+
+    async def close(self) -> None:
+        pass
+
+
+def _client(controller: FakeController, optimistic: bool = False, state_dir=None) -> MinleonClient:
+    client = MinleonClient("192.0.2.1", state_dir, "test")
+    client._session = controller
+    client.set_optimistic(optimistic)
+    return client
+
+
+def test_failed_optimistic_command_rolls_back():
+    async def run():
+        controller = FakeController()
+        client = _client(controller, optimistic=True)
+        await client.async_set_brightness(40)
+
+        controller.up = False
+        controller.release = asyncio.Event()
+        seen = []
+        client.add_listener(lambda: seen.append(client.brightness))
+        task = asyncio.ensure_future(client.async_set_brightness(90))
+        await asyncio.sleep(0)
+        shown = client.brightness
+        controller.release.set()
+        assert not await task
+        await asyncio.sleep(0)
+        return client, shown, seen
+
+    client, shown, seen = asyncio.run(run())
+    assert shown == 90
+    assert client.brightness == 40
+    assert client.rollbacks == 1
+    assert seen[-1] == 40
+
+
+def test_rolled_back_effect_restores_last_effect():
+    async def run():
+        controller = FakeController()
+        client = _client(controller, optimistic=True)
+        await client.async_set_effect("Chase")
+        controller.up = False
+        await client.async_set_effect("Glow")
+        return client
+
+    client = asyncio.run(run())
+    assert client.current_effect == "Chase"
+    assert client.last_effect == "Chase"
+
+
+def test_reconcile_sends_latest_values_once_controller_answers():
+    async def run():
+        controller = FakeController()
+        client = _client(controller)
+        controller.up = False
+        await client.async_set_effect("Chase")
+        await client.async_set_brightness(30)
+        await client.async_set_brightness(60)
+        pending = sorted(client.pending_changes)
+
+        controller.up = True
+        assert await client.async_ping()
+        await client._reconcile_task
+        return client, controller, pending
+
+    client, controller, pending = asyncio.run(run())
+    assert pending == ["fx", "int"]
+    assert client.pending_changes == []
+    # The effect goes first, and only the latest brightness is sent
+    assert controller.sent[1:] == [{"fxn": 1, "fx": "Chase"}, {"fxn": 1, "int": "60"}]
+    assert client.current_effect == "Chase"
+    assert client.brightness == 60
+
+
+def test_background_failures_are_not_replayed():
+    async def run():
+        controller = FakeController()
+        client = _client(controller)
+        controller.up = False
+        with background_priority():
+            await client.async_set_brightness(30)
+        return client
+
+    assert asyncio.run(run()).pending_changes == []
+
+
+def test_apply_state_validates_before_sending():
+    async def run():
+        controller = FakeController()
+        client = _client(controller)
+        results = [
+            await client.async_apply_state({"effect": "Chase", "preset": "No Such Preset"}),
+            await client.async_apply_state({"effect": "Chase", "brightness": 300}),
+            await client.async_apply_state({"effect": "Off"}),
+        ]
+        return controller, results
+
+    controller, results = asyncio.run(run())
+    assert results == [(False, 0), (False, 0), (True, 0)]
+    assert controller.sent == []
+
+
+def test_state_survives_restart_through_journal(tmp_path):
+    async def run():
+        client = _client(FakeController(), state_dir=str(tmp_path))
+        await client.async_load_state()
+        await client.async_set_effect("Chase")
+        await client.async_set_brightness(42)
+        await client.async_close()
+
+        restarted = MinleonClient("192.0.2.1", str(tmp_path), "test")
+        await restarted.async_load_state()
+        return restarted
+
+    restarted = asyncio.run(run())
+    assert restarted.is_on
+    assert restarted.current_effect == "Chase"
+    assert restarted.brightness == 42
@@ -0,0 +1,55 @@
+"""Tests for the state journal."""
+import json
+
+from minleon_lighting import journal
+from minleon_lighting.journal import StateJournal
+
+
+def _journal(tmp_path) -> StateJournal:
+    return StateJournal(str(tmp_path / "state.json"), str(tmp_path / "journal.jsonl"))
+
+
+def test_load_replays_journal_over_snapshot(tmp_path):
+    (tmp_path / "state.json").write_text(json.dumps({"brightness": 10, "speed": 20}))
+    (tmp_path / "journal.jsonl").write_text('{"brightness": 30}\n{"color_1": "#FF0000"}\n{"brightness": 40}\n')
+
+    assert _journal(tmp_path).load() == {"brightness": 40, "speed": 20, "color_1": "#FF0000"}
+
+
+def test_load_without_files_is_empty(tmp_path):
+    assert _journal(tmp_path).load() == {}
+
+
+def test_torn_tail_is_ignored_and_truncated(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_text('{"brightness": 30}\n{"bright')
+    state_journal = _journal(tmp_path)
+
+    assert state_journal.load() == {"brightness": 30}
+    assert path.read_text() == '{"brightness": 30}\n'
+
+    # Appends after the truncation start on a fresh line
+    state_journal.append({"speed": 5}, {})
+    assert _journal(tmp_path).load() == {"brightness": 30, "speed": 5}
+
+
+def test_corrupt_line_ends_replay(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_text('{"brightness": 30}\nnot json\n{"brightness": 99}\n')
+
+    assert _journal(tmp_path).load() == {"brightness": 30}
+    assert path.read_text() == '{"brightness": 30}\n'
+
+
+def test_full_journal_is_compacted_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "MAX_JOURNAL_RECORDS", 2)
+    state_journal = _journal(tmp_path)
+    state_journal.load()
+
+    state_journal.append({"brightness": 1}, {"brightness": 1})
+    state_journal.append({"brightness": 2}, {"brightness": 2})
+    state_journal.append({"brightness": 3}, {"brightness": 3, "speed": 7})
+
+    assert json.loads((tmp_path / "state.json").read_text()) == {"brightness": 3, "speed": 7}
+    assert (tmp_path / "journal.jsonl").read_text() == ""
+    assert _journal(tmp_path).load() == {"brightness": 3, "speed": 7}
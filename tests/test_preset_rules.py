@@ -0,0 +1,76 @@
+"""Tests for holiday preset rules and their date tables."""
+from datetime import date
+
+import pytest
+
+from minleon_lighting.preset_rules import _easter, _resolve_date, _thanksgiving, build_year_table
+
+
+@pytest.mark.parametrize(
+    ("year", "day"),
+    [
+        (2000, date(2000, 4, 23)),
+        (2008, date(2008, 3, 23)),
+        (2019, date(2019, 4, 21)),
+        (2024, date(2024, 3, 31)),
+        (2025, date(2025, 4, 20)),
+        (2038, date(2038, 4, 25)),
+    ],
+)
+def test_easter(year, day):
+    assert _easter(year) == day
+
+
+@pytest.mark.parametrize(
+    ("year", "day"),
+    [
+        (2018, date(2018, 11, 22)),
+        (2023, date(2023, 11, 23)),
+        (2024, date(2024, 11, 28)),
+        (2025, date(2025, 11, 27)),
+        (2026, date(2026, 11, 26)),
+    ],
+)
+def test_thanksgiving(year, day):
+    assert _thanksgiving(year) == day
+
+
+def test_resolve_date_offsets_and_clamping():
+    assert _resolve_date("easter-7", 2024) == date(2024, 3, 24)
+    assert _resolve_date("thanksgiving+1", 2024) == date(2024, 11, 29)
+    assert _resolve_date("02-29", 2023) == date(2023, 2, 28)
+    assert _resolve_date("02-29", 2024) == date(2024, 2, 29)
+
+
+@pytest.mark.parametrize("token", ["13-01", "12-32", "christmas", "easter+x"])
+def test_resolve_date_rejects_bad_tokens(token):
+    with pytest.raises(ValueError):
+        _resolve_date(token, 2024)
+
+
+def test_year_table_first_rule_wins_and_ranges_wrap():
+    rules = [
+        ("12-24", "12-26", "Christmas"),
+        ("12-01", "01-06", "Winter"),
+    ]
+    table = build_year_table(2024, rules)
+
+    def preset(month, day):
+        return table[date(2024, month, day).timetuple().tm_yday - 1]
+
+    assert len(table) == 366
+    assert preset(1, 6) == "Winter"
+    assert preset(1, 7) is None
+    assert preset(12, 1) == "Winter"
+    assert preset(12, 25) == "Christmas"
+    assert preset(12, 31) == "Winter"
+
+
+def test_parse_rules():
+    pytest.importorskip("aiohttp")
+    from minleon_lighting.preset_rules import parse_rules
+
+    assert parse_rules("# comment\n\n12-01..12-26: Christmas\n") == [("12-01", "12-26", "Christmas")]
+    for text in ("12-01 12-26: Christmas", "12-01..12-26:", "12-01..12-26: No Such Preset"):
+        with pytest.raises(ValueError):
+            parse_rules(text)
@@ -0,0 +1,86 @@
+"""Tests for the DDP and E1.31 packet layouts."""
+import struct
+
+import pytest
+
+from minleon_lighting.const import REALTIME_DDP, REALTIME_E131
+from minleon_lighting.realtime import (
+    DDP_HEADER,
+    DDP_MAX_DATA,
+    E131_HEADER,
+    E131_MAX_DATA,
+    DdpPacketizer,
+    E131Packetizer,
+    MinleonRealtimeOutput,
+)
+
+
+class _Transport:
+    def __init__(self):
+        self.sent = []
+
+    def sendto(self, packet):
+        self.sent.append(bytes(packet))
+
+
+def test_ddp_packets_split_frame_and_push_on_last():
+    packetizer = DdpPacketizer(DDP_MAX_DATA + 30)
+
+    assert len(packetizer.packets) == 2
+    first, last = packetizer.packets
+    assert struct.unpack_from(">BBBBIH", first) == (0x40, 0, 0x0B, 1, 0, DDP_MAX_DATA)
+    assert struct.unpack_from(">BBBBIH", last) == (0x41, 0, 0x0B, 1, DDP_MAX_DATA, 30)
+    assert len(last) == DDP_HEADER + 30
+
+
+def test_ddp_sequence_cycles_through_1_to_15():
+    packetizer = DdpPacketizer(3)
+    packetizer.stamp(14)
+    assert packetizer.packets[0][1] == 15
+    packetizer.stamp(15)
+    assert packetizer.packets[0][1] == 1
+
+
+def test_e131_packet_layout():
+    packetizer = E131Packetizer(E131_MAX_DATA + 6, universe=3)
+
+    assert len(packetizer.packets) == 2
+    packet = packetizer.packets[1]
+    size = E131_HEADER + 6
+    assert len(packet) == size
+    # Root layer
+    assert struct.unpack_from(">HH12sHI", packet, 0) == (0x0010, 0, b"ASC-E1.17\0\0\0", 0x7000 | (size - 16), 4)
+    # Framing layer: flags and length, vector, priority and universe
+    assert struct.unpack_from(">HI", packet, 38) == (0x7000 | (size - 38), 2)
+    assert packet[108] == 100
+    assert struct.unpack_from(">H", packet, 113) == (4,)
+    # DMP layer: property count includes the start code, which is zero
+    assert struct.unpack_from(">HBBHHHB", packet, 115) == (0x7000 | (size - 115), 2, 0xA1, 0, 1, 7, 0)
+    # Both packets share one source CID
+    assert packetizer.packets[0][22:38] == packet[22:38]
+
+
+def test_e131_sequence_wraps_at_256():
+    packetizer = E131Packetizer(3)
+    packetizer.stamp(256)
+    assert packetizer.packets[0][111] == 0
+
+
+@pytest.mark.parametrize(
+    ("protocol", "header"), [(REALTIME_DDP, DDP_HEADER), (REALTIME_E131, E131_HEADER)]
+)
+def test_output_sends_frame_pixels(protocol, header):
+    output = MinleonRealtimeOutput("192.0.2.1:80", protocol, 4)
+    output._transport = transport = _Transport()
+
+    output.fill([(1, 2, 3), (4, 5, 6)])
+    output.send()
+
+    assert output.host == "192.0.2.1"
+    assert len(transport.sent) == 1
+    assert transport.sent[0][header:] == bytes([1, 2, 3, 1, 2, 3, 4, 5, 6, 4, 5, 6])
+
+
+def test_unknown_protocol_is_rejected():
+    with pytest.raises(ValueError):
+        MinleonRealtimeOutput("192.0.2.1", "artnet", 4)
@@ -0,0 +1,32 @@
+"""Tests for the BPM to speed calibration curve."""
+import pytest
+
+from minleon_lighting.tempo_curve import map_bpm, normalize_curve
+
+CURVE = [(60.0, 20), (120.0, 50), (180.0, 90)]
+
+
+@pytest.mark.parametrize(
+    ("bpm", "speed"),
+    [(30, 20), (60, 20), (90, 35), (120, 50), (150, 70), (180, 90), (240, 90)],
+)
+def test_map_bpm_interpolates_and_clamps(bpm, speed):
+    assert map_bpm(CURVE, bpm) == speed
+
+
+def test_normalize_curve_sorts_points():
+    assert normalize_curve([[180, 90], ["60", "20"], [120, 50]]) == CURVE
+
+
+@pytest.mark.parametrize(
+    "points",
+    [
+        [[60, 20]],
+        [[60, 20], [60, 30]],
+        [[0, 20], [60, 30]],
+        [[60, 20], [120, 101]],
+    ],
+)
+def test_normalize_curve_rejects_bad_points(points):
+    with pytest.raises(ValueError):
+        normalize_curve(points)